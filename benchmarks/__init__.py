@@ -0,0 +1 @@
+"""Benchmarks of the downloaders package, to be run with `python -m benchmarks.<name>`."""
@@ -0,0 +1,54 @@
+"""Benchmark of the throughput of the download of a large file from a local server."""
+import os
+import tempfile
+from time import perf_counter
+from unittest.mock import patch
+
+from downloaders import BaseDownloader
+from tests.http_server import LocalHTTPServer
+
+
+def bench_download_throughput(size: int = 4 * 1024**3):
+    """Print the throughput of the download of a large file by write path.
+
+    The write through `iter_content` is the one still used by the
+    content-encoded responses and by the streaming extractions.
+
+    Parameters
+    -------------------
+    size: int = 4 * 1024**3,
+        Size in bytes of the served file.
+    """
+    with tempfile.TemporaryDirectory() as root:
+        served = os.path.join(root, "served")
+        os.makedirs(served)
+        chunk = os.urandom(64 * 1024**2)
+        with open(os.path.join(served, "large.bin"), "wb") as f:
+            for _ in range(size // len(chunk)):
+                f.write(chunk)
+        with LocalHTTPServer(served) as server:
+            for name, max_block_size, readinto in (
+                ("iter_content", 32768, False),
+                ("readinto fixed", 32768, True),
+                ("readinto adaptive", 8 * 1024**2, True),
+            ):
+                downloader = BaseDownloader(
+                    process_number=1,
+                    target_directory=os.path.join(root, "downloads"),
+                    max_block_size=max_block_size,
+                    cache=False,
+                    verbose=False,
+                )
+                with patch(
+                    "downloaders.downloaders.base_downloader.supports_readinto",
+                    return_value=readinto,
+                ):
+                    start = perf_counter()
+                    downloader.download(server.url("large.bin"))
+                    elapsed = perf_counter() - start
+                os.remove(os.path.join(root, "downloads", "large.bin"))
+                print(f"{name}: {elapsed:.2f}s, {size / elapsed / 1024**2:.1f} MiB/sec")
+
+
+if __name__ == "__main__":
+    bench_download_throughput()
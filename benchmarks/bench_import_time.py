@@ -0,0 +1,54 @@
+"""Benchmark of the time spent importing the package and its downloader."""
+import subprocess
+import sys
+from statistics import median
+
+from tests.import_time import import_times
+
+STATEMENTS = (
+    "import downloaders",
+    "from downloaders import BaseDownloader",
+    "from downloaders import BaseDownloader; BaseDownloader(verbose=False)",
+)
+
+
+def measure(statement: str) -> float:
+    """Return the seconds spent executing the statement in a new interpreter."""
+    return float(
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "from time import perf_counter\n"
+                "start = perf_counter()\n"
+                f"{statement}\n"
+                "print(perf_counter() - start)",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    )
+
+
+def bench_import_time(repetitions: int = 10):
+    """Print the median import time of the package and the slowest imported modules.
+
+    Parameters
+    -------------------
+    repetitions: int = 10,
+        Number of new interpreters in which each statement is measured.
+    """
+    for statement in STATEMENTS:
+        elapsed = median(measure(statement) for _ in range(repetitions))
+        slowest = sorted(
+            import_times(statement).items(), key=lambda item: item[1], reverse=True
+        )[:3]
+        print(
+            f"{statement}: {elapsed * 1000:.1f} ms, slowest imports: "
+            + ", ".join(f"{name} ({time / 1000:.1f} ms)" for name, time in slowest)
+        )
+
+
+if __name__ == "__main__":
+    bench_import_time()
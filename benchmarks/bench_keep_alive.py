@@ -0,0 +1,45 @@
+"""Benchmark of the files per second downloaded with and without keep-alive sessions."""
+import os
+import tempfile
+from time import perf_counter
+
+from downloaders import BaseDownloader
+from tests.http_server import LocalHTTPServer
+
+
+def bench_keep_alive(files_number: int = 2000, file_size: int = 1024):
+    """Print the files per second downloaded with and without keep-alive.
+
+    Parameters
+    -------------------
+    files_number: int = 2000,
+        Number of small files to download.
+    file_size: int = 1024,
+        Size in bytes of each file.
+    """
+    with tempfile.TemporaryDirectory() as root:
+        served = os.path.join(root, "served")
+        os.makedirs(served)
+        for i in range(files_number):
+            with open(os.path.join(served, f"file_{i}.bin"), "wb") as f:
+                f.write(os.urandom(file_size))
+        with LocalHTTPServer(served) as server:
+            urls = [server.url(f"file_{i}.bin") for i in range(files_number)]
+            for keep_alive in (False, True):
+                downloader = BaseDownloader(
+                    process_number=1,
+                    target_directory=os.path.join(root, f"keep_alive_{keep_alive}"),
+                    keep_alive=keep_alive,
+                    verbose=False,
+                )
+                start = perf_counter()
+                downloader.download(urls)
+                elapsed = perf_counter() - start
+                print(
+                    f"keep_alive={keep_alive}: {files_number / elapsed:.1f} files/sec "
+                    f"({server.connections} connections opened so far)"
+                )
+
+
+if __name__ == "__main__":
+    bench_keep_alive()
@@ -0,0 +1,82 @@
+"""Benchmark of the decompression of bzip2 and xz files by number of processes."""
+import bz2
+import lzma
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count
+from time import perf_counter
+
+from downloaders.extractors.bz2_extractor import BZ2Extractor
+from downloaders.extractors.xz_extractor import XzExtractor
+
+
+def synthetic_chunk(seed: int, size: int) -> bytes:
+    """Return a chunk of text of the given size, compressible as real data."""
+    generator = random.Random(seed)
+    words = [f"{generator.getrandbits(32):08x}" for _ in range(1000)]
+    return " ".join(generator.choices(words, k=size // 9)).encode()[:size]
+
+
+def compress_chunk(extension: str, seed: int, size: int) -> bytes:
+    """Return a compressed stream of a synthetic chunk of the given size."""
+    chunk = synthetic_chunk(seed, size)
+    if extension == "bz2":
+        return bz2.compress(chunk)
+    return lzma.compress(chunk, preset=1)
+
+
+def bench_parallel_decompression(
+    size: int = 2 * 1024**3, chunk_size: int = 64 * 1024**2
+):
+    """Print the decompression time of synthetic files by number of processes.
+
+    Parameters
+    -------------------
+    size: int = 2 * 1024**3,
+        Uncompressed size in bytes of each synthetic file.
+    chunk_size: int = 64 * 1024**2,
+        Uncompressed size in bytes of the chunks compressed in parallel
+        to create the files. Each chunk of the bzip2 file is made of blocks
+        of 900 kB, while each chunk of the xz file is a block of its own,
+        as the ones written by `xz -T0`.
+    """
+    with tempfile.TemporaryDirectory() as root:
+        for extension, extractor_class in (
+            ("bz2", BZ2Extractor),
+            ("xz", XzExtractor),
+        ):
+            source = os.path.join(root, f"synthetic.bin.{extension}")
+            with ProcessPoolExecutor(cpu_count()) as executor, open(source, "wb") as f:
+                for stream in executor.map(
+                    compress_chunk,
+                    [extension] * (size // chunk_size),
+                    range(size // chunk_size),
+                    [chunk_size] * (size // chunk_size),
+                ):
+                    f.write(stream)
+            processes = 1
+            while True:
+                extractor = extractor_class(
+                    cache=False,
+                    delete_original_after_extraction=False,
+                    processes=processes,
+                )
+                destination = os.path.join(root, "synthetic.bin")
+                start = perf_counter()
+                extractor.extract(source, destination)
+                elapsed = perf_counter() - start
+                os.remove(destination)
+                print(
+                    f"{extension} processes={processes}: {elapsed:.2f}s, "
+                    f"{size / elapsed / 1024**2:.1f} MiB/sec"
+                )
+                if processes >= cpu_count():
+                    break
+                processes = min(2 * processes, cpu_count())
+            os.remove(source)
+
+
+if __name__ == "__main__":
+    bench_parallel_decompression()
@@ -0,0 +1,49 @@
+"""Benchmark of the extraction of a synthetic many-member zip by number of processes."""
+import os
+import random
+import tempfile
+import zipfile
+from multiprocessing import cpu_count
+from time import perf_counter
+
+from downloaders.extractors.zip_extraction import ZipExtractor
+
+
+def bench_zip_extraction(members_number: int = 5000, member_size: int = 64 * 1024):
+    """Print the extraction time of a synthetic zip for an increasing number of processes.
+
+    Parameters
+    -------------------
+    members_number: int = 5000,
+        Number of independently deflated members of the zip.
+    member_size: int = 64 * 1024,
+        Uncompressed size in bytes of each member.
+    """
+    words = [os.urandom(4).hex() for _ in range(1000)]
+    with tempfile.TemporaryDirectory() as root:
+        source = os.path.join(root, "many.zip")
+        with zipfile.ZipFile(source, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+            for i in range(members_number):
+                text = " ".join(random.choices(words, k=member_size // 9))
+                zip_ref.writestr(f"folder_{i % 100}/member_{i}.txt", text)
+        processes = 1
+        while True:
+            extractor = ZipExtractor(
+                cache=False,
+                delete_original_after_extraction=False,
+                processes=processes,
+            )
+            start = perf_counter()
+            extractor.extract(source, os.path.join(root, f"extracted_{processes}"))
+            elapsed = perf_counter() - start
+            print(
+                f"processes={processes}: {elapsed:.2f}s, "
+                f"{members_number / elapsed:.1f} members/sec"
+            )
+            if processes >= cpu_count():
+                break
+            processes = min(2 * processes, cpu_count())
+
+
+if __name__ == "__main__":
+    bench_zip_extraction()
@@ -1,4 +1,28 @@
 """Downloaders is a package to easily downloading stuff."""
-from .downloaders import BaseDownloader
+# The typing module is not imported at runtime, as importing the package
+# imports nothing else, and the type checkers treat this name as true.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from .downloaders import BaseDownloader
 
 __all__ = ["BaseDownloader"]
+
+
+def __getattr__(name: str):
+    """Return the public object with the given name, importing it on first access.
+
+    The public objects are imported lazily (PEP 562), so that importing
+    the package does not import requests, the downloaders and the extractors.
+    """
+    if name == "BaseDownloader":
+        from .downloaders import BaseDownloader as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Return the names of the module, including the ones not imported yet."""
+    return sorted(set(globals()) | set(__all__))
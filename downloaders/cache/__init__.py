@@ -0,0 +1,31 @@
+"""Module with the caches shared across downloads."""
+# As in the package __init__, the typing module is not imported at runtime.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from .cache_manager import CacheManager
+    from .content_store import ContentStore
+
+__all__ = ["CacheManager", "ContentStore"]
+
+
+def __getattr__(name: str):
+    """Return the public object with the given name, importing it on first access.
+
+    The public objects are imported lazily (PEP 562), so that importing
+    the package does not import sqlite3 and requests.
+    """
+    if name == "CacheManager":
+        from .cache_manager import CacheManager as value
+
+    elif name == "ContentStore":
+        from .content_store import ContentStore as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Return the names of the module, including the ones not imported yet."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,226 @@
+"""Submodule providing a size-bounded cache of downloaded and extracted artifacts."""
+import hashlib
+import os
+import shutil
+import sqlite3
+from contextlib import closing, contextmanager
+from time import time
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # On platforms without fcntl the entries in use are not protected.
+    fcntl = None
+
+
+def path_size(path: str) -> int:
+    """Return the size in bytes of the given file or directory."""
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(path)
+            for name in names
+        )
+    if os.path.exists(path):
+        return os.path.getsize(path)
+    return 0
+
+
+class CacheManager:
+    """Manager evicting the cached artifacts exceeding a byte budget."""
+
+    POLICIES = ("lru", "lfu")
+
+    def __init__(self, directory: str, max_size: int, policy: str = "lru"):
+        """Create new CacheManager object.
+
+        Parameters
+        -------------------
+        directory: str,
+            The directory where the index and the lock files are stored.
+            It can be shared by multiple processes.
+        max_size: int,
+            Maximum number of bytes of the tracked artifacts.
+        policy: str = "lru",
+            The eviction policy, either "lru", which evicts the least recently
+            used entries first, or "lfu", which evicts the least frequently
+            used entries first.
+
+        Raises
+        -------------------
+        ValueError,
+            If the given policy or maximum size are not valid.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(
+                f"The given cache policy {policy} is not supported. "
+                f"The supported policies are {', '.join(self.POLICIES)}."
+            )
+        if not isinstance(max_size, int) or max_size < 0:
+            raise ValueError("The given maximum cache size is not a positive integer.")
+        self._directory = directory
+        self._max_size = max_size
+        self._policy = policy
+        os.makedirs(os.path.join(directory, "locks"), exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    path TEXT PRIMARY KEY,
+                    entry_group TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    accesses INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0), ('evictions', 0);
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return a new connection to the index of the cache."""
+        connection = sqlite3.connect(
+            os.path.join(self._directory, "cache.sqlite"), timeout=60
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _lock_path(self, group: str) -> str:
+        """Return the path of the lock file of the given group."""
+        digest = hashlib.sha1(group.encode("utf8")).hexdigest()
+        return os.path.join(self._directory, "locks", f"{digest}.lock")
+
+    @contextmanager
+    def in_use(self, path: str) -> Iterator[None]:
+        """Context manager protecting the entries of the given group from eviction.
+
+        Parameters
+        -------------------
+        path: str,
+            The path of the archive whose group is being used.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path(os.path.abspath(path)), "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def record(self, path: str, group: Optional[str] = None, hit: bool = False):
+        """Record an access to the given artifact.
+
+        Parameters
+        -------------------
+        path: str,
+            The path of the downloaded file or of the extracted file or directory.
+        group: Optional[str] = None,
+            The path of the archive the artifact was extracted from, so that
+            the two are evicted together. By default, the artifact is its own group.
+        hit: bool = False,
+            Whether the access was a cache hit, as opposed to a miss.
+        """
+        path = os.path.abspath(path)
+        group = path if group is None else os.path.abspath(group)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                """
+                INSERT INTO entries VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT(path) DO UPDATE SET
+                    entry_group = excluded.entry_group,
+                    size = excluded.size,
+                    last_access = excluded.last_access,
+                    accesses = accesses + 1
+                """,
+                (path, group, path_size(path), time()),
+            )
+            if path == group:
+                connection.execute(
+                    "UPDATE counters SET value = value + 1 WHERE name = ?",
+                    ("hits" if hit else "misses",),
+                )
+
+    def size(self) -> int:
+        """Return the number of bytes of the tracked artifacts."""
+        with closing(self._connect()) as connection:
+            return connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+    def statistics(self) -> Dict[str, int]:
+        """Return the hit, miss and eviction counters and the tracked size."""
+        with closing(self._connect()) as connection:
+            counters = dict(connection.execute("SELECT name, value FROM counters"))
+        counters["size"] = self.size()
+        return counters
+
+    def _evict_group(self, group: str) -> bool:
+        """Remove the artifacts of the given group, unless it is in use.
+
+        Parameters
+        -------------------
+        group: str,
+            The path of the archive whose artifacts are to be removed.
+
+        Returns
+        -------------------
+        Boolean value representing if the group was evicted.
+        """
+        with open(self._lock_path(group), "a") as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return False
+            with closing(self._connect()) as connection, connection:
+                paths = [
+                    path
+                    for (path,) in connection.execute(
+                        "SELECT path FROM entries WHERE entry_group = ?", (group,)
+                    )
+                ]
+                for path in paths:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path)
+                    elif os.path.exists(path):
+                        os.remove(path)
+                connection.execute("DELETE FROM entries WHERE entry_group = ?", (group,))
+                connection.execute(
+                    "UPDATE counters SET value = value + 1 WHERE name = 'evictions'"
+                )
+        return True
+
+    def evict(self) -> int:
+        """Evict the groups of artifacts exceeding the byte budget.
+
+        Returns
+        -------------------
+        The number of evicted groups.
+        """
+        order = (
+            "MAX(last_access)"
+            if self._policy == "lru"
+            else "SUM(accesses), MAX(last_access)"
+        )
+        with closing(self._connect()) as connection:
+            groups = connection.execute(
+                f"""
+                SELECT entry_group, SUM(size) FROM entries
+                GROUP BY entry_group ORDER BY {order}
+                """
+            ).fetchall()
+        excess = sum(size for _, size in groups) - self._max_size
+        evicted = 0
+        for group, size in groups:
+            if excess <= 0:
+                break
+            if self._evict_group(group):
+                excess -= size
+                evicted += 1
+        return evicted
@@ -0,0 +1,276 @@
+"""Submodule providing a content-addressed store of the downloaded files."""
+import errno
+import os
+import shutil
+import sqlite3
+from contextlib import closing
+from typing import Dict, Optional
+
+import requests
+
+from ..utils import file_digest, temporary_path
+
+# Linux ioctl request cloning the extents of a file on copy-on-write
+# file systems such as btrfs and xfs.
+FICLONE = 0x40049409
+
+# Errors of the hardlinks across file systems, or on file systems not
+# supporting them, which are copied instead.
+LINK_ERRORS = (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP)
+
+
+def link_or_copy(source: str, destination: str):
+    """Materialize the given source file at the given destination.
+
+    Parameters
+    -------------------
+    source: str,
+        The file to materialize.
+    destination: str,
+        The path where to materialize the file, which is replaced if it exists.
+
+    Implementative details
+    -------------------
+    The file is hardlinked when source and destination are on the same
+    file system, reflinked on copy-on-write file systems and copied
+    otherwise. The destination is replaced atomically.
+    """
+    temporary = temporary_path(destination)
+    try:
+        os.link(source, temporary)
+    except OSError as link_exception:
+        if link_exception.errno not in LINK_ERRORS:
+            raise
+        with open(source, "rb") as f_in, open(temporary, "xb") as f_out:
+            try:
+                import fcntl
+
+                fcntl.ioctl(f_out.fileno(), FICLONE, f_in.fileno())
+            except (ImportError, OSError):
+                shutil.copyfileobj(f_in, f_out)
+    os.replace(temporary, destination)
+
+
+class ContentStore:
+    """Store of the downloaded files keyed by their SHA-256 digest."""
+
+    def __init__(self, directory: str):
+        """Create new ContentStore object.
+
+        Parameters
+        -------------------
+        directory: str,
+            The directory where the objects and the index are stored.
+            It can be shared by multiple processes and target directories.
+        """
+        self._directory = directory
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT
+                );
+                CREATE TABLE IF NOT EXISTS materializations (
+                    destination TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                """
+            )
+
+    @property
+    def directory(self) -> str:
+        """Return the directory of the store."""
+        return self._directory
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return a new connection to the index of the store."""
+        connection = sqlite3.connect(
+            os.path.join(self._directory, "index.sqlite"), timeout=60
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def object_path(self, digest: str) -> str:
+        """Return the path of the object with the given digest."""
+        return os.path.join(self._directory, "objects", digest[:2], digest)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the entry of the given url, if its object is in the store.
+
+        Parameters
+        -------------------
+        url: str,
+            The url to look up.
+
+        Returns
+        -------------------
+        Dictionary with the digest, size, ETag and Last-Modified of the
+        file last downloaded from the url, or None.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT digest, size, etag, last_modified FROM urls WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None or not os.path.exists(self.object_path(row[0])):
+            return None
+        return dict(zip(("digest", "size", "etag", "last_modified"), row))
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Return the headers revalidating the stored file of the given url.
+
+        Parameters
+        -------------------
+        url: str,
+            The url to be downloaded.
+
+        Returns
+        -------------------
+        Dictionary with the If-None-Match and If-Modified-Since headers,
+        empty when the url is not in the store.
+        """
+        entry = self.lookup(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry["etag"] is not None:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"] is not None:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_fresh(self, url: str, response: requests.Response) -> bool:
+        """Return whether the stored file of the given url matches the response.
+
+        Parameters
+        -------------------
+        url: str,
+            The requested url.
+        response: requests.Response,
+            The response, whose body has not been consumed yet.
+
+        Returns
+        -------------------
+        Boolean value representing if the server has answered with a 304,
+        or with a 200 carrying the same validator of the stored file, so
+        that the body does not need to be transferred.
+        """
+        entry = self.lookup(url)
+        if entry is None:
+            return False
+        if response.status_code == 304:
+            return True
+        if response.status_code != 200:
+            return False
+        etag = response.headers.get("etag")
+        if etag is not None:
+            return etag == entry["etag"]
+        last_modified = response.headers.get("last-modified")
+        return (
+            last_modified is not None
+            and last_modified == entry["last_modified"]
+            and int(response.headers.get("content-length", -1)) == entry["size"]
+        )
+
+    def ingest(
+        self,
+        url: str,
+        path: str,
+        response: requests.Response,
+        digest: Optional[str] = None,
+    ):
+        """Add the file downloaded from the given url to the store.
+
+        Parameters
+        -------------------
+        url: str,
+            The url the file was downloaded from.
+        path: str,
+            The path of the downloaded file.
+        response: requests.Response,
+            The response the file was downloaded from, providing the validators.
+        digest: Optional[str] = None,
+            The SHA-256 hex digest of the file, computed if not provided.
+        """
+        if digest is None:
+            digest = file_digest(path)
+        size = os.path.getsize(path)
+        object_path = self.object_path(digest)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            link_or_copy(path, object_path)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?)",
+                (
+                    url,
+                    digest,
+                    size,
+                    response.headers.get("etag"),
+                    response.headers.get("last-modified"),
+                ),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO materializations VALUES (?, ?, ?)",
+                (os.path.abspath(path), digest, size),
+            )
+
+    def materialize(self, url: str, destination: str) -> int:
+        """Materialize the stored file of the given url at the given destination.
+
+        Parameters
+        -------------------
+        url: str,
+            The url whose stored file is to be materialized.
+        destination: str,
+            The path where to materialize the file.
+
+        Raises
+        -------------------
+        ValueError,
+            If the url is not in the store.
+
+        Returns
+        -------------------
+        The size of the materialized file.
+        """
+        entry = self.lookup(url)
+        if entry is None:
+            raise ValueError(f"The url {url} is not in the content store.")
+        link_or_copy(self.object_path(entry["digest"]), destination)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO materializations VALUES (?, ?, ?)",
+                (os.path.abspath(destination), entry["digest"], entry["size"]),
+            )
+        return entry["size"]
+
+    def is_valid(self, destination: str) -> bool:
+        """Return whether the given destination is a complete materialized file.
+
+        Parameters
+        -------------------
+        destination: str,
+            The path to check.
+
+        Returns
+        -------------------
+        Boolean value representing if the file at the given path was
+        materialized by the store and still has the expected size.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT size FROM materializations WHERE destination = ?",
+                (os.path.abspath(destination),),
+            ).fetchone()
+        return (
+            row is not None
+            and os.path.exists(destination)
+            and os.path.getsize(destination) == row[0]
+        )
@@ -1,4 +1,27 @@
 """Module with the classes relative to downloading stuff."""
-from .base_downloader import BaseDownloader
+# As in the package __init__, the typing module is not imported at runtime.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from .base_downloader import BaseDownloader
 
 __all__ = ["BaseDownloader"]
+
+
+def __getattr__(name: str):
+    """Return the public object with the given name, importing it on first access.
+
+    The public objects are imported lazily (PEP 562), so that importing
+    the package does not import requests and the extractors.
+    """
+    if name == "BaseDownloader":
+        from .base_downloader import BaseDownloader as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Return the names of the module, including the ones not imported yet."""
+    return sorted(set(globals()) | set(__all__))
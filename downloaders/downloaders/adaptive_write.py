@@ -0,0 +1,101 @@
+"""Submodule providing the write of a streamed response through a reusable buffer."""
+from time import perf_counter
+from typing import BinaryIO, Callable, Iterable, Optional
+
+import requests
+
+# Time in seconds that a read may take before the block size stops growing,
+# so that the block size follows the throughput of the connection.
+TARGET_READ_TIME = 0.005
+
+# Minimum time in seconds between two updates of the progress callback.
+PROGRESS_INTERVAL = 0.1
+
+
+def supports_readinto(response: requests.Response) -> bool:
+    """Return whether the body of the given response can be read into a buffer.
+
+    Parameters
+    -------------------
+    response: requests.Response,
+        The streamed response.
+
+    Returns
+    -------------------
+    Boolean value representing if the body is not content-encoded, as the
+    raw reads return the encoded bytes which `iter_content` would decode.
+    """
+    return (
+        response.headers.get("content-encoding", "identity").lower() == "identity"
+        and hasattr(response.raw, "readinto")
+    )
+
+
+def write_response(
+    response: requests.Response,
+    handle: BinaryIO,
+    block_size: int,
+    max_block_size: int,
+    consumers: Iterable[Callable[[memoryview], None]] = (),
+    callback: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Write the body of the given response to the given file.
+
+    The body is read into a reusable buffer, whose blocks are doubled while
+    each read fills them faster than the target read time, and halved when
+    the reads take much longer, so that fast connections are not bound by
+    the per-block overhead.
+
+    Parameters
+    -------------------
+    response: requests.Response,
+        The streamed response, which must not be content-encoded.
+    handle: BinaryIO,
+        The file opened for writing.
+    block_size: int,
+        The initial and minimum dimension of the blocks.
+    max_block_size: int,
+        The maximum dimension of the blocks.
+    consumers: Iterable[Callable[[memoryview], None]] = (),
+        Functions called with each block, such as the updates of the digests.
+    callback: Optional[Callable[[int], None]] = None,
+        Function called with the number of bytes written since its last
+        call, at most once every progress interval and at the end.
+
+    Returns
+    -------------------
+    The number of written bytes.
+    """
+    consumers = list(consumers)
+    size = block_size
+    view = memoryview(bytearray(size))
+    written = 0
+    pending = 0
+    last_update = perf_counter()
+    try:
+        while True:
+            start = perf_counter()
+            read = response.raw.readinto(view[:size])
+            if not read:
+                break
+            now = perf_counter()
+            block = view[:read]
+            handle.write(block)
+            for consumer in consumers:
+                consumer(block)
+            written += read
+            pending += read
+            if callback is not None and now - last_update >= PROGRESS_INTERVAL:
+                callback(pending)
+                pending = 0
+                last_update = now
+            if read == size and now - start < TARGET_READ_TIME:
+                size = min(2 * size, max_block_size)
+                if size > len(view):
+                    view = memoryview(bytearray(size))
+            elif now - start > 4 * TARGET_READ_TIME:
+                size = max(size // 2, block_size)
+    finally:
+        if callback is not None and pending:
+            callback(pending)
+    return written
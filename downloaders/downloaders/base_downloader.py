@@ -1,16 +1,59 @@
 """Module to handle cleanly download of files."""
 
+import hashlib
 import os
+from contextlib import ExitStack, nullcontext
+from itertools import chain
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from multiprocessing import Pool, cpu_count
-from typing import Dict, List, Union
-from time import sleep
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from time import perf_counter
 
-import pandas as pd
 import requests
-from tqdm.auto import tqdm
 
-from ..extractors import AutoExtractor
-from ..utils import is_iterable
+from ..utils import commit_path, is_iterable, preallocate, temporary_path
+from .adaptive_write import supports_readinto, write_response
+from .checksum import Checksum, load_manifest, parse_checksum
+from .deduplication import DestinationLock, TaskCoalescer
+from .metrics import DownloadMetrics
+from .rate_limiter import HostLimiter, release_on
+from .report_sink import open_report_sink
+from .retry import RetryPolicy, iter_with_retries
+from .resume import (
+    load_sidecar,
+    part_path,
+    remove_partial,
+    resume_headers,
+    resumed_offset,
+    store_sidecar,
+)
+from .segmented import download_segments, supports_segments
+from .session import get_session, pop_connect_time
+
+# The modules which are slow to import and not needed by every download,
+# such as pandas, tqdm, asyncio and the extractors, are imported on first use.
+if TYPE_CHECKING:
+    import asyncio
+
+    import aiohttp
+    import pandas as pd
+    from tqdm import tqdm
+
+    from ..cache import CacheManager
+    from ..extractors import AutoExtractor
+    from ..extractors.streaming import StreamingExtraction
 
 
 class BaseDownloader:
@@ -30,6 +73,34 @@ class BaseDownloader:
         timeout: int = 60,
         sleep_time: int = 0,
         verbose: int = 2,
+        keep_alive: bool = True,
+        pool_size: int = 10,
+        http_retries: int = 0,
+        engine: str = "process",
+        concurrency: int = 256,
+        download_workers: int = 32,
+        extract_workers: int = -1,
+        resumable: bool = False,
+        segments: int = 1,
+        segment_threshold: int = 64 * 1024 * 1024,
+        segment_retries: int = 3,
+        cache_directory: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        cache_policy: str = "lru",
+        stream_extraction: bool = False,
+        extraction_processes: int = 1,
+        checksum_algorithm: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        rate_burst: int = 1,
+        max_connections_per_host: Optional[int] = None,
+        host_limits: Optional[Dict[str, Dict]] = None,
+        retries: int = 0,
+        retry_backoff: float = 1.0,
+        retry_max_backoff: float = 60.0,
+        retry_statuses: Tuple[int, ...] = (408, 425, 429, 500, 502, 503, 504),
+        metrics_hook: Optional[Callable[[Dict], None]] = None,
+        fsync: bool = False,
+        max_block_size: int = 8 * 1024 * 1024,
     ):
         """Create new BaseDownloader.
 
@@ -57,7 +128,9 @@ class BaseDownloader:
         timeout: int = 60,
             Timeout for the requests.
         sleep_time: int = 0,
-            Time to sleep between requests.
+            Minimum time between the requests towards each host. This is
+            a shorthand for a rate limit of one request every `sleep_time`
+            seconds, and is ignored when the rate limit is given.
         verbose: int = 2,
             The level of verbosity.
             With level 1, the overall loading bar is showed.
@@ -65,13 +138,182 @@ class BaseDownloader:
             Do note that, when using multiprocessing, which is enabled
             automatically when providing multiple urls to download unless
             specified otherwise, the inner bar will not be shown
+        keep_alive: bool = True,
+            Whether to reuse a pooled keep-alive session for all the
+            downloads executed within the same process, instead of
+            opening a new connection for each file.
+        pool_size: int = 10,
+            Maximum number of keep-alive connections kept open towards each host.
+            It is raised to the number of concurrent requests of each
+            process, that is the download workers of the "thread" engine
+            times the segments, so that no connection is discarded.
+        http_retries: int = 0,
+            Number of retries the HTTP adapter executes on connection errors
+            and on the 429, 500, 502, 503 and 504 status codes.
+        engine: str = "process",
+            The engine used to execute the downloads.
+            With "process", the downloads are split across a process pool.
+            With "asyncio", the downloads are executed concurrently within
+            a single process by an event loop, which requires aiohttp.
+            With "thread", the downloads are executed by a thread pool
+            which feeds the extractions to a separate process pool, so
+            that slow extractions do not hold network slots.
+        concurrency: int = 256,
+            Maximum number of in-flight downloads of the "asyncio" engine.
+        download_workers: int = 32,
+            Number of download threads of the "thread" engine.
+        extract_workers: int = -1,
+            Number of extraction processes of the "thread" engine.
+            If the given number is -1, we use all the available processes.
+        resumable: bool = False,
+            Whether to write the downloads to a partial file which is kept
+            when the download fails or is interrupted, so that the next
+            attempt resumes it with a range request.
+            It is not supported by the "asyncio" engine.
+        segments: int = 1,
+            Number of concurrent range requests to split the download of
+            large files into, when the server accepts byte ranges.
+            With 1, the files are always downloaded over a single stream.
+            It is not supported by the "asyncio" engine.
+        segment_threshold: int = 64 * 1024 * 1024,
+            Minimum size in bytes of the files to download in segments.
+        segment_retries: int = 3,
+            Number of times a failed segment is resumed from its last written byte.
+        cache_directory: Optional[str] = None,
+            Directory of a content-addressed store of the downloaded files,
+            which can be shared across target directories and processes.
+            When provided, an existing file is a cache hit only if it was
+            completely written by the store, files of known urls are
+            revalidated with conditional requests and materialized by
+            hardlink, reflink or copy without transferring their body.
+            As materialized files may be hardlinks to the stored objects,
+            they must not be modified in place.
+            It is not supported by the "asyncio" engine.
+        cache_size: Optional[int] = None,
+            Maximum number of bytes of the downloaded files and of their
+            extracted artifacts, which are evicted together when the budget
+            is exceeded, unless another process is using them.
+            The index is stored in the cache directory if provided, and
+            otherwise in the ".downloaders_cache" directory of the target one.
+            By default, the artifacts are never evicted.
+        cache_policy: str = "lru",
+            The eviction policy, either "lru" or "lfu".
+        stream_extraction: bool = False,
+            Whether to decompress gzip, xz and bzip2 files and to extract
+            the members of tar archives while they are downloaded, so that
+            the extraction completes with the download.
+            When the original file is to be deleted after the extraction, it
+            is never written to disk. It is not applied to resumable downloads.
+            It is not supported by the "asyncio" engine.
+        extraction_processes: int = 1,
+            Number of processes used to extract the archives whose members
+            can be extracted in parallel, such as zip archives and the
+            bzip2 and xz files made of multiple blocks.
+            If the given number is -1, we use all the available processes.
+            Within the pool of the "process" engine the extraction is serial.
+        checksum_algorithm: Optional[str] = None,
+            The hashlib algorithm, such as "sha256", "md5" or "blake2b",
+            of the digest computed while downloading each file and recorded
+            in the report, which is also the algorithm of the expected
+            checksums given without prefix. By default, the digests are only
+            computed for the files with an expected checksum.
+        rate_limit: Optional[float] = None,
+            Maximum number of requests per second towards each host, shared
+            by all the workers of all the engines. By default, the requests
+            are not rate limited.
+        rate_burst: int = 1,
+            Maximum number of requests sent at once towards a host which
+            has not been requested for a while, that is the size of the
+            token bucket of the rate limit.
+        max_connections_per_host: Optional[int] = None,
+            Maximum number of concurrent connections towards each host,
+            shared by all the workers of all the engines.
+            By default, the connections are not limited.
+        host_limits: Optional[Dict[str, Dict]] = None,
+            The limits of specific hosts, as dictionaries with the keys
+            "rate", "burst" and "connections", overriding the default ones,
+            such as {"example.com": {"rate": 2, "connections": 4}}.
+            When any limit is set, the 429 and 503 responses with a
+            Retry-After header also pause all the requests towards the host.
+        retries: int = 0,
+            Maximum number of times a download failed with a retryable status
+            code or with a transient network error is retried. The failed
+            downloads are queued again after the ones still to be executed,
+            so that no worker is kept waiting for their backoff, and the
+            early crash only happens once their attempts are exhausted.
+            The attempts of each download are reported in the `attempts`
+            column, and the failed rows can be rerun with `retry_failed`.
+        retry_backoff: float = 1.0,
+            Base of the exponential backoff in seconds. The delay before
+            the n-th retry is drawn uniformly between zero and
+            `retry_backoff * 2 ** (n - 1)`, so that the retries are spread out.
+        retry_max_backoff: float = 60.0,
+            Maximum delay in seconds before a retry.
+        retry_statuses: Tuple[int, ...] = (408, 425, 429, 500, 502, 503, 504),
+            The status codes of the failed requests which are retried.
+        metrics_hook: Optional[Callable[[Dict], None]] = None,
+            Function called within the calling process with the final report
+            of each download, including the ones executed by pool workers,
+            as soon as it is available. The reports are also aggregated in
+            the counters and histograms returned by the `metrics` property.
+        fsync: bool = False,
+            Whether to flush the downloaded and extracted files to disk
+            before they are moved to their destinations. The files are
+            always written to a temporary path within the same directory
+            and atomically renamed once complete, so that other processes
+            sharing the directory never observe a partial file, and with
+            this option they also survive a crash of the machine.
+        max_block_size: int = 8 * 1024 * 1024,
+            The maximum dimension of the blocks read from the responses.
+            The blocks grow from the block size while the connection
+            fills them faster than they are written, and the progress bar
+            is updated at most ten times per second. It is ignored by the
+            "asyncio" engine and by the streaming extractions.
         """
+        if not isinstance(extraction_processes, int) or extraction_processes == 0:
+            raise ValueError(
+                "The given number of extraction processes is not a strictly positive integer."
+            )
+        if cache_directory is not None and engine == "asyncio":
+            raise ValueError("The content store is not supported by the asyncio engine.")
+        if not isinstance(max_block_size, int) or max_block_size < block_size:
+            raise ValueError("The given maximum block size is smaller than the block size.")
+        if not isinstance(segments, int) or segments <= 0:
+            raise ValueError("The given number of segments is not a strictly positive integer.")
+        if not isinstance(segment_retries, int) or segment_retries < 0:
+            raise ValueError("The given number of segment retries is not a positive integer.")
+        if resumable and engine == "asyncio":
+            raise ValueError("Resumable downloads are not supported by the asyncio engine.")
+        if segments != 1 and engine == "asyncio":
+            raise ValueError("Segmented downloads are not supported by the asyncio engine.")
+        if stream_extraction and engine == "asyncio":
+            raise ValueError("Streaming extraction is not supported by the asyncio engine.")
+        if engine not in ("process", "asyncio", "thread"):
+            raise ValueError(
+                f"The given engine {engine} is not supported. "
+                "The supported engines are 'process', 'asyncio' and 'thread'."
+            )
+        if not isinstance(download_workers, int) or download_workers <= 0:
+            raise ValueError(
+                "The given number of download workers is not a strictly positive integer."
+            )
+        if not isinstance(extract_workers, int) or extract_workers == 0:
+            raise ValueError(
+                "The given number of extract workers is not a strictly positive integer."
+            )
+        if not isinstance(concurrency, int) or concurrency <= 0:
+            raise ValueError("The given concurrency is not a strictly positive integer.")
         if not isinstance(process_number, int) or process_number == 0:
             raise ValueError(
                 "The given process number is not a strictly positive integer."
             )
+        if not isinstance(pool_size, int) or pool_size <= 0:
+            raise ValueError("The given pool size is not a strictly positive integer.")
+        if not isinstance(http_retries, int) or http_retries < 0:
+            raise ValueError("The given number of HTTP retries is not a positive integer.")
         self._process_number = process_number if process_number > 0 else cpu_count()
         self._block_size = block_size
+        self._max_block_size = max_block_size
         self._auto_extract = auto_extract
         self._max_description_size = max_description_size - len(description_pattern)
         self._cache = cache
@@ -81,14 +323,189 @@ class BaseDownloader:
         self._crash_early = crash_early
         if isinstance(verbose, bool):
             verbose = int(verbose)
-        self._sleep_time = sleep_time
         self._verbose = verbose
+        self._keep_alive = keep_alive
+        # The connections exceeding the pool are discarded by urllib3, so
+        # the pool holds one connection for each concurrent request.
+        self._pool_size = max(
+            pool_size, (download_workers if engine == "thread" else 1) * segments
+        )
+        self._http_retries = http_retries
+        self._engine = engine
+        self._concurrency = concurrency
+        self._download_workers = download_workers
+        self._extract_workers = extract_workers if extract_workers > 0 else cpu_count()
+        self._resumable = resumable
+        self._segments = segments
+        self._segment_threshold = segment_threshold
+        self._segment_retries = segment_retries
+        self._stream_extraction = stream_extraction
+        self._checksum_algorithm = checksum_algorithm
+        self._delete_original_after_extraction = delete_original_after_extraction
+        self._store = None
+        if cache_directory is not None:
+            from ..cache import ContentStore
+
+            self._store = ContentStore(cache_directory)
+        self._cache_manager = None
+        if cache_size is not None:
+            from ..cache import CacheManager
+
+            self._cache_manager = CacheManager(
+                directory=(
+                    os.path.join(target_directory, ".downloaders_cache")
+                    if cache_directory is None
+                    else cache_directory
+                ),
+                max_size=cache_size,
+                policy=cache_policy,
+            )
+        self._metrics = DownloadMetrics()
+        self._metrics_hook = metrics_hook
+        self._retry_policy = RetryPolicy(
+            retries=retries,
+            backoff=retry_backoff,
+            max_backoff=retry_max_backoff,
+            statuses=retry_statuses,
+        )
+        if rate_limit is None and sleep_time > 0:
+            rate_limit = 1 / sleep_time
+        self._host_limiter = (
+            None
+            if rate_limit is None and max_connections_per_host is None and not host_limits
+            else HostLimiter(
+                os.path.join(target_directory, ".downloaders_limits"),
+                rate=rate_limit,
+                burst=rate_burst,
+                connections=max_connections_per_host,
+                hosts=host_limits,
+            )
+        )
         if self._process_number == 1 and self._verbose == 1:
             self._verbose = 2
-        self._extractor = AutoExtractor(
-            cache=self._cache,
-            delete_original_after_extraction=delete_original_after_extraction,
+        self._extraction_processes = extraction_processes
+        self._fsync = fsync
+        self._auto_extractor = None
+
+    @property
+    def _extractor(self) -> "AutoExtractor":
+        """Return the extractor of the downloaded files, created on first use."""
+        if self._auto_extractor is None:
+            from ..extractors import AutoExtractor
+
+            self._auto_extractor = AutoExtractor(
+                cache=self._cache,
+                delete_original_after_extraction=self._delete_original_after_extraction,
+                processes=self._extraction_processes,
+                fsync=self._fsync,
+            )
+        return self._auto_extractor
+
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Return the streamed response for the given url.
+
+        Parameters
+        ----------------------
+        url: str,
+            The url to request.
+        headers: Optional[Dict[str, str]] = None,
+            Additional headers of the request.
+
+        Returns
+        ----------------------
+        The response object, whose body is still to be consumed.
+        """
+        get = (
+            get_session(pool_size=self._pool_size, http_retries=self._http_retries).get
+            if self._keep_alive
+            else requests.get
         )
+        if self._host_limiter is None:
+            return get(url, headers=headers, stream=True, timeout=self._timeout)
+        slot = self._host_limiter.acquire(url)
+        try:
+            response = get(url, headers=headers, stream=True, timeout=self._timeout)
+        except BaseException:
+            slot.release()
+            raise
+        self._host_limiter.observe(
+            url, response.status_code, response.headers.get("retry-after")
+        )
+        # The slot is held until the connection is released.
+        release_on(response, "close", slot)
+        return response
+
+    def _resume_offset(self, request: requests.Response, destination: str) -> int:
+        """Return the offset at which the given response resumes the partial file.
+
+        Parameters
+        ----------------------
+        request: requests.Response,
+            The response to the, possibly ranged, request.
+        destination: str,
+            The final path of the download.
+
+        Returns
+        ----------------------
+        The number of bytes of the partial file the response body continues,
+        or 0 if the server has sent the whole file, in which case the
+        partial file is discarded.
+        """
+        metadata = load_sidecar(destination)
+        offset = resumed_offset(request)
+        if metadata is not None and offset is not None and offset == metadata["offset"]:
+            return offset
+        remove_partial(destination)
+        return 0
+
+    def _download_segments(
+        self,
+        url: str,
+        destination: str,
+        path: str,
+        file_size: int,
+        request: requests.Response,
+        bar: "tqdm",
+    ) -> int:
+        """Download the given url over concurrent range requests.
+
+        Parameters
+        ----------------------
+        url: str,
+            The url from where to download the data.
+        destination: str,
+            The path where to store the data.
+        path: str,
+            The path where the data is written until the download is complete.
+        file_size: int,
+            Size of the file in bytes.
+        request: requests.Response,
+            The response to the plain request, providing the file validators.
+        bar: "tqdm",
+            The loading bar to update.
+
+        Returns
+        ----------------------
+        The number of segments the file was downloaded in.
+        """
+        try:
+            return download_segments(
+                get=lambda segment_url, headers: self._get(segment_url, headers=headers),
+                url=url,
+                path=path,
+                file_size=file_size,
+                segments=self._segments,
+                block_size=self._block_size,
+                retries=self._segment_retries,
+                validator=request.headers.get("etag")
+                or request.headers.get("last-modified"),
+                callback=bar.update,
+            )
+        except (Exception, KeyboardInterrupt) as segments_exception:
+            # A preallocated file with holes cannot be resumed from its size.
+            if self._resumable:
+                remove_partial(destination)
+            raise segments_exception
 
     def destination_path(self, request: requests.Request, url: str) -> str:
         """Return path to where to store the file."""
@@ -98,7 +515,7 @@ class BaseDownloader:
             file_name = file_name.split("?")[0]
         return os.path.join(self._target_directory, file_name)
 
-    def build_loading_bar(self, file_size: int, path: str) -> tqdm:
+    def build_loading_bar(self, file_size: int, path: str) -> "tqdm":
         """Return loading bar.
 
         Parameters
@@ -114,6 +531,8 @@ class BaseDownloader:
         """
         if len(path) > self._max_description_size:
             path = f"{path[:self._max_description_size//2]}...{path[-self._max_description_size//2:]}"
+        from tqdm.auto import tqdm
+
         return tqdm(
             total=file_size,
             unit="iB",
@@ -128,13 +547,245 @@ class BaseDownloader:
         """Return boolean representing if given path is cached."""
         if not self._cache:
             return False
-        return (
-            os.path.exists(destination)
-            or self._extractor.can_extract(destination)
-            and self._extractor.is_cached(self._extractor.destination_path(destination))
+        if os.path.exists(destination) and (
+            self._store is None or self._store.is_valid(destination)
+        ):
+            return True
+        # The extractor is looked up once, as each probe may read the file.
+        extractor = self._extractor.get_supported_extractor(destination)
+        return extractor is not None and extractor.is_cached(
+            extractor.destination_path(destination)
         )
 
-    def _download(self, url: str, destination: str = None) -> Dict:
+    def _cached_file_size(self, destination: str) -> Optional[int]:
+        """Return the size of the cached file, if it still exists.
+
+        Parameters
+        ----------------------
+        destination: str,
+            The path of the cached file.
+
+        Returns
+        ----------------------
+        The size of the file, or None if only its extracted form is left.
+        """
+        if os.path.exists(destination):
+            return os.path.getsize(destination)
+        return None
+
+    @property
+    def cache_manager(self) -> Optional["CacheManager"]:
+        """Return the manager of the size-bounded cache, if enabled."""
+        return self._cache_manager
+
+    @property
+    def metrics(self) -> DownloadMetrics:
+        """Return the metrics aggregated over the downloads executed so far."""
+        return self._metrics
+
+    def _observe(self, report: Dict):
+        """Add the given final report to the metrics and pass it to the hook."""
+        self._metrics.observe(report)
+        if self._metrics_hook is not None:
+            self._metrics_hook(report)
+
+    def __getstate__(self) -> Dict:
+        """Return the state sent to the pool workers.
+
+        The reports are observed within the calling process, so neither
+        the metrics nor the hook, which may not be picklable, are sent.
+        """
+        state = self.__dict__.copy()
+        state["_metrics"] = None
+        state["_metrics_hook"] = None
+        return state
+
+    def _track(self, destination: str, extraction_metadata: Dict, cached: bool):
+        """Record the access to the given download and its extraction, then evict.
+
+        Parameters
+        ----------------------
+        destination: str,
+            The path of the downloaded file.
+        extraction_metadata: Dict,
+            The metadata of the extraction of the file, empty if not extracted.
+        cached: bool,
+            Whether the download was a cache hit.
+        """
+        if self._cache_manager is None:
+            return
+        self._cache_manager.record(destination, hit=cached)
+        if extraction_metadata.get("destination") is not None:
+            self._cache_manager.record(
+                extraction_metadata["destination"], group=destination
+            )
+        self._cache_manager.evict()
+
+    def _extract_and_track(
+        self,
+        destination: str,
+        cached: bool,
+        extract: bool = True,
+        extraction_metadata: Optional[Dict] = None,
+    ) -> Dict:
+        """Return the metadata of the extraction of the given file, tracking both.
+
+        Parameters
+        ----------------------
+        destination: str,
+            The path of the downloaded file.
+        cached: bool,
+            Whether the download was a cache hit.
+        extract: bool = True,
+            Whether to execute the automatic extraction. Otherwise, the file
+            is not tracked either, as it is left to the caller to extract
+            and track it.
+        extraction_metadata: Optional[Dict] = None,
+            The metadata of an extraction already executed while downloading.
+
+        Returns
+        ----------------------
+        Dictionary with the extraction metadata, empty if nothing was extracted.
+        """
+        # The download is protected from evictions executed by other
+        # processes while it is being extracted.
+        with (
+            nullcontext()
+            if self._cache_manager is None
+            else self._cache_manager.in_use(destination)
+        ):
+            if extraction_metadata is None and not extract:
+                # The caller extracts the file, and tracks it once extracted.
+                return {}
+            if extraction_metadata is None:
+                extraction_metadata = self._extract(destination)
+            self._track(destination, extraction_metadata, cached)
+        return extraction_metadata
+
+    def _build_checksum(self, checksum: Optional[str]) -> Optional[Checksum]:
+        """Return the digest to compute for a download with the given expected checksum.
+
+        Parameters
+        ----------------------
+        checksum: Optional[str],
+            The expected checksum of the download, if any.
+
+        Returns
+        ----------------------
+        The digest to compute, or None if no digest is required.
+        """
+        if checksum is not None:
+            return Checksum(*parse_checksum(checksum, self._checksum_algorithm))
+        if self._checksum_algorithm is not None:
+            return Checksum(self._checksum_algorithm)
+        return None
+
+    def _streaming_extraction(self, destination: str) -> Optional["StreamingExtraction"]:
+        """Return the extraction to feed with the blocks of the given download.
+
+        Parameters
+        ----------------------
+        destination: str,
+            The path of the file being downloaded.
+
+        Returns
+        ----------------------
+        The streaming extraction, or None if the file is not to be
+        extracted while it is downloaded.
+        """
+        if not self._stream_extraction or not self._auto_extract:
+            return None
+        extractor = self._extractor.get_supported_extractor(destination)
+        if extractor is None:
+            return None
+        return extractor.streaming_extraction(extractor.destination_path(destination))
+
+    def _extract(self, destination: str) -> Dict:
+        """Return the metadata of the extraction of the given file, if enabled.
+
+        Parameters
+        ----------------------
+        destination: str,
+            The path of the downloaded file.
+
+        Returns
+        ----------------------
+        Dictionary with the extraction metadata, including the time it took,
+        empty if nothing was extracted.
+        """
+        if self._auto_extract and self._extractor.can_extract(destination):
+            start_time = perf_counter()
+            extraction_metadata = self._extractor.extract(destination)[0]
+            return {**extraction_metadata, "time": perf_counter() - start_time}
+        return {}
+
+    def _extract_locked(self, destination: str) -> Dict:
+        """Return the metadata of the extraction of the given file, holding its lock.
+
+        The extractions executed after the download has released the lock,
+        as within the extraction processes, are not executed concurrently
+        with the ones of the duplicate downloads.
+        """
+        with DestinationLock(destination):
+            return self._extract(destination)
+
+    @staticmethod
+    def _compose_report(
+        url: str,
+        destination: str,
+        status_code: Optional[int],
+        file_size: Optional[int],
+        downloaded_file_size: Optional[int],
+        success: bool,
+        cached: bool,
+        exception: str,
+        extraction_metadata: Dict,
+        segments: Optional[int] = None,
+        elapsed_time: Optional[float] = None,
+        checksum: Optional[str] = None,
+        attempts: int = 1,
+        retryable: bool = False,
+        connect_time: Optional[float] = None,
+        ttfb: Optional[float] = None,
+        transfer_time: Optional[float] = None,
+    ) -> Dict:
+        """Return the metadata dictionary of a download."""
+        return {
+            "status_code": status_code,
+            "file_size": file_size,
+            "downloaded_file_size": downloaded_file_size,
+            "url": url,
+            "destination": destination,
+            "success": success,
+            "cached": cached,
+            "exception": exception,
+            "segments": segments,
+            "checksum": checksum,
+            "attempts": attempts,
+            "retryable": retryable,
+            "connect_time": connect_time,
+            "ttfb": ttfb,
+            "transfer_time": transfer_time,
+            "elapsed_time": elapsed_time,
+            "throughput": (
+                downloaded_file_size / elapsed_time
+                if success and not cached and elapsed_time
+                else None
+            ),
+            **{
+                f"extraction_{key}": value
+                for key, value in extraction_metadata.items()
+            },
+        }
+
+    def _download(
+        self,
+        url: str,
+        destination: str = None,
+        extract: bool = True,
+        checksum: Optional[str] = None,
+        attempt: int = 1,
+    ) -> Dict:
         """Download file at given url showing a loading bar.
 
         Parameters
@@ -144,6 +795,14 @@ class BaseDownloader:
         destination: str = None,
             The path where to store the data.
             If none, it is attempted to assign a proper one.
+        extract: bool = True,
+            Whether to execute the automatic extraction within this call,
+            or to leave it to the caller.
+        checksum: Optional[str] = None,
+            The expected checksum of the file.
+        attempt: int = 1,
+            The number of the attempt of the download, which does not crash
+            early on retryable failures until the attempts are exhausted.
 
         Raises
         ----------------------
@@ -162,49 +821,217 @@ class BaseDownloader:
         exception = ""
         downloaded_file_size = 0
         extration_metadata = {}
+        segments = None
+        elapsed_time = None
+        streaming = None
+        streaming_metadata = None
+        hasher = self._build_checksum(checksum)
+        checksum_digest = None
+        retryable = False
+        connect_time = None
+        ttfb = None
+        transfer_time = None
+        lock = None
+        path = None
+        # The connection opened by a previous download is not accounted.
+        pop_connect_time()
         try:
             try:
                 request = None
+                start_time = perf_counter()
                 if destination is None:
                     # If the destination was not given, we try to assign one by using
                     # the request metadata and the url.
-                    request = requests.get(url, stream=True, timeout=self._timeout)
+                    request = self._get(url)
                     destination = self.destination_path(request, url)
+                # Concurrent downloads of the same destination, possibly by
+                # other processes, wait for the first one to complete.
+                lock = DestinationLock(destination)
+                if not lock.acquire(blocking=False):
+                    # The connection is released while waiting, as the
+                    # file is most likely cached once the lock is acquired.
+                    if request is not None:
+                        request.close()
+                        request = None
+                    lock.acquire()
                 # If the file is not cached we proceed to the download.
                 if not self.is_cached(destination):
+                    headers = (
+                        resume_headers(destination, url) if self._resumable else {}
+                    )
+                    if not headers and self._store is not None:
+                        headers = self._store.conditional_headers(url)
+                    # The request used to infer the destination cannot be
+                    # used to resume a partial download.
+                    if request is not None and headers:
+                        request.close()
+                        request = None
                     # If the request object was not already constructed.
                     if request is None:
-                        request = requests.get(url, stream=True, timeout=self._timeout)
+                        request = self._get(url, headers=headers)
+                    headers_time = perf_counter()
+                    ttfb = request.elapsed.total_seconds()
+                    connect_time = pop_connect_time()
                     # Get the status
                     status_code = request.status_code
-                    # Obtain the file size
-                    file_size = int(request.headers.get("content-length", 0))
-                    # We create the loading bar object.
-                    bar = self.build_loading_bar(file_size, destination)
-                    # If the directory is not already built we create it.
-                    directory = os.path.dirname(os.path.abspath(destination))
-                    if directory:
-                        os.makedirs(directory, exist_ok=True)
-                    # If the user hits ctrl-c during the download we want
-                    # to remove the partial downloaded file.
-                    with open(destination, "wb") as f:
-                        for data in request.iter_content(self._block_size):
-                            data_block = len(data)
-                            bar.update(data_block)
-                            downloaded_file_size += data_block
-                            f.write(data)
-                    bar.close()
-                    # If the request has failed, we remove the file.
-                    if status_code != 200:
-                        raise ValueError(
-                            f"Request to url {url} finished with status code {request.status_code}."
+                    if self._store is not None and self._store.is_fresh(url, request):
+                        # The stored file is still valid, so it is materialized
+                        # without transferring the body.
+                        request.close()
+                        directory = os.path.dirname(os.path.abspath(destination))
+                        if directory:
+                            os.makedirs(directory, exist_ok=True)
+                        file_size = self._store.materialize(url, destination)
+                        if hasher is not None:
+                            hasher.update_from_file(destination)
+                            hasher.verify(url)
+                            checksum_digest = hasher.hexdigest()
+                        cached = True
+                        success = True
+                    else:
+                        # Obtain the file size
+                        file_size = int(request.headers.get("content-length", 0))
+                        offset = 0
+                        if self._resumable:
+                            offset = self._resume_offset(request, destination)
+                            file_size += offset
+                        # We create the loading bar object.
+                        bar = self.build_loading_bar(file_size, destination)
+                        bar.update(offset)
+                        # If the directory is not already built we create it.
+                        directory = os.path.dirname(os.path.abspath(destination))
+                        if directory:
+                            os.makedirs(directory, exist_ok=True)
+                        if self._resumable and status_code in (200, 206):
+                            store_sidecar(destination, url, request, offset)
+                        # The data is written to a temporary path, which is
+                        # atomically renamed to the destination once complete.
+                        path = (
+                            part_path(destination)
+                            if self._resumable
+                            else temporary_path(destination)
                         )
-                    # If we have reached this point, than the download has
-                    # been a success.
-                    success = True
+                        digest = None
+                        if extract and status_code == 200 and not self._resumable:
+                            streaming = self._streaming_extraction(destination)
+                        # The original file is not written at all when it would be
+                        # deleted right after its streaming extraction.
+                        keep_original = (
+                            streaming is None
+                            or not self._delete_original_after_extraction
+                            or self._store is not None
+                        )
+                        if (
+                            streaming is None
+                            and self._segments > 1
+                            and offset == 0
+                            and supports_segments(request, self._segment_threshold)
+                        ):
+                            request.close()
+                            segments = self._download_segments(
+                                url, destination, path, file_size, request, bar
+                            )
+                            downloaded_file_size = file_size
+                        else:
+                            segments = 1
+                            if self._store is not None and not offset:
+                                digest = hashlib.sha256()
+                            # If the user hits ctrl-c during the download we want
+                            # to remove the partial downloaded file.
+                            with (
+                                open(path, "ab" if offset else "wb")
+                                if keep_original
+                                else nullcontext()
+                            ) as f:
 
-                    if self._sleep_time > 0:
-                        sleep(self._sleep_time)
+                                def blocks():
+                                    nonlocal downloaded_file_size
+                                    for data in request.iter_content(self._block_size):
+                                        data_block = len(data)
+                                        bar.update(data_block)
+                                        downloaded_file_size += data_block
+                                        if f is not None:
+                                            f.write(data)
+                                        if digest is not None:
+                                            digest.update(data)
+                                        if hasher is not None:
+                                            hasher.update(data)
+                                        yield data
+
+                                if streaming is None and supports_readinto(request):
+                                    # The partial files of the resumable downloads
+                                    # are not preallocated, as their size is the
+                                    # offset from which they are resumed.
+                                    if not self._resumable:
+                                        preallocate(f.fileno(), file_size)
+                                    downloaded_file_size = write_response(
+                                        request,
+                                        f,
+                                        self._block_size,
+                                        self._max_block_size,
+                                        consumers=[
+                                            consumer.update
+                                            for consumer in (digest, hasher)
+                                            if consumer is not None
+                                        ],
+                                        callback=bar.update,
+                                    )
+                                    # A preallocated file longer than the body of
+                                    # a response without length is cut to its end.
+                                    if not self._resumable:
+                                        f.truncate(downloaded_file_size)
+                                elif streaming is None:
+                                    for _ in blocks():
+                                        pass
+                                else:
+                                    # The extraction pulls the blocks, which are
+                                    # written to disk as they pass through.
+                                    streaming.consume(blocks())
+                        elapsed_time = perf_counter() - start_time
+                        transfer_time = perf_counter() - headers_time
+                        bar.close()
+                        # If the request has failed, we remove the file.
+                        if status_code != 200 and not (offset and status_code == 206):
+                            raise ValueError(
+                                f"Request to url {url} finished with status code {request.status_code}."
+                            )
+                        if hasher is not None:
+                            # The digest could not be computed while streaming
+                            # the resumed and the segmented downloads.
+                            if offset or segments > 1:
+                                hasher.update_from_file(path)
+                            try:
+                                hasher.verify(url)
+                            except ValueError:
+                                # A corrupted partial file must not be resumed.
+                                if self._resumable:
+                                    remove_partial(destination)
+                                raise
+                            checksum_digest = hasher.hexdigest()
+                        # The streaming extraction is completed first, so that
+                        # the destination is not written when it fails.
+                        if streaming is not None:
+                            streaming_metadata = streaming.close()
+                        if keep_original:
+                            commit_path(path, destination, fsync=self._fsync)
+                        if self._resumable:
+                            remove_partial(destination)
+                        if self._store is not None:
+                            self._store.ingest(
+                                url,
+                                destination,
+                                request,
+                                None if digest is None else digest.hexdigest(),
+                            )
+                        if (
+                            streaming is not None
+                            and self._delete_original_after_extraction
+                            and os.path.exists(destination)
+                        ):
+                            os.remove(destination)
+                        # If we have reached this point, than the download has
+                        # been a success.
+                        success = True
                 else:
                     # If the file is cached we approximate the values by
                     # making some assumptions.
@@ -216,8 +1043,19 @@ class BaseDownloader:
                     # Still, the file might have been removed in the meantime
                     # and still exists in its extracted form.
                     # If that is the case, we leave it to None.
-                    if os.path.exists(destination):
-                        file_size = os.path.getsize(destination)
+                    file_size = self._cached_file_size(destination)
+                    # Cached files are verified as well, as they may have been
+                    # truncated by a crash, unless only the extraction is left.
+                    if hasher is not None and file_size is not None:
+                        hasher.update_from_file(destination)
+                        try:
+                            hasher.verify(url)
+                        except ValueError:
+                            # The corrupted cached file is removed, so that
+                            # it is downloaded again by the next attempt.
+                            os.remove(destination)
+                            raise
+                        checksum_digest = hasher.hexdigest()
                     # The downloaded file size, if the download has not failed,
                     # must have the size of the downloaded file.
                     downloaded_file_size = file_size
@@ -225,51 +1063,315 @@ class BaseDownloader:
                     cached = True
                     # Since it is cached it is definitely a success
                     success = True
-                if self._auto_extract and self._extractor.can_extract(destination):
-                    extration_metadata = self._extractor.extract(destination)[0]
+                # We release the connection back to the session pool,
+                # including when the body was not consumed as the file was cached.
+                if request is not None:
+                    request.close()
+                try:
+                    extration_metadata = self._extract_and_track(
+                        destination,
+                        cached,
+                        extract=extract,
+                        extraction_metadata=streaming_metadata,
+                    )
+                except Exception:
+                    # As within the thread engine, the downloaded file whose
+                    # extraction has failed is removed, so that it is not
+                    # served from the cache by the following attempts.
+                    success = False
+                    if os.path.exists(destination):
+                        os.remove(destination)
+                    raise
             # If something fails, we remove the failed download.
             except (Exception, KeyboardInterrupt) as process_exception:
-                # If the download has crashed or has been interrupted
-                # we have to remove the partially downloaded file.
-                if os.path.exists(destination):
-                    os.remove(destination)
+                # The response is closed so that its connection is not
+                # left dangling within the pool.
+                if request is not None:
+                    request.close()
+                # If the download has crashed or has been interrupted we
+                # remove the partially downloaded file, while the destination,
+                # only ever written by an atomic rename, is left untouched.
+                if path is not None and not self._resumable and os.path.exists(path):
+                    os.remove(path)
+                # The same holds for the partially extracted file.
+                if streaming is not None and streaming_metadata is None:
+                    streaming.abort()
+                # The partial file of a resumable download is kept, unless
+                # the server has answered with an error.
+                if (
+                    self._resumable
+                    and destination is not None
+                    and status_code not in (None, 200, 206)
+                ):
+                    remove_partial(destination)
                 # If the bar was created we need to close it down.
                 if bar is not None:
                     bar.close()
                 raise process_exception
+            finally:
+                # The destination is released once it is complete or removed.
+                if lock is not None:
+                    lock.release()
         except KeyboardInterrupt as user_interrupt_exception:
             raise user_interrupt_exception
         except Exception as download_crash_exception:
+            retryable = self._retry_policy.is_retryable(
+                status_code, download_crash_exception
+            )
             # If the download has crashed and it is required to crash early
-            # we raise the captured exception.
-            if self._crash_early:
+            # we raise the captured exception, unless it is to be retried.
+            if self._crash_early and not (
+                retryable and attempt < self._retry_policy.attempts
+            ):
                 raise download_crash_exception
             else:
                 exception = str(download_crash_exception)
 
         # Compose the metadata dictionary.
-        return {
-            "status_code": status_code,
-            "file_size": file_size,
-            "downloaded_file_size": downloaded_file_size,
-            "url": url,
-            "destination": destination,
-            "success": success,
-            "cached": cached,
-            "exception": exception,
-            **{f"extraction_{key}": value for key, value in extration_metadata.items()},
-        }
+        return self._compose_report(
+            url=url,
+            destination=destination,
+            status_code=status_code,
+            file_size=file_size,
+            downloaded_file_size=downloaded_file_size,
+            success=success,
+            cached=cached,
+            exception=exception,
+            extraction_metadata=extration_metadata,
+            segments=segments,
+            elapsed_time=elapsed_time,
+            checksum=checksum_digest,
+            attempts=attempt,
+            retryable=retryable,
+            connect_time=connect_time,
+            ttfb=ttfb,
+            transfer_time=transfer_time,
+        )
 
     def _download_wrapper(self, kwargs: Dict) -> Dict:
         """Method to wrap keywords call to _download method."""
         return self._download(**kwargs)
 
-    def download(
+    async def _get_async(
+        self, session: "aiohttp.ClientSession", url: str, timings: Dict
+    ) -> "aiohttp.ClientResponse":
+        """Return the response for the given url within the event loop.
+
+        Parameters
+        ----------------------
+        session: aiohttp.ClientSession,
+            The session shared by all the downloads of the batch.
+        url: str,
+            The url to request.
+        timings: Dict,
+            Dictionary where the time to first byte and, if a connection
+            is opened, the time to open it are stored.
+
+        Returns
+        ----------------------
+        The response object, whose body is still to be consumed.
+        """
+        slot = None
+        if self._host_limiter is not None:
+            slot = await self._host_limiter.acquire_async(url)
+        try:
+            start_time = perf_counter()
+            response = await session.get(url, trace_request_ctx=timings)
+            timings["ttfb"] = perf_counter() - start_time
+        except BaseException:
+            if slot is not None:
+                slot.release()
+            raise
+        if slot is None:
+            return response
+        self._host_limiter.observe(url, response.status, response.headers.get("retry-after"))
+        # The slot is held until the connection is released.
+        release_on(response, "release", slot)
+        return response
+
+    async def _download_async(
+        self,
+        session: "aiohttp.ClientSession",
+        semaphore: "asyncio.Semaphore",
+        url: str,
+        destination: str = None,
+        checksum: Optional[str] = None,
+        attempt: int = 1,
+    ) -> Dict:
+        """Download file at given url within the event loop.
+
+        Parameters
+        ----------------------
+        session: aiohttp.ClientSession,
+            The session shared by all the downloads of the batch.
+        semaphore: "asyncio.Semaphore",
+            Semaphore bounding the number of in-flight downloads.
+        url: str,
+            The url from where to download the data.
+        destination: str = None,
+            The path where to store the data.
+            If none, it is attempted to assign a proper one.
+        checksum: Optional[str] = None,
+            The expected checksum of the file.
+        attempt: int = 1,
+            The number of the attempt of the download, which does not crash
+            early on retryable failures until the attempts are exhausted.
+
+        Raises
+        ----------------------
+        ValueError,
+            If the request has not a status code 200 (success).
+
+        Returns
+        ----------------------
+        Dictionary with metadata relative to the download, with the
+        same fields returned by the `_download` method.
+        """
+        import asyncio
+
+        status_code = None
+        file_size = None
+        success = False
+        cached = False
+        exception = ""
+        downloaded_file_size = 0
+        extration_metadata = {}
+        segments = None
+        elapsed_time = None
+        hasher = self._build_checksum(checksum)
+        checksum_digest = None
+        retryable = False
+        timings = {}
+        transfer_time = None
+        lock = None
+        path = None
+        try:
+            response = None
+            try:
+                async with semaphore:
+                    start_time = perf_counter()
+                    if destination is None:
+                        response = await self._get_async(session, url, timings)
+                        destination = self.destination_path(response, url)
+                    lock = DestinationLock(destination)
+                    if not lock.acquire(blocking=False):
+                        if response is not None:
+                            response.release()
+                            response = None
+                        await lock.acquire_async()
+                    if not self.is_cached(destination):
+                        if response is None:
+                            response = await self._get_async(session, url, timings)
+                        headers_time = perf_counter()
+                        status_code = response.status
+                        file_size = int(response.headers.get("content-length", 0))
+                        directory = os.path.dirname(os.path.abspath(destination))
+                        if directory:
+                            os.makedirs(directory, exist_ok=True)
+                        path = temporary_path(destination)
+                        with open(path, "wb") as f:
+                            async for data in response.content.iter_chunked(
+                                self._block_size
+                            ):
+                                downloaded_file_size += len(data)
+                                f.write(data)
+                                if hasher is not None:
+                                    hasher.update(data)
+                        segments = 1
+                        elapsed_time = perf_counter() - start_time
+                        transfer_time = perf_counter() - headers_time
+                        if status_code != 200:
+                            raise ValueError(
+                                f"Request to url {url} finished with status code {status_code}."
+                            )
+                        if hasher is not None:
+                            hasher.verify(url)
+                            checksum_digest = hasher.hexdigest()
+                        commit_path(path, destination, fsync=self._fsync)
+                        success = True
+                    else:
+                        status_code = 200
+                        file_size = self._cached_file_size(destination)
+                        if hasher is not None and file_size is not None:
+                            hasher.update_from_file(destination)
+                            try:
+                                hasher.verify(url)
+                            except ValueError:
+                                # The corrupted cached file is downloaded again.
+                                os.remove(destination)
+                                raise
+                            checksum_digest = hasher.hexdigest()
+                        downloaded_file_size = file_size
+                        cached = True
+                        success = True
+                    if response is not None:
+                        response.release()
+                # The extraction is CPU and disk bound, so it is moved out
+                # of the event loop and does not hold a download slot.
+                try:
+                    extration_metadata = await asyncio.get_running_loop().run_in_executor(
+                        None, self._extract_and_track, destination, cached
+                    )
+                except Exception:
+                    # The downloaded file whose extraction has failed is removed.
+                    success = False
+                    if os.path.exists(destination):
+                        os.remove(destination)
+                    raise
+            except (Exception, asyncio.CancelledError) as process_exception:
+                if response is not None:
+                    response.release()
+                if path is not None and os.path.exists(path):
+                    os.remove(path)
+                raise process_exception
+            finally:
+                if lock is not None:
+                    lock.release()
+        except asyncio.CancelledError as cancelled_exception:
+            raise cancelled_exception
+        except Exception as download_crash_exception:
+            import aiohttp
+
+            retryable = self._retry_policy.is_retryable(
+                status_code,
+                download_crash_exception,
+                (aiohttp.ClientError, asyncio.TimeoutError),
+            )
+            if self._crash_early and not (
+                retryable and attempt < self._retry_policy.attempts
+            ):
+                raise download_crash_exception
+            else:
+                exception = str(download_crash_exception)
+
+        return self._compose_report(
+            url=url,
+            destination=destination,
+            status_code=status_code,
+            file_size=file_size,
+            downloaded_file_size=downloaded_file_size,
+            success=success,
+            cached=cached,
+            exception=exception,
+            extraction_metadata=extration_metadata,
+            segments=segments,
+            elapsed_time=elapsed_time,
+            checksum=checksum_digest,
+            attempts=attempt,
+            retryable=retryable,
+            connect_time=timings.get("connect_time"),
+            ttfb=timings.get("ttfb"),
+            transfer_time=transfer_time,
+        )
+
+    async def download_async(
         self,
         urls: Union[str, List[str]],
         paths: Union[str, List[str]] = None,
-    ) -> pd.DataFrame:
-        """Download file at given url showing a loading bar.
+        checksums: Union[str, List[Optional[str]]] = None,
+        checksum_manifest: Optional[str] = None,
+    ) -> "pd.DataFrame":
+        """Download the files at the given urls concurrently within the event loop.
 
         Parameters
         ----------------------
@@ -278,15 +1380,504 @@ class BaseDownloader:
         paths: Union[str, List[str]] = None,
             The path(s) where to store the data.
             If none, it is attempted to assign a proper one.
+        checksums: Union[str, List[Optional[str]]] = None,
+            The expected digest(s) of the files, see the `download` method.
+        checksum_manifest: Optional[str] = None,
+            The path of a manifest of expected digests, see the `download` method.
 
         Raises
         ----------------------
+        ImportError,
+            If aiohttp is not installed.
         ValueError,
             If the request has not a status code 200 (success).
 
         Returns
         ----------------------
-        Dataframe with report on the operations executed.
+        Dataframe with report on the operations executed, in the same
+        order of the given urls.
+        """
+        import pandas as pd
+        from tqdm.auto import tqdm
+
+        tasks = self._normalize_tasks(urls, paths, checksums, checksum_manifest)
+        reports = [None] * len(tasks)
+        with tqdm(
+            desc="Downloading files",
+            dynamic_ncols=True,
+            disable=not self._verbose > 0 or len(tasks) == 1,
+            total=len(tasks),
+            leave=False,
+        ) as bar:
+            coalescer = TaskCoalescer(remember_completed=True)
+            async for submission, submitted_report in self._iter_tasks_async(
+                coalescer.unique(tasks), len(tasks)
+            ):
+                for index, report in coalescer.resolve(submission, submitted_report):
+                    self._observe(report)
+                    bar.update()
+                    reports[index] = report
+            for index, report in coalescer.ready():
+                self._observe(report)
+                bar.update()
+                reports[index] = report
+        return pd.DataFrame(reports)
+
+    async def _iter_tasks_async(
+        self, tasks: Iterable[Dict], total: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, Dict]]:
+        """Download the given tasks concurrently within the event loop.
+
+        Parameters
+        ----------------------
+        tasks: Iterable[Dict],
+            The keyword arguments of the `_download_async` method of each download.
+        total: Optional[int] = None,
+            The number of tasks, if known. Otherwise, the tasks are consumed
+            as the downloads complete, see the `_max_pending` method.
+
+        Raises
+        ----------------------
+        ImportError,
+            If aiohttp is not installed.
+        ValueError,
+            If the request has not a status code 200 (success).
+
+        Returns
+        ----------------------
+        Asynchronous iterator over the position of each task and its
+        final report, in completion order.
+        """
+        import asyncio
+
+        try:
+            import aiohttp
+        except ImportError as import_exception:
+            raise ImportError(
+                "The asyncio engine requires aiohttp, which can be installed "
+                "by running `pip install downloaders[async]`."
+            ) from import_exception
+        semaphore = asyncio.Semaphore(self._concurrency)
+        connector = aiohttp.TCPConnector(limit=self._concurrency, limit_per_host=0)
+        timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=self._timeout, sock_read=self._timeout
+        )
+
+        async def on_connection_create_start(session, context, params):
+            context.trace_request_ctx["connect_start"] = perf_counter()
+
+        async def on_connection_create_end(session, context, params):
+            timings = context.trace_request_ctx
+            timings["connect_time"] = perf_counter() - timings.pop("connect_start")
+
+        # The connections opened by the requests are timed through tracing.
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout, trace_configs=[trace_config]
+        ) as session:
+
+            async def download_task(index: int, task: Dict) -> Tuple[int, Dict]:
+                attempt = 1
+                report = await self._download_async(session, semaphore, **task)
+                # The backoff is awaited outside of the semaphore,
+                # so the slot is left to the other downloads.
+                while self._retry_policy.should_retry(report):
+                    await asyncio.sleep(self._retry_policy.delay(attempt))
+                    attempt += 1
+                    report = await self._download_async(
+                        session, semaphore, **task, attempt=attempt
+                    )
+                return index, report
+
+            max_pending = self._max_pending(total, self._concurrency)
+            queued = enumerate(tasks)
+            pending = set()
+            try:
+                while True:
+                    for index, task in queued:
+                        pending.add(asyncio.ensure_future(download_task(index, task)))
+                        if max_pending is not None and len(pending) >= max_pending:
+                            break
+                    if not pending:
+                        return
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for completed in done:
+                        yield completed.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def _iter_asyncio(
+        self, tasks: Iterable[Dict], total: Optional[int] = None
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Download the given tasks within a new event loop, yielding them as they complete.
+
+        Parameters
+        ----------------------
+        tasks: Iterable[Dict],
+            The keyword arguments of the `_download_async` method of each download.
+        total: Optional[int] = None,
+            The number of tasks, if known.
+
+        Returns
+        ----------------------
+        Iterator over the position of each task and its final report,
+        in completion order.
+        """
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        reports = self._iter_tasks_async(tasks, total)
+        try:
+            while True:
+                try:
+                    completed = loop.run_until_complete(reports.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield completed
+        finally:
+            loop.run_until_complete(reports.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            # The default executor can be shut down from Python 3.9, while
+            # on the older versions it is shut down by closing the loop.
+            if hasattr(loop, "shutdown_default_executor"):
+                loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+    def _iter_pipelined(
+        self, tasks: Iterable[Dict], total: Optional[int] = None
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Download the given tasks with a thread pool feeding an extraction process pool.
+
+        Parameters
+        ----------------------
+        tasks: Iterable[Dict],
+            The keyword arguments of the `_download` method of each download.
+        total: Optional[int] = None,
+            The number of tasks, if known.
+
+        Raises
+        ----------------------
+        ValueError,
+            If the request has not a status code 200 (success).
+
+        Returns
+        ----------------------
+        Iterator over the position of each task and its final report,
+        in completion order.
+        """
+        # The downloads waiting to be extracted are bounded, so that the
+        # download threads block instead of piling up files on the disk.
+        extraction_slots = threading.BoundedSemaphore(2 * self._extract_workers)
+
+        def download_task(task: Dict):
+            report = self._download(**task, extract=False)
+            if not report["success"]:
+                return report, None, None
+            if not self._auto_extract or not self._extractor.can_extract(
+                report["destination"]
+            ):
+                self._track(report["destination"], {}, report["cached"])
+                return report, None, None
+            # The download is protected from evictions until its extraction,
+            # executed by the process pool, is collected and tracked.
+            protection = ExitStack()
+            if self._cache_manager is not None:
+                protection.enter_context(
+                    self._cache_manager.in_use(report["destination"])
+                )
+            try:
+                extraction_slots.acquire()
+                extraction = extractions.submit(
+                    self._extract_locked, report["destination"]
+                )
+            except BaseException:
+                protection.close()
+                raise
+            extraction.add_done_callback(lambda _: extraction_slots.release())
+            return report, extraction, protection
+
+        def submit(task: Dict) -> Future:
+            # The returned future completes once the file is also extracted,
+            # while the download thread is already free for the next task.
+            completed = Future()
+
+            def settle(report: Optional[Dict], exception: Optional[BaseException]):
+                if completed.done():
+                    return
+                if exception is not None:
+                    completed.set_exception(exception)
+                else:
+                    completed.set_result(report)
+
+            def extracted(report: Dict, extraction: Future, protection: ExitStack):
+                try:
+                    with protection:
+                        report.update(self._collect_extraction(report, extraction))
+                except BaseException as extraction_exception:
+                    settle(None, extraction_exception)
+                else:
+                    settle(report, None)
+
+            def downloaded(download: Future):
+                try:
+                    report, extraction, protection = download.result()
+                except BaseException as download_exception:
+                    settle(None, download_exception)
+                    return
+                if extraction is None:
+                    settle(report, None)
+                else:
+                    extraction.add_done_callback(
+                        lambda _: extracted(report, extraction, protection)
+                    )
+
+            download = downloads.submit(download_task, task)
+            download.add_done_callback(downloaded)
+            completed.add_done_callback(
+                lambda future: download.cancel() if future.cancelled() else None
+            )
+            return completed
+
+        with ProcessPoolExecutor(self._extract_workers) as extractions:
+            # The extraction processes are started before any download thread
+            # exists, so that they are not forked from a multi-threaded process.
+            extractions.submit(os.getpid).result()
+            download_workers = min(total or self._download_workers, self._download_workers)
+            with ThreadPoolExecutor(download_workers) as downloads:
+                yield from iter_with_retries(
+                    tasks,
+                    submit,
+                    self._retry_policy,
+                    max_pending=self._max_pending(total, download_workers),
+                )
+
+    def _iter_processes(
+        self, tasks: Iterable[Dict], total: Optional[int] = None
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Download the given tasks within a pool of processes.
+
+        Parameters
+        ----------------------
+        tasks: Iterable[Dict],
+            The keyword arguments of the `_download` method of each download.
+        total: Optional[int] = None,
+            The number of tasks, if known.
+
+        Raises
+        ----------------------
+        ValueError,
+            If the request has not a status code 200 (success).
+
+        Returns
+        ----------------------
+        Iterator over the position of each task and its final report,
+        in completion order.
+        """
+        # Use the minimum amount of processes.
+        process_number = min(total or self._process_number, self._process_number)
+        # If only one process is required, we don't create a Pool
+        if process_number == 1:
+
+            def submit(task: Dict) -> Future:
+                future = Future()
+                future.set_result(self._download_wrapper(task))
+                return future
+
+            # The tasks are executed one at a time as the reports are consumed.
+            yield from iter_with_retries(tasks, submit, self._retry_policy, max_pending=1)
+            return
+        # Start the process pool
+        with Pool(process_number) as p:
+
+            def submit(task: Dict) -> Future:
+                future = Future()
+                p.apply_async(
+                    self._download_wrapper,
+                    (task,),
+                    callback=future.set_result,
+                    error_callback=future.set_exception,
+                )
+                return future
+
+            try:
+                yield from iter_with_retries(
+                    tasks,
+                    submit,
+                    self._retry_policy,
+                    max_pending=self._max_pending(total, process_number),
+                )
+                # Clean up the pool
+                p.close()
+                p.join()
+            except (Exception, KeyboardInterrupt) as e:
+                p.close()
+                p.join()
+                raise e
+
+    @staticmethod
+    def _max_pending(total: Optional[int], workers: int) -> Optional[int]:
+        """Return the maximum number of tasks submitted at once to the given workers.
+
+        Parameters
+        ----------------------
+        total: Optional[int],
+            The number of tasks, if known. The known tasks are all submitted
+            at once, while a stream of tasks is consumed a few at a time,
+            so that its memory usage is bounded.
+        workers: int,
+            The number of concurrent downloads.
+        """
+        return None if total is not None else 2 * workers
+
+    def _iter_tasks(
+        self,
+        tasks: Iterable[Dict],
+        report_path: Optional[str] = None,
+        total: Optional[int] = None,
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Download the given tasks with the engine of the downloader.
+
+        Parameters
+        ----------------------
+        tasks: Iterable[Dict],
+            The keyword arguments of the `_download` method of each download.
+            When a list is given, its length is used as the number of tasks.
+        report_path: Optional[str] = None,
+            The path of the sink where the reports are written, if any.
+        total: Optional[int] = None,
+            The number of tasks, if known. Otherwise, the tasks are
+            consumed lazily as the downloads complete.
+
+        Raises
+        ----------------------
+        ValueError,
+            If the request has not a status code 200 (success).
+
+        Returns
+        ----------------------
+        Iterator over the position of each task and its final report,
+        in completion order.
+        """
+        from tqdm.auto import tqdm
+
+        if total is None and isinstance(tasks, list):
+            total = len(tasks)
+        # The tasks writing the same file as a previous one are not
+        # submitted, and they receive the report of the previous one.
+        # The reports of a stream of tasks are not kept, as they are unbounded.
+        coalescer = TaskCoalescer(remember_completed=isinstance(tasks, list))
+        if self._engine == "asyncio":
+            completed = self._iter_asyncio(coalescer.unique(tasks), total)
+        elif self._engine == "thread":
+            completed = self._iter_pipelined(coalescer.unique(tasks), total)
+        else:
+            completed = self._iter_processes(coalescer.unique(tasks), total)
+        sink = None if report_path is None else open_report_sink(report_path)
+        verbose_backup = self._verbose
+        # The bars of the single downloads are not shown when they are concurrent.
+        if self._verbose > 1 and (
+            self._engine != "process"
+            or min(total or self._process_number, self._process_number) > 1
+        ):
+            self._verbose = 1
+        try:
+            with tqdm(
+                desc="Downloading files",
+                dynamic_ncols=True,
+                disable=not verbose_backup > 0 or total == 1,
+                total=total,
+                leave=False,
+            ) as bar:
+                for index, report in chain(
+                    (
+                        resolved
+                        for submission, submitted_report in completed
+                        for resolved in coalescer.resolve(submission, submitted_report)
+                    ),
+                    # The last tasks may be duplicates of the completed ones.
+                    coalescer.ready(),
+                ):
+                    self._observe(report)
+                    if sink is not None:
+                        sink.write(report)
+                    bar.update()
+                    yield index, report
+        finally:
+            completed.close()
+            self._verbose = verbose_backup
+            if sink is not None:
+                sink.close()
+
+    def _collect_extraction(self, report: Dict, extraction: Future) -> Dict:
+        """Return the report fields resulting from the given extraction.
+
+        Parameters
+        ----------------------
+        report: Dict,
+            The report of the download of the extracted file.
+        extraction: Future,
+            The future of the extraction executed in the process pool.
+
+        Raises
+        ----------------------
+        Exception,
+            The exception raised by the extraction, if it is required to crash early.
+
+        Returns
+        ----------------------
+        Dictionary with the report fields to update.
+        """
+        try:
+            extraction_metadata = extraction.result()
+            self._track(report["destination"], extraction_metadata, report["cached"])
+            return {
+                f"extraction_{key}": value
+                for key, value in extraction_metadata.items()
+            }
+        except Exception as extraction_exception:
+            # As within the _download method, the downloaded file whose
+            # extraction has failed is removed.
+            if os.path.exists(report["destination"]):
+                os.remove(report["destination"])
+            if self._crash_early:
+                raise extraction_exception
+            return {"success": False, "exception": str(extraction_exception)}
+
+    def _normalize_tasks(
+        self,
+        urls: Union[str, List[str]],
+        paths: Union[str, List[str]] = None,
+        checksums: Union[str, List[Optional[str]]] = None,
+        checksum_manifest: Optional[str] = None,
+    ) -> List[Dict]:
+        """Return the keyword arguments of the `_download` method of each download.
+
+        Parameters
+        ----------------------
+        urls: Union[str, List[str]],
+            The url(s) from where to download the data.
+        paths: Union[str, List[str]] = None,
+            The path(s) where to store the data.
+        checksums: Union[str, List[Optional[str]]] = None,
+            The expected digest(s) of the files.
+        checksum_manifest: Optional[str] = None,
+            The path of a manifest of expected digests by file name.
+
+        Raises
+        ----------------------
+        ValueError,
+            If no urls are given or the urls, paths and checksums have different lengths.
+
+        Returns
+        ----------------------
+        List of dictionaries with the url, the destination, which is None
+        when it is to be inferred, and the expected checksum of each download.
         """
         if isinstance(urls, str):
             urls = [urls]
@@ -304,55 +1895,235 @@ class BaseDownloader:
             and len(urls) != len(paths)
         ):
             raise ValueError("The urls and paths lists must have the same length.")
-        # Use the minimum amount of processes.
-        process_number = min(len(urls), self._process_number)
-        # Create the tasks generator
-        tasks = (
-            dict(url=urls[i], destination=None if paths is None else paths[i])
-            for i in range(len(urls))
+        if paths is None:
+            paths = [None] * len(urls)
+        if isinstance(checksums, str):
+            checksums = [checksums]
+        if checksums is None:
+            checksums = [None] * len(urls)
+        checksums = list(checksums)
+        if len(checksums) != len(urls):
+            raise ValueError("The urls and checksums lists must have the same length.")
+        if checksum_manifest is not None:
+            manifest = load_manifest(checksum_manifest)
+            # The files are looked up in the manifest by the name of the
+            # destination if given, and by the one of the url otherwise.
+            checksums = [
+                manifest.get(
+                    os.path.basename(
+                        path if path is not None else url.split("?")[0]
+                    ),
+                    checksum,
+                )
+                if checksum is None
+                else checksum
+                for url, path, checksum in zip(urls, paths, checksums)
+            ]
+        return [
+            dict(url=url, destination=path, checksum=checksum)
+            for url, path, checksum in zip(urls, paths, checksums)
+        ]
+
+    def download(
+        self,
+        urls: Union[str, List[str]],
+        paths: Union[str, List[str]] = None,
+        checksums: Union[str, List[Optional[str]]] = None,
+        checksum_manifest: Optional[str] = None,
+        report_path: Optional[str] = None,
+    ) -> "pd.DataFrame":
+        """Download file at given url showing a loading bar.
+
+        Parameters
+        ----------------------
+        urls: Union[str, List[str]],
+            The url(s) from where to download the data.
+        paths: Union[str, List[str]] = None,
+            The path(s) where to store the data.
+            If none, it is attempted to assign a proper one.
+        checksums: Union[str, List[Optional[str]]] = None,
+            The expected digest(s) of the files, such as "sha256:<hexdigest>",
+            "md5:<hexdigest>" or "blake2b:<hexdigest>", or bare hex digests
+            of the checksum algorithm of the downloader. The digests are
+            computed while the files are downloaded, and the files that
+            do not match are removed and reported as failed.
+        checksum_manifest: Optional[str] = None,
+            The path of a manifest of expected digests, in the format of
+            tools such as sha256sum, whose file names are matched against
+            the names of the destinations or of the urls.
+        report_path: Optional[str] = None,
+            The path of a JSON Lines file, with extension ".jsonl", to which
+            each report is appended as soon as its download completes, or
+            of a Parquet file, with extension ".parquet", which requires
+            the optional pyarrow dependency.
+
+        Raises
+        ----------------------
+        ValueError,
+            If the request has not a status code 200 (success).
+
+        Returns
+        ----------------------
+        Dataframe with report on the operations executed.
+        """
+        import pandas as pd
+
+        tasks = self._normalize_tasks(urls, paths, checksums, checksum_manifest)
+        reports = [None] * len(tasks)
+        for index, report in self._iter_tasks(tasks, report_path):
+            reports[index] = report
+        return pd.DataFrame(reports)
+
+    def iter_download(
+        self,
+        urls: Union[str, List[str]],
+        paths: Union[str, List[str]] = None,
+        checksums: Union[str, List[Optional[str]]] = None,
+        checksum_manifest: Optional[str] = None,
+        report_path: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """Download the files at the given urls, yielding the reports as they complete.
+
+        Parameters
+        ----------------------
+        urls: Union[str, List[str]],
+            The url(s) from where to download the data.
+        paths: Union[str, List[str]] = None,
+            The path(s) where to store the data.
+            If none, it is attempted to assign a proper one.
+        checksums: Union[str, List[Optional[str]]] = None,
+            The expected digest(s) of the files, see the `download` method.
+        checksum_manifest: Optional[str] = None,
+            The path of a manifest of expected digests, see the `download` method.
+        report_path: Optional[str] = None,
+            The path of the sink of the reports, see the `download` method.
+
+        Raises
+        ----------------------
+        ValueError,
+            If the request has not a status code 200 (success).
+
+        Returns
+        ----------------------
+        Iterator over the reports of the downloads, with the same fields
+        as the rows returned by the `download` method, in completion order.
+        """
+        tasks = self._normalize_tasks(urls, paths, checksums, checksum_manifest)
+        for _, report in self._iter_tasks(tasks, report_path):
+            yield report
+
+    def download_manifest(
+        self,
+        manifest_path: str,
+        journal_path: Optional[str] = None,
+        report_path: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """Download the files listed in the given manifest, skipping the ones already completed.
+
+        The manifest is read one line at a time and only a few downloads
+        per worker are pending at once, so that the memory usage does not
+        grow with the number of files. The state of each task is stored
+        in a SQLite journal as soon as it completes, so that when the
+        download is restarted the tasks completed by the previous runs are
+        skipped without accessing their destinations, while the failed
+        ones are attempted again.
+
+        Parameters
+        ----------------------
+        manifest_path: str,
+            The path of the manifest, either a CSV file, with extension
+            ".csv", or a JSON Lines file, with extension ".jsonl", listing
+            the url and optionally the path, the expected checksum and the
+            expected size in bytes of each file.
+        journal_path: Optional[str] = None,
+            The path of the SQLite journal. By default, it is the path
+            of the manifest followed by ".journal.sqlite".
+        report_path: Optional[str] = None,
+            The path of the sink of the reports, see the `download` method.
+
+        Raises
+        ----------------------
+        ValueError,
+            If the manifest is not valid.
+
+        Returns
+        ----------------------
+        Dictionary with the number of files downloaded successfully, failed
+        and skipped as completed by the previous runs.
+        """
+        from .manifest import DownloadJournal, iter_manifest
+
+        journal = DownloadJournal(
+            f"{manifest_path}.journal.sqlite" if journal_path is None else journal_path
         )
-        desc = "Downloading files"
-        # If only one process is required, we don't create a Pool
-        if process_number == 1:
-            report = pd.DataFrame(
-                [
-                    self._download_wrapper(task)
-                    for task in tqdm(
-                        tasks,
-                        desc=desc,
-                        dynamic_ncols=True,
-                        disable=not self._verbose > 0 or len(urls) == 1,
-                        total=len(urls),
-                        leave=False,
-                    )
-                ]
-            )
-        else:
-            verbose_backup = self._verbose
-            if self._verbose > 1:
-                self._verbose = 1
-            # Start the process pool
-            with Pool(process_number) as p:
-                try:
-                    # Execute the downloads and compose the report document.
-                    report = pd.DataFrame(
-                        tqdm(
-                            p.imap(self._download_wrapper, tasks),
-                            desc=desc,
-                            dynamic_ncols=True,
-                            disable=not self._verbose > 0,
-                            total=len(urls),
-                            leave=False,
-                        )
+        # The manifest entries of the tasks not completed yet, by their position.
+        entries = {}
+        summary = {"downloaded": 0, "failed": 0, "skipped": 0}
+
+        def pending_tasks() -> Iterator[Dict]:
+            position = 0
+            for task in iter_manifest(manifest_path):
+                if journal.is_completed(task["url"], task["destination"]):
+                    summary["skipped"] += 1
+                    continue
+                entries[position] = task
+                position += 1
+                yield {key: value for key, value in task.items() if key != "size"}
+
+        try:
+            for index, report in self._iter_tasks(pending_tasks(), report_path):
+                task = entries.pop(index)
+                if (
+                    report["success"]
+                    and task["size"] is not None
+                    and report["file_size"] is not None
+                    and report["file_size"] != task["size"]
+                ):
+                    # A file with an unexpected size is not considered completed.
+                    if os.path.exists(report["destination"]):
+                        os.remove(report["destination"])
+                    report["success"] = False
+                    report["exception"] = (
+                        f"The size of the file downloaded from {task['url']} is "
+                        f"{report['file_size']} bytes instead of {task['size']}."
                     )
-                    # Clean up the pool
-                    p.close()
-                    p.join()
-                except (Exception, KeyboardInterrupt) as e:
-                    p.close()
-                    p.join()
-                    self._verbose = verbose_backup
-                    raise e
-            self._verbose = verbose_backup
-        # Return report
-        return report
+                journal.record(task["url"], task["destination"], report)
+                summary["downloaded" if report["success"] else "failed"] += 1
+        finally:
+            journal.close()
+        return summary
+
+    def retry_failed(
+        self, report: "pd.DataFrame", checksum_manifest: Optional[str] = None
+    ) -> "pd.DataFrame":
+        """Return the given report with its failed downloads executed again.
+
+        Parameters
+        ----------------------
+        report: pd.DataFrame,
+            The report returned by a previous call to `download`.
+        checksum_manifest: Optional[str] = None,
+            The path of a manifest of expected digests, see the `download` method.
+
+        Returns
+        ----------------------
+        Dataframe with the rows of the failed downloads replaced by the ones
+        of their new execution, whose attempts include the previous ones.
+        """
+        import pandas as pd
+
+        failed = report.index[~report.success.astype(bool)]
+        if len(failed) == 0:
+            return report
+        retried = self.download(
+            report.url[failed].tolist(),
+            [
+                None if pd.isna(destination) else destination
+                for destination in report.destination[failed]
+            ],
+            checksum_manifest=checksum_manifest,
+        )
+        retried.index = failed
+        if "attempts" in report.columns:
+            retried["attempts"] += report.attempts[failed].fillna(1).astype(int)
+        return pd.concat([report.drop(index=failed), retried]).sort_index()
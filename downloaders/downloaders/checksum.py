@@ -0,0 +1,127 @@
+"""Submodule providing the verification of the downloads against expected digests."""
+import hashlib
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+from ..utils import file_digest
+
+# Algorithms guessed from the length of the hex digests without prefix.
+ALGORITHMS_BY_LENGTH = {32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+
+
+def parse_checksum(checksum: str, algorithm: Optional[str] = None) -> Tuple[str, str]:
+    """Return the algorithm and the hex digest of the given checksum.
+
+    Parameters
+    -------------------
+    checksum: str,
+        The expected digest, either as "algorithm:hexdigest" or as a bare
+        hex digest, such as "sha256:9f86d0..." or "9f86d0...".
+    algorithm: Optional[str] = None,
+        The algorithm of the bare hex digests. If not provided, it is
+        guessed from the length of the digest.
+
+    Raises
+    -------------------
+    ValueError,
+        If the algorithm is not supported by hashlib or cannot be guessed.
+
+    Returns
+    -------------------
+    Tuple with the name of the algorithm and the lowercase hex digest.
+    """
+    if ":" in checksum:
+        algorithm, checksum = checksum.split(":", 1)
+    elif algorithm is None:
+        algorithm = ALGORITHMS_BY_LENGTH.get(len(checksum))
+    if algorithm is None or algorithm.lower() not in hashlib.algorithms_available:
+        raise ValueError(
+            f"The algorithm of the checksum {checksum} is not supported. "
+            "Provide it as a prefix, such as sha256:<digest>."
+        )
+    return algorithm.lower(), checksum.strip().lower()
+
+
+def load_manifest(path: str) -> Dict[str, str]:
+    """Return the checksums listed in the given manifest file by file name.
+
+    Parameters
+    -------------------
+    path: str,
+        The path of a manifest in the format of sha256sum, md5sum and
+        similar tools, that is lines such as "<hexdigest>  <file name>",
+        or in the BSD format, that is "SHA256 (<file name>) = <hexdigest>".
+
+    Returns
+    -------------------
+    Dictionary from the base name of each file to its checksum, prefixed
+    with the algorithm when the manifest states it.
+    """
+    manifest = {}
+    with open(path, "r", encoding="utf8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            bsd = re.fullmatch(r"(\w+) \((.+)\) = ([0-9a-fA-F]+)", line)
+            if bsd is not None:
+                algorithm, name, digest = bsd.groups()
+                manifest[os.path.basename(name)] = f"{algorithm.lower()}:{digest}"
+                continue
+            digest, name = line.split(maxsplit=1)
+            manifest[os.path.basename(name.lstrip("*"))] = digest
+    return manifest
+
+
+class Checksum:
+    """Digest computed incrementally and compared against an expected one."""
+
+    def __init__(self, algorithm: str, expected: Optional[str] = None):
+        """Create new Checksum object.
+
+        Parameters
+        -------------------
+        algorithm: str,
+            The name of the hashlib algorithm, such as "sha256", "md5" or "blake2b".
+        expected: Optional[str] = None,
+            The expected hex digest, if the download is to be verified.
+        """
+        self._algorithm = algorithm
+        self._expected = expected
+        self._digest = hashlib.new(algorithm)
+        self._file_hexdigest = None
+
+    def update(self, data: bytes):
+        """Update the digest with the given block."""
+        self._digest.update(data)
+
+    def update_from_file(self, path: str):
+        """Replace the digest with the one of the given file, when it was not streamed."""
+        self._file_hexdigest = file_digest(path, self._algorithm)
+
+    def hexdigest(self) -> str:
+        """Return the hex digest prefixed by the algorithm."""
+        if self._file_hexdigest is not None:
+            return f"{self._algorithm}:{self._file_hexdigest}"
+        return f"{self._algorithm}:{self._digest.hexdigest()}"
+
+    def verify(self, url: str):
+        """Raise an error if the computed digest does not match the expected one.
+
+        Parameters
+        -------------------
+        url: str,
+            The url of the download, used in the error message.
+
+        Raises
+        -------------------
+        ValueError,
+            If the digests do not match.
+        """
+        digest = self.hexdigest().split(":", 1)[1]
+        if self._expected is not None and digest != self._expected:
+            raise ValueError(
+                f"The {self._algorithm} checksum {digest} of the file downloaded "
+                f"from url {url} does not match the expected {self._expected}."
+            )
@@ -0,0 +1,236 @@
+"""Submodule providing the deduplication of the downloads of the same files."""
+import hashlib
+import os
+import tempfile
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # On platforms without fcntl the destinations are not locked.
+    fcntl = None
+
+# Key of the tasks writing the same file with the same expected checksum.
+TaskKey = Tuple[str, str, Optional[str]]
+# Interval in seconds between the attempts to acquire a busy lock within the event loop.
+POLLING_INTERVAL = 0.01
+
+
+class DestinationLock:
+    """Exclusive lock of a destination, shared by all the processes through a lock file."""
+
+    def __init__(self, destination: str, directory: Optional[str] = None):
+        """Create new DestinationLock object.
+
+        Parameters
+        -------------------
+        destination: str,
+            The path of the file to lock. The lock file is named after
+            its absolute path, so that the directory of the destination
+            is left untouched.
+        directory: Optional[str] = None,
+            The directory of the lock files. By default, it is a directory
+            of the current user within the temporary directory, so that it
+            is shared by all the processes of the user on the machine.
+        """
+        if directory is None and fcntl is not None:
+            directory = os.path.join(
+                tempfile.gettempdir(), f"downloaders_locks_{os.getuid()}"
+            )
+        digest = hashlib.sha1(os.path.abspath(destination).encode("utf8")).hexdigest()
+        self._directory = directory
+        self._path = (
+            None if directory is None else os.path.join(directory, f"{digest}.lock")
+        )
+        self._lock = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Acquire the lock, waiting for it to be released if blocking.
+
+        Parameters
+        -------------------
+        blocking: bool = True,
+            Whether to wait for the lock when it is held by another download.
+
+        Returns
+        -------------------
+        Boolean value representing if the lock was acquired, which is
+        always the case when the lock file cannot be written, as the
+        download then proceeds without the lock.
+        """
+        if fcntl is None:
+            return True
+        while True:
+            try:
+                os.makedirs(self._directory, mode=0o700, exist_ok=True)
+                lock = open(self._path, "a")
+            except PermissionError:
+                return True
+            try:
+                fcntl.flock(
+                    lock.fileno(),
+                    fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB,
+                )
+            except OSError:
+                lock.close()
+                return False
+            except BaseException:
+                lock.close()
+                raise
+            # The lock file is removed by the holder releasing it, so the
+            # lock acquired on a removed file is retried on the current one.
+            try:
+                current = os.path.samestat(os.fstat(lock.fileno()), os.stat(self._path))
+            except FileNotFoundError:
+                current = False
+            if current:
+                self._lock = lock
+                return True
+            lock.close()
+
+    async def acquire_async(self):
+        """Acquire the lock within the event loop, without blocking it."""
+        import asyncio
+
+        while not self.acquire(blocking=False):
+            await asyncio.sleep(POLLING_INTERVAL)
+
+    def release(self):
+        """Release the lock, which can be called multiple times."""
+        if self._lock is not None:
+            # The lock file is removed while still locked, so that the lock
+            # files do not pile up, and closing the file releases its lock.
+            try:
+                os.remove(self._path)
+            except FileNotFoundError:
+                pass
+            self._lock.close()
+            self._lock = None
+
+    def __enter__(self) -> "DestinationLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+def task_key(task: Dict) -> TaskKey:
+    """Return the key identifying the file written by the given task.
+
+    Parameters
+    -------------------
+    task: Dict,
+        The keyword arguments of the download, with the url, the
+        destination, which is None when it is to be inferred, and the
+        expected checksum, if any.
+
+    Returns
+    -------------------
+    Tuple with the absolute destination, when given, or the url otherwise,
+    and the expected checksum, so that the tasks expecting different
+    checksums are each verified.
+    """
+    if task.get("destination") is not None:
+        return (
+            "destination",
+            os.path.abspath(task["destination"]),
+            task.get("checksum"),
+        )
+    return ("url", task["url"], task.get("checksum"))
+
+
+class TaskCoalescer:
+    """Coalescer running once the tasks writing the same file."""
+
+    def __init__(self, remember_completed: bool = False):
+        """Create new TaskCoalescer object.
+
+        Parameters
+        -------------------
+        remember_completed: bool = False,
+            Whether to keep the reports of the completed tasks, so that their
+            later duplicates are not submitted either. Otherwise, only the
+            pending tasks are kept, so that the memory usage is bounded,
+            and a duplicate of a completed task is served from the cache.
+        """
+        # The position and the key of each submitted task, by its submission order.
+        self._submitted: Dict[int, Tuple[int, TaskKey]] = {}
+        self._submissions = 0
+        # The positions and the urls of the duplicates waiting for each pending task.
+        self._duplicates: Dict[TaskKey, List[Tuple[int, str]]] = {}
+        self._completed: Optional[Dict[TaskKey, Dict]] = (
+            {} if remember_completed else None
+        )
+        # The duplicates of the completed tasks, whose reports are ready.
+        self._ready: Deque[Tuple[int, Dict]] = deque()
+
+    @staticmethod
+    def _duplicate(report: Dict, url: str) -> Dict:
+        """Return the report of a duplicate of the task with the given report.
+
+        The duplicates keep their own url, which may differ from the one of
+        the task when they share its destination, and the duplicates of a
+        successful download are reported as cached, as they were not
+        downloaded again.
+        """
+        if report["success"]:
+            return {**report, "url": url, "cached": True, "throughput": None}
+        return {**report, "url": url}
+
+    def unique(self, tasks: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield the given tasks, except the duplicates of the ones already submitted.
+
+        Parameters
+        -------------------
+        tasks: Iterable[Dict],
+            The keyword arguments of the downloads.
+
+        Returns
+        -------------------
+        Iterator over the tasks to submit.
+        """
+        for position, task in enumerate(tasks):
+            key = task_key(task)
+            if key in self._duplicates:
+                self._duplicates[key].append((position, task["url"]))
+                continue
+            if self._completed is not None and key in self._completed:
+                self._ready.append(
+                    (position, self._duplicate(self._completed[key], task["url"]))
+                )
+                continue
+            self._duplicates[key] = []
+            self._submitted[self._submissions] = (position, key)
+            self._submissions += 1
+            yield task
+
+    def resolve(self, index: int, report: Dict) -> Iterator[Tuple[int, Dict]]:
+        """Yield the report of the given submitted task and of its duplicates.
+
+        Parameters
+        -------------------
+        index: int,
+            The submission order of the completed task.
+        report: Dict,
+            The final report of the completed task.
+
+        Returns
+        -------------------
+        Iterator over the position of the task and of each of its duplicates
+        with their reports, followed by the ones of the other duplicates
+        whose reports are ready.
+        """
+        position, key = self._submitted.pop(index)
+        yield position, report
+        for duplicate, url in self._duplicates.pop(key):
+            yield duplicate, self._duplicate(report, url)
+        if self._completed is not None:
+            self._completed[key] = report
+        yield from self.ready()
+
+    def ready(self) -> Iterator[Tuple[int, Dict]]:
+        """Yield the position and the report of the duplicates of the completed tasks."""
+        while self._ready:
+            yield self._ready.popleft()
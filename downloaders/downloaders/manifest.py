@@ -0,0 +1,163 @@
+"""Submodule providing the manifests of bulk downloads and the journal of their state."""
+import csv
+import json
+import os
+import sqlite3
+from time import time
+from typing import Dict, Iterator, Optional
+
+# Columns of the manifests, of which only the url is required.
+MANIFEST_COLUMNS = ("url", "path", "checksum", "size")
+
+
+def _manifest_task(row: Dict, line: int, path: str) -> Dict:
+    """Return the task described by the given row of a manifest."""
+    unknown = set(row) - set(MANIFEST_COLUMNS)
+    if unknown:
+        raise ValueError(
+            f"The columns {', '.join(sorted(map(str, unknown)))} of the manifest {path} "
+            f"are not supported. The supported columns are {', '.join(MANIFEST_COLUMNS)}."
+        )
+    if not row.get("url"):
+        raise ValueError(f"The line {line} of the manifest {path} has no url.")
+    size = row.get("size")
+    return dict(
+        url=row["url"],
+        destination=row.get("path") or None,
+        checksum=row.get("checksum") or None,
+        size=None if size in (None, "") else int(size),
+    )
+
+
+def iter_manifest(path: str) -> Iterator[Dict]:
+    """Yield the tasks listed in the given manifest, reading it one line at a time.
+
+    Parameters
+    -------------------
+    path: str,
+        The path of the manifest, either a CSV file, with extension ".csv"
+        and a header with the columns "url", "path", "checksum" and "size",
+        or a JSON Lines file, with extension ".jsonl", whose objects have
+        the same keys. Only the url is required.
+
+    Raises
+    -------------------
+    ValueError,
+        If the extension of the path is not supported or a line is not valid.
+
+    Returns
+    -------------------
+    Iterator over dictionaries with the url, the destination, the expected
+    checksum and the expected size of each download.
+    """
+    if path.endswith(".csv"):
+        with open(path, "r", encoding="utf8", newline="") as f:
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                yield _manifest_task(row, line, path)
+    elif path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf8") as f:
+            for line, content in enumerate(f, start=1):
+                if content.strip():
+                    yield _manifest_task(json.loads(content), line, path)
+    else:
+        raise ValueError(
+            f"The extension of the manifest {path} is not supported. "
+            "The supported extensions are .csv and .jsonl."
+        )
+
+
+class DownloadJournal:
+    """Journal storing the state of the tasks of a manifest in a SQLite database."""
+
+    def __init__(self, path: str):
+        """Create new DownloadJournal object.
+
+        Parameters
+        -------------------
+        path: str,
+            The path of the SQLite database, which is created if missing.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=60)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # Within WAL mode, the committed tasks survive a crash of the process.
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    url TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    success INTEGER NOT NULL,
+                    destination TEXT,
+                    attempts INTEGER NOT NULL,
+                    exception TEXT,
+                    updated REAL NOT NULL,
+                    PRIMARY KEY (url, path)
+                )
+                """
+            )
+
+    def is_completed(self, url: str, path: Optional[str]) -> bool:
+        """Return whether the task with the given url and path was completed successfully.
+
+        Parameters
+        -------------------
+        url: str,
+            The url of the task.
+        path: Optional[str],
+            The path of the task, as given in the manifest.
+        """
+        return (
+            self._connection.execute(
+                "SELECT success FROM tasks WHERE url = ? AND path = ?",
+                (url, path or ""),
+            ).fetchone()
+            or (0,)
+        )[0] == 1
+
+    def record(self, url: str, path: Optional[str], report: Dict):
+        """Store the state of the task with the given url and path.
+
+        Parameters
+        -------------------
+        url: str,
+            The url of the task.
+        path: Optional[str],
+            The path of the task, as given in the manifest.
+        report: Dict,
+            The final report of the download of the task.
+        """
+        with self._connection:
+            self._connection.execute(
+                """
+                INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url, path) DO UPDATE SET
+                    success = excluded.success,
+                    destination = excluded.destination,
+                    attempts = tasks.attempts + excluded.attempts,
+                    exception = excluded.exception,
+                    updated = excluded.updated
+                """,
+                (
+                    url,
+                    path or "",
+                    int(bool(report["success"])),
+                    report["destination"],
+                    report.get("attempts", 1),
+                    report["exception"] or None,
+                    time(),
+                ),
+            )
+
+    def statistics(self) -> Dict[str, int]:
+        """Return the number of completed and failed tasks."""
+        completed, failed = self._connection.execute(
+            "SELECT COALESCE(SUM(success), 0), COUNT(*) - COALESCE(SUM(success), 0) FROM tasks"
+        ).fetchone()
+        return {"completed": completed, "failed": failed}
+
+    def close(self):
+        """Close the connection to the database."""
+        self._connection.close()
@@ -0,0 +1,123 @@
+"""Submodule providing the in-process metrics aggregated over the download reports."""
+import math
+import threading
+from typing import Dict, Optional, Tuple
+
+# Upper bounds in seconds of the buckets of the duration histograms.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+
+class Histogram:
+    """Cumulative histogram of observed values, in the style of Prometheus."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        """Create new Histogram object.
+
+        Parameters
+        -------------------
+        buckets: Tuple[float, ...] = DURATION_BUCKETS,
+            The sorted upper bounds of the buckets.
+        """
+        self._buckets = tuple(buckets)
+        self._counts = [0] * len(self._buckets)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, value: float):
+        """Add the given value to the histogram."""
+        for index, bound in enumerate(self._buckets):
+            if value <= bound:
+                self._counts[index] += 1
+        self._count += 1
+        self._sum += value
+
+    def snapshot(self) -> Dict:
+        """Return the cumulative bucket counts, the count and the sum of the values."""
+        return {
+            "buckets": dict(zip(self._buckets, self._counts)),
+            "count": self._count,
+            "sum": self._sum,
+        }
+
+
+class DownloadMetrics:
+    """Counters and histograms of the downloads, aggregated over all the workers."""
+
+    COUNTERS = (
+        "downloads",
+        "failures",
+        "cached",
+        "retries",
+        "downloaded_bytes",
+    )
+    HISTOGRAMS = (
+        "connect_time",
+        "ttfb",
+        "transfer_time",
+        "extraction_time",
+    )
+
+    def __init__(self):
+        """Create new DownloadMetrics object."""
+        self._lock = threading.Lock()
+        self._counters = {name: 0 for name in self.COUNTERS}
+        self._histograms = {name: Histogram() for name in self.HISTOGRAMS}
+
+    def observe(self, report: Dict):
+        """Add the given download report to the metrics.
+
+        Parameters
+        -------------------
+        report: Dict,
+            The final report of a download, as returned by the downloaders.
+        """
+        with self._lock:
+            self._counters["downloads"] += 1
+            self._counters["failures"] += not report["success"]
+            self._counters["cached"] += bool(report["cached"])
+            self._counters["retries"] += report.get("attempts", 1) - 1
+            if not report["cached"]:
+                self._counters["downloaded_bytes"] += report["downloaded_file_size"] or 0
+            for name, histogram in self._histograms.items():
+                value = report.get(name)
+                if value is not None and not math.isnan(value):
+                    histogram.observe(value)
+
+    def snapshot(self) -> Dict:
+        """Return the current values of the counters and of the histograms."""
+        with self._lock:
+            return {
+                **self._counters,
+                **{
+                    name: histogram.snapshot()
+                    for name, histogram in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self, prefix: Optional[str] = "downloaders") -> str:
+        """Return the metrics in the Prometheus text exposition format.
+
+        Parameters
+        -------------------
+        prefix: Optional[str] = "downloaders",
+            The prefix of the names of the metrics.
+
+        Returns
+        -------------------
+        The text to be served to a Prometheus scraper.
+        """
+        snapshot = self.snapshot()
+        prefix = f"{prefix}_" if prefix else ""
+        lines = []
+        for name in self.COUNTERS:
+            lines.append(f"# TYPE {prefix}{name}_total counter")
+            lines.append(f"{prefix}{name}_total {snapshot[name]}")
+        for name in self.HISTOGRAMS:
+            histogram = snapshot[name]
+            lines.append(f"# TYPE {prefix}{name}_seconds histogram")
+            for bound, count in histogram["buckets"].items():
+                lines.append(f'{prefix}{name}_seconds_bucket{{le="{bound}"}} {count}')
+            lines.append(f'{prefix}{name}_seconds_bucket{{le="+Inf"}} {histogram["count"]}')
+            lines.append(f"{prefix}{name}_seconds_sum {histogram['sum']}")
+            lines.append(f"{prefix}{name}_seconds_count {histogram['count']}")
+        return "\n".join(lines) + "\n"
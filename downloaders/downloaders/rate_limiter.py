@@ -0,0 +1,283 @@
+"""Submodule providing the per-host rate and connection limits shared by all workers."""
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from time import sleep, time
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:
+    # On platforms without fcntl the limits are not shared across processes.
+    fcntl = None
+
+# Interval in seconds between the attempts to acquire a busy connection slot.
+POLLING_INTERVAL = 0.01
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the seconds to wait according to the given Retry-After header.
+
+    Parameters
+    -------------------
+    value: Optional[str],
+        The value of the header, either a number of seconds or an HTTP date.
+
+    Returns
+    -------------------
+    The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class HostSlot:
+    """Connection slot of a host, held until it is released."""
+
+    def __init__(self, lock=None):
+        """Create new HostSlot object.
+
+        Parameters
+        -------------------
+        lock = None,
+            The open lock file of the slot, if any.
+        """
+        self._lock = lock
+
+    def release(self):
+        """Release the slot, which can be called multiple times."""
+        if self._lock is not None:
+            # Closing the file releases its lock.
+            self._lock.close()
+            self._lock = None
+
+
+def release_on(response, method: str, slot: HostSlot):
+    """Release the given slot when the given method of the response is called.
+
+    Parameters
+    -------------------
+    response,
+        The response holding the connection, such as a requests.Response.
+    method: str,
+        The method releasing the connection, such as "close".
+    slot: HostSlot,
+        The slot to release together with the connection.
+    """
+    release_connection = getattr(response, method)
+
+    def release():
+        try:
+            return release_connection()
+        finally:
+            slot.release()
+
+    setattr(response, method, release)
+
+
+class HostLimiter:
+    """Token bucket and connection limits of each host, shared through lock files."""
+
+    def __init__(
+        self,
+        directory: str,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        connections: Optional[int] = None,
+        hosts: Optional[Dict[str, Dict]] = None,
+    ):
+        """Create new HostLimiter object.
+
+        Parameters
+        -------------------
+        directory: str,
+            The directory where the state of the hosts is stored.
+            It can be shared by multiple processes.
+        rate: Optional[float] = None,
+            Maximum number of requests per second towards each host.
+            By default, the requests are not rate limited.
+        burst: int = 1,
+            Maximum number of requests which can be sent at once towards
+            a host which has not been requested for a while.
+        connections: Optional[int] = None,
+            Maximum number of concurrent connections towards each host.
+            By default, the connections are not limited.
+        hosts: Optional[Dict[str, Dict]] = None,
+            The limits of specific hosts, as dictionaries with the keys
+            "rate", "burst" and "connections", overriding the default ones.
+
+        Raises
+        -------------------
+        ValueError,
+            If the given limits are not valid.
+        """
+        self._directory = directory
+        self._default = dict(rate=rate, burst=burst, connections=connections)
+        self._hosts = {}
+        for host, limits in (hosts or {}).items():
+            unknown = set(limits) - set(self._default)
+            if unknown:
+                raise ValueError(
+                    f"The limits {', '.join(sorted(unknown))} of host {host} are not supported. "
+                    f"The supported limits are {', '.join(self._default)}."
+                )
+            self._hosts[host.lower()] = {**self._default, **limits}
+        for limits in (self._default, *self._hosts.values()):
+            if limits["rate"] is not None and limits["rate"] <= 0:
+                raise ValueError("The given rate limit is not a strictly positive number.")
+            if not isinstance(limits["burst"], int) or limits["burst"] <= 0:
+                raise ValueError("The given burst is not a strictly positive integer.")
+            if limits["connections"] is not None and (
+                not isinstance(limits["connections"], int) or limits["connections"] <= 0
+            ):
+                raise ValueError(
+                    "The given number of connections per host is not a strictly positive integer."
+                )
+        os.makedirs(directory, exist_ok=True)
+
+    def _limits(self, host: str) -> Dict:
+        """Return the limits of the given host, with or without its port."""
+        return self._hosts.get(host) or self._hosts.get(host.split(":")[0], self._default)
+
+    def _path(self, host: str, suffix: str) -> str:
+        """Return the path of the given file of the given host."""
+        digest = hashlib.sha1(host.encode("utf8")).hexdigest()
+        return os.path.join(self._directory, f"{digest}.{suffix}")
+
+    @contextmanager
+    def _state(self, host: str) -> Iterator[Dict]:
+        """Context manager returning the state of the host, stored on exit."""
+        with open(self._path(host, "state"), "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            f.seek(0)
+            content = f.read()
+            state = json.loads(content) if content else {}
+            yield state
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(state))
+
+    def _take_token(self, host: str) -> float:
+        """Return the seconds to wait before retrying, or zero if a token was taken."""
+        limits = self._limits(host)
+        with self._state(host) as state:
+            now = time()
+            blocked_until = state.get("blocked_until", 0.0)
+            if blocked_until > now:
+                return blocked_until - now
+            if limits["rate"] is None:
+                return 0.0
+            tokens = min(
+                limits["burst"],
+                state.get("tokens", limits["burst"])
+                + (now - state.get("updated", now)) * limits["rate"],
+            )
+            state["updated"] = now
+            if tokens >= 1:
+                state["tokens"] = tokens - 1
+                return 0.0
+            state["tokens"] = tokens
+            return (1 - tokens) / limits["rate"]
+
+    def _take_slot(self, host: str) -> Optional[HostSlot]:
+        """Return a free connection slot of the host, or None if all are busy."""
+        connections = self._limits(host)["connections"]
+        if connections is None or fcntl is None:
+            return HostSlot()
+        for index in range(connections):
+            lock = open(self._path(host, f"{index}.slot"), "a")
+            try:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock.close()
+                continue
+            return HostSlot(lock)
+        return None
+
+    def acquire(self, url: str) -> HostSlot:
+        """Wait for a connection slot and a request token of the host of the url.
+
+        Parameters
+        -------------------
+        url: str,
+            The url to be requested.
+
+        Returns
+        -------------------
+        The connection slot, to be released when the connection is closed.
+        """
+        host = urlparse(url).netloc.lower()
+        slot = self._take_slot(host)
+        while slot is None:
+            sleep(POLLING_INTERVAL)
+            slot = self._take_slot(host)
+        try:
+            wait = self._take_token(host)
+            while wait > 0:
+                sleep(wait)
+                wait = self._take_token(host)
+        except BaseException:
+            slot.release()
+            raise
+        return slot
+
+    async def acquire_async(self, url: str) -> HostSlot:
+        """Wait within the event loop for a connection slot and a request token.
+
+        Parameters
+        -------------------
+        url: str,
+            The url to be requested.
+
+        Returns
+        -------------------
+        The connection slot, to be released when the connection is closed.
+        """
+        import asyncio
+
+        host = urlparse(url).netloc.lower()
+        slot = self._take_slot(host)
+        while slot is None:
+            await asyncio.sleep(POLLING_INTERVAL)
+            slot = self._take_slot(host)
+        try:
+            wait = self._take_token(host)
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self._take_token(host)
+        except BaseException:
+            slot.release()
+            raise
+        return slot
+
+    def observe(self, url: str, status_code: int, retry_after: Optional[str]):
+        """Pause the requests towards the host of the url if it asked to retry later.
+
+        Parameters
+        -------------------
+        url: str,
+            The requested url.
+        status_code: int,
+            The status code of the response.
+        retry_after: Optional[str],
+            The Retry-After header of the response, if any.
+        """
+        if status_code not in (429, 503):
+            return
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            return
+        with self._state(urlparse(url).netloc.lower()) as state:
+            state["blocked_until"] = max(state.get("blocked_until", 0.0), time() + delay)
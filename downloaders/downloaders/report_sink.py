@@ -0,0 +1,169 @@
+"""Submodule providing the append-only sinks where the download reports are written."""
+import json
+import os
+from typing import Dict, List
+
+# Types of the Parquet columns of the reports, the ones of the extraction
+# being prefixed by "extraction_". The unknown columns are stored as strings.
+COLUMN_TYPES = {
+    "status_code": "int64",
+    "file_size": "int64",
+    "downloaded_file_size": "int64",
+    "success": "bool_",
+    "cached": "bool_",
+    "segments": "int64",
+    "throughput": "float64",
+    "attempts": "int64",
+    "retryable": "bool_",
+    "connect_time": "float64",
+    "ttfb": "float64",
+    "transfer_time": "float64",
+    "elapsed_time": "float64",
+    "time": "float64",
+}
+# Columns of the extraction, which may be missing from the first reports.
+EXTRACTION_COLUMNS = ("file_size", "destination", "cached", "success", "time")
+
+
+class JSONLinesSink:
+    """Sink appending each report as a line of a JSON Lines file."""
+
+    def __init__(self, path: str):
+        """Create new JSONLinesSink object.
+
+        Parameters
+        -------------------
+        path: str,
+            The path of the file, to which the reports are appended.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf8")
+
+    def write(self, report: Dict):
+        """Append the given report, flushing it so that it survives a crash."""
+        self._file.write(json.dumps(report, default=str) + "\n")
+        self._file.flush()
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
+
+
+class ParquetSink:
+    """Sink writing the reports to a Parquet file in row groups."""
+
+    def __init__(self, path: str, row_group_size: int = 1000):
+        """Create new ParquetSink object.
+
+        Parameters
+        -------------------
+        path: str,
+            The path of the file, which is overwritten.
+        row_group_size: int = 1000,
+            Number of reports written at once as a row group.
+
+        Raises
+        -------------------
+        ImportError,
+            If pyarrow is not installed.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as import_exception:
+            raise ImportError(
+                "Writing the reports to Parquet requires pyarrow, which can be "
+                "installed by running `pip install downloaders[parquet]`."
+            ) from import_exception
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._pyarrow = pyarrow
+        self._path = path
+        self._row_group_size = row_group_size
+        self._reports: List[Dict] = []
+        self._writer = None
+        self._schema = None
+
+    def _type(self, column: str):
+        """Return the Parquet type of the given column."""
+        name = COLUMN_TYPES.get(column.replace("extraction_", "", 1), "string")
+        return getattr(self._pyarrow, name)()
+
+    def _flush(self):
+        """Write the buffered reports as a row group."""
+        if not self._reports:
+            return
+        if self._writer is None:
+            # The schema is given by the columns of the first row group, and
+            # by the ones of the extraction, even if nothing was extracted yet.
+            columns = list(
+                dict.fromkeys(
+                    [
+                        *(key for report in self._reports for key in report),
+                        *(f"extraction_{column}" for column in EXTRACTION_COLUMNS),
+                    ]
+                )
+            )
+            self._schema = self._pyarrow.schema(
+                [(column, self._type(column)) for column in columns]
+            )
+            self._writer = self._pyarrow.parquet.ParquetWriter(self._path, self._schema)
+        self._writer.write_table(
+            self._pyarrow.Table.from_pylist(
+                [
+                    {
+                        column: (
+                            str(report[column])
+                            if self._type(column) == self._pyarrow.string()
+                            and report.get(column) is not None
+                            else report.get(column)
+                        )
+                        for column in self._schema.names
+                    }
+                    for report in self._reports
+                ],
+                schema=self._schema,
+            )
+        )
+        self._reports = []
+
+    def write(self, report: Dict):
+        """Buffer the given report, writing a row group once enough are buffered."""
+        self._reports.append(report)
+        if len(self._reports) >= self._row_group_size:
+            self._flush()
+
+    def close(self):
+        """Write the remaining reports and close the file."""
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_report_sink(path: str):
+    """Return the sink of the reports for the given path.
+
+    Parameters
+    -------------------
+    path: str,
+        The path of the sink, either a JSON Lines file, with extension
+        ".jsonl", or a Parquet file, with extension ".parquet".
+
+    Raises
+    -------------------
+    ValueError,
+        If the extension of the path is not supported.
+
+    Returns
+    -------------------
+    The sink, with the `write` and `close` methods.
+    """
+    if path.endswith(".jsonl"):
+        return JSONLinesSink(path)
+    if path.endswith(".parquet"):
+        return ParquetSink(path)
+    raise ValueError(
+        f"The extension of the report path {path} is not supported. "
+        "The supported extensions are .jsonl and .parquet."
+    )
@@ -0,0 +1,125 @@
+"""Submodule providing the partial-file sidecars used to resume interrupted downloads."""
+import json
+import os
+import re
+from typing import Dict, Optional
+
+import requests
+
+
+def part_path(destination: str) -> str:
+    """Return the path of the partial file of the given destination."""
+    return f"{destination}.part"
+
+
+def sidecar_path(destination: str) -> str:
+    """Return the path of the metadata sidecar of the given destination."""
+    return f"{destination}.part.json"
+
+
+def load_sidecar(destination: str) -> Optional[Dict]:
+    """Return the metadata of the partial download of the given destination.
+
+    Parameters
+    -------------------
+    destination: str,
+        The final path of the download.
+
+    Returns
+    -------------------
+    Dictionary with the url, the validators and the offset of the partial
+    download, or None if there is no partial download to resume.
+    """
+    part = part_path(destination)
+    sidecar = sidecar_path(destination)
+    if not os.path.exists(part) or not os.path.exists(sidecar):
+        return None
+    try:
+        with open(sidecar, "r", encoding="utf8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # The size of the partial file is the only reliable offset, as the
+    # process may have been killed after the last write to the sidecar.
+    metadata["offset"] = os.path.getsize(part)
+    return metadata
+
+
+def store_sidecar(destination: str, url: str, response: requests.Response, offset: int):
+    """Store the metadata required to resume the download of the given destination.
+
+    Parameters
+    -------------------
+    destination: str,
+        The final path of the download.
+    url: str,
+        The url being downloaded.
+    response: requests.Response,
+        The response whose validators are stored.
+    offset: int,
+        Number of bytes already stored in the partial file.
+    """
+    with open(sidecar_path(destination), "w", encoding="utf8") as f:
+        json.dump(
+            {
+                "url": url,
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "offset": offset,
+            },
+            f,
+        )
+
+
+def remove_partial(destination: str):
+    """Remove the partial file and the sidecar of the given destination."""
+    for path in (part_path(destination), sidecar_path(destination)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def resume_headers(destination: str, url: str) -> Dict[str, str]:
+    """Return the headers of the request resuming the download, if possible.
+
+    Parameters
+    -------------------
+    destination: str,
+        The final path of the download.
+    url: str,
+        The url to be downloaded.
+
+    Returns
+    -------------------
+    Dictionary with the Range and If-Range headers, which is empty when
+    there is no partial download of the same url with a validator to resume.
+    """
+    metadata = load_sidecar(destination)
+    if metadata is None or metadata["url"] != url or metadata["offset"] == 0:
+        return {}
+    validator = metadata["etag"] or metadata["last_modified"]
+    # Without a validator we could not tell whether the remote file
+    # has changed since the partial download, so we start over.
+    if validator is None:
+        return {}
+    return {"Range": f"bytes={metadata['offset']}-", "If-Range": validator}
+
+
+def resumed_offset(response: requests.Response) -> Optional[int]:
+    """Return the offset the response body starts at, if it is a partial content.
+
+    Parameters
+    -------------------
+    response: requests.Response,
+        The response to a request with a Range header.
+
+    Returns
+    -------------------
+    The starting offset of the partial content, or None when the server
+    has sent the whole file.
+    """
+    if response.status_code != 206:
+        return None
+    match = re.match(r"bytes (\d+)-", response.headers.get("content-range", ""))
+    if match is None:
+        return None
+    return int(match.group(1))
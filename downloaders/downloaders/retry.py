@@ -0,0 +1,175 @@
+"""Submodule providing the retry policy and the scheduler requeuing the failed downloads."""
+import heapq
+import random
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from time import sleep, time
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import requests
+import urllib3
+
+# Exceptions raised by transient network failures, such as dropped connections.
+RETRYABLE_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    urllib3.exceptions.HTTPError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class RetryPolicy:
+    """Policy deciding which downloads are retried and after how long."""
+
+    def __init__(
+        self,
+        retries: int = 0,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        statuses: Tuple[int, ...] = (408, 425, 429, 500, 502, 503, 504),
+    ):
+        """Create new RetryPolicy object.
+
+        Parameters
+        -------------------
+        retries: int = 0,
+            Maximum number of times a failed download is retried.
+        backoff: float = 1.0,
+            Base of the exponential backoff in seconds. The delay before
+            the n-th retry is drawn uniformly between zero and
+            `backoff * 2 ** (n - 1)`, so that the retries are spread out.
+        max_backoff: float = 60.0,
+            Maximum delay in seconds before a retry.
+        statuses: Tuple[int, ...] = (408, 425, 429, 500, 502, 503, 504),
+            The status codes of the failed requests which are retried.
+
+        Raises
+        -------------------
+        ValueError,
+            If the given parameters are not valid.
+        """
+        if not isinstance(retries, int) or retries < 0:
+            raise ValueError("The given number of retries is not a positive integer.")
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError("The given backoff is not a positive number.")
+        self._retries = retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._statuses = tuple(statuses)
+
+    @property
+    def attempts(self) -> int:
+        """Return the maximum number of attempts of each download."""
+        return self._retries + 1
+
+    def is_retryable(
+        self,
+        status_code: Optional[int],
+        exception: BaseException,
+        exceptions: Tuple[type, ...] = (),
+    ) -> bool:
+        """Return whether the download failed with the given status and exception may succeed if retried.
+
+        Parameters
+        -------------------
+        status_code: Optional[int],
+            The status code of the failed request, if any.
+        exception: BaseException,
+            The exception raised by the failed download.
+        exceptions: Tuple[type, ...] = (),
+            Additional transient exceptions, such as the ones of aiohttp.
+        """
+        return status_code in self._statuses or isinstance(
+            exception, RETRYABLE_EXCEPTIONS + tuple(exceptions)
+        )
+
+    def should_retry(self, report: Dict) -> bool:
+        """Return whether the download with the given report is to be retried."""
+        return (
+            not report["success"]
+            and report["retryable"]
+            and report["attempts"] < self.attempts
+        )
+
+    def delay(self, attempt: int) -> float:
+        """Return the seconds to wait before retrying the given failed attempt."""
+        return random.uniform(0, min(self._max_backoff, self._backoff * 2 ** (attempt - 1)))
+
+
+def iter_with_retries(
+    tasks: Iterable[Dict],
+    submit: Callable[[Dict], Future],
+    policy: RetryPolicy,
+    max_pending: Optional[int] = None,
+) -> Iterator[Tuple[int, Dict]]:
+    """Yield the final reports of the given tasks as they complete, requeuing the ones to retry.
+
+    The tasks to retry are submitted again once their backoff expires,
+    after the tasks already queued, so no worker is kept waiting.
+
+    Parameters
+    -------------------
+    tasks: Iterable[Dict],
+        The keyword arguments of the downloads, which are consumed lazily
+        when the pending tasks are bounded.
+    submit: Callable[[Dict], Future],
+        Function submitting a task, including its attempt number, to the
+        workers, and returning the future of its report.
+    policy: RetryPolicy,
+        The policy deciding which downloads are retried.
+    max_pending: Optional[int] = None,
+        Maximum number of tasks submitted and not yet completed.
+        By default, all the tasks are submitted at once.
+
+    Returns
+    -------------------
+    Iterator over the position of each task and its final report,
+    in completion order.
+    """
+    queued = iter(enumerate(tasks))
+    # Only the tasks not completed yet are kept, so that they can be retried.
+    pending = {}
+    futures = {}
+    scheduled = []
+    exhausted = False
+    try:
+        while True:
+            while max_pending is None or len(futures) < max_pending:
+                if not exhausted:
+                    index, task = next(queued, (None, None))
+                    if index is not None:
+                        pending[index] = task
+                        futures[submit({**task, "attempt": 1})] = (index, 1)
+                        continue
+                    exhausted = True
+                if scheduled and scheduled[0][0] <= time():
+                    _, index, attempt = heapq.heappop(scheduled)
+                    futures[submit({**pending[index], "attempt": attempt})] = (index, attempt)
+                    continue
+                break
+            if not futures and not scheduled:
+                return
+            if not futures:
+                # Only retries are left, which are waiting for their backoff.
+                sleep(max(scheduled[0][0] - time(), 0))
+                continue
+            done, _ = wait(
+                futures,
+                timeout=max(scheduled[0][0] - time(), 0) if scheduled else None,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                index, attempt = futures.pop(future)
+                report = future.result()
+                if policy.should_retry(report):
+                    heapq.heappush(
+                        scheduled, (time() + policy.delay(attempt), index, attempt + 1)
+                    )
+                    continue
+                del pending[index]
+                yield index, report
+    except (Exception, GeneratorExit, KeyboardInterrupt) as e:
+        for future in futures:
+            future.cancel()
+        raise e
@@ -0,0 +1,138 @@
+"""Submodule providing the download of a single file over multiple range requests."""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from ..utils import preallocate
+from .resume import resumed_offset
+
+
+def supports_segments(response: requests.Response, threshold: int) -> bool:
+    """Return whether the file of the given response can be downloaded in segments.
+
+    Parameters
+    -------------------
+    response: requests.Response,
+        The response to the plain request of the file.
+    threshold: int,
+        Minimum size in bytes of the files to download in segments.
+
+    Returns
+    -------------------
+    Boolean value representing if the server accepts byte ranges and
+    the file is larger than the threshold.
+    """
+    return (
+        response.status_code == 200
+        and response.headers.get("accept-ranges", "").lower() == "bytes"
+        and int(response.headers.get("content-length", 0)) > threshold
+    )
+
+
+def split_segments(file_size: int, segments: int) -> List[Tuple[int, int]]:
+    """Return the inclusive byte ranges splitting a file of the given size.
+
+    Parameters
+    -------------------
+    file_size: int,
+        Size of the file in bytes.
+    segments: int,
+        Number of segments to split the file into.
+
+    Returns
+    -------------------
+    List with the first and last byte of each segment.
+    """
+    segment_size = -(-file_size // segments)
+    return [
+        (start, min(start + segment_size, file_size) - 1)
+        for start in range(0, file_size, segment_size)
+    ]
+
+
+def download_segments(
+    get: Callable[[str, Dict[str, str]], requests.Response],
+    url: str,
+    path: str,
+    file_size: int,
+    segments: int,
+    block_size: int,
+    retries: int,
+    validator: Optional[str] = None,
+    callback: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Download the file at the given url concurrently over multiple range requests.
+
+    Parameters
+    -------------------
+    get: Callable[[str, Dict[str, str]], requests.Response],
+        Function returning the streamed response for the given url and headers.
+    url: str,
+        The url from where to download the data.
+    path: str,
+        The path where to store the data, which is preallocated to the file size.
+    file_size: int,
+        Size of the file in bytes.
+    segments: int,
+        Number of segments downloaded concurrently.
+    block_size: int,
+        The dimension of the block size to download in stream.
+    retries: int,
+        Number of times a failed segment is resumed from its last written byte.
+    validator: Optional[str] = None,
+        The ETag or Last-Modified of the file, sent as If-Range so that a
+        change of the remote file during the download is detected.
+    callback: Optional[Callable[[int], None]] = None,
+        Function called with the number of bytes of each written block.
+
+    Raises
+    -------------------
+    ValueError,
+        If the server does not answer a segment request with the expected range.
+
+    Returns
+    -------------------
+    The number of segments the file was downloaded in.
+    """
+    with open(path, "wb") as f:
+        preallocate(f.fileno(), file_size)
+
+    def download_segment(start: int, end: int):
+        # Each segment writes through its own handle at its own offsets,
+        # so no lock is needed among the segments.
+        with open(path, "r+b") as f:
+            for attempt in range(retries + 1):
+                if start > end:
+                    break
+                headers = {"Range": f"bytes={start}-{end}"}
+                if validator is not None:
+                    headers["If-Range"] = validator
+                try:
+                    with get(url, headers) as response:
+                        if resumed_offset(response) != start:
+                            raise ValueError(
+                                f"Request to url {url} for bytes {start}-{end} "
+                                f"finished with status code {response.status_code}."
+                            )
+                        f.seek(start)
+                        for data in response.iter_content(block_size):
+                            data = data[: end - start + 1]
+                            f.write(data)
+                            start += len(data)
+                            if callback is not None:
+                                callback(len(data))
+                except (requests.RequestException, OSError) as segment_exception:
+                    # The failed segment is resumed from its last written byte.
+                    if attempt == retries:
+                        raise segment_exception
+        if start <= end:
+            raise ValueError(
+                f"Request to url {url} for bytes {start}-{end} ended prematurely."
+            )
+
+    ranges = split_segments(file_size, segments)
+    with ThreadPoolExecutor(len(ranges)) as executor:
+        for future in [executor.submit(download_segment, *r) for r in ranges]:
+            future.result()
+    return len(ranges)
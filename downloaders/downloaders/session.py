@@ -0,0 +1,131 @@
+"""Submodule providing the pooled keep-alive HTTP sessions used by the downloaders."""
+import os
+import threading
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# Sessions are cached per process: a session inherited through a fork
+# would share its sockets with the parent, so the pid is part of the key.
+_SESSIONS: Dict[Tuple[int, int, int], requests.Session] = {}
+# Duration of the last connection opened by each thread.
+_CONNECT_TIMES = threading.local()
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """Connection recording how long it took to be opened."""
+
+    def connect(self):
+        """Open the connection, recording its duration."""
+        start = perf_counter()
+        super().connect()
+        _CONNECT_TIMES.value = perf_counter() - start
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """Secure connection recording how long it took to be opened, handshake included."""
+
+    def connect(self):
+        """Open the connection, recording its duration."""
+        start = perf_counter()
+        super().connect()
+        _CONNECT_TIMES.value = perf_counter() - start
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    """Connection pool opening timed connections."""
+
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    """Secure connection pool opening timed connections."""
+
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Adapter whose connections record how long they took to be opened."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager, using the timed connection pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def pop_connect_time() -> Optional[float]:
+    """Return and reset the duration of the last connection opened by this thread.
+
+    Returns
+    -------------------
+    The seconds spent resolving the host and opening the connection,
+    or None if no connection was opened since the last call, such as
+    when a pooled keep-alive connection was reused.
+    """
+    connect_time = getattr(_CONNECT_TIMES, "value", None)
+    _CONNECT_TIMES.value = None
+    return connect_time
+
+
+def build_session(pool_size: int = 10, http_retries: int = 0) -> requests.Session:
+    """Return a new session with a connection pool of the given size.
+
+    Parameters
+    -------------------
+    pool_size: int = 10,
+        Maximum number of keep-alive connections kept open towards each host.
+    http_retries: int = 0,
+        Number of retries the HTTP adapter executes on connection errors
+        and on the 429, 500, 502, 503 and 504 status codes.
+
+    Returns
+    -------------------
+    The newly created session.
+    """
+    retries = Retry(
+        total=http_retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        raise_on_status=False,
+    )
+    adapter = TimedHTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(pool_size: int = 10, http_retries: int = 0) -> requests.Session:
+    """Return the session of the current process with the given configuration.
+
+    Parameters
+    -------------------
+    pool_size: int = 10,
+        Maximum number of keep-alive connections kept open towards each host.
+    http_retries: int = 0,
+        Number of retries the HTTP adapter executes on transient failures.
+
+    Returns
+    -------------------
+    The session, which is created on first use and then reused by every
+    download executed within the same process.
+    """
+    key = (os.getpid(), pool_size, http_retries)
+    session = _SESSIONS.get(key)
+    if session is None:
+        session = build_session(pool_size=pool_size, http_retries=http_retries)
+        _SESSIONS[key] = session
+    return session
@@ -1,5 +1,33 @@
 """Module with methods to extract files."""
-from .auto_extractor import AutoExtractor
+# As in the package __init__, the typing module is not imported at runtime.
+TYPE_CHECKING = False
 
+if TYPE_CHECKING:
+    from .auto_extractor import AutoExtractor
+    from .base_extractor import BaseExtractor
+    from .registry import register_extractor
 
-__all__ = ["AutoExtractor"]
+__all__ = ["AutoExtractor", "BaseExtractor", "register_extractor"]
+
+
+def __getattr__(name: str):
+    """Return the public object with the given name, importing it on first access.
+
+    The public objects are imported lazily (PEP 562), so that importing
+    the package does not import the archive and compression modules.
+    """
+    if name == "AutoExtractor":
+        from .auto_extractor import AutoExtractor as value
+    elif name == "BaseExtractor":
+        from .base_extractor import BaseExtractor as value
+    elif name == "register_extractor":
+        from .registry import register_extractor as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Return the names of the module, including the ones not imported yet."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,280 @@
+"""Submodule providing the index of the members of the archives.
+
+The index lists the name, size and offset of each member of an archive,
+and is cached in a sidecar file next to the archive, so that the later
+selective extractions neither list the members again nor, for the zip
+and the uncompressed tar archives, scan the archive to find them.
+"""
+import bz2
+import json
+import os
+import struct
+import tarfile
+import zipfile
+import zlib
+from fnmatch import fnmatchcase
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+from ..utils import commit_path, remove_path, temporary_path
+
+# Suffix of the sidecar files caching the index of the archives.
+INDEX_SUFFIX = ".index.json"
+
+# Version of the layout of the sidecar files, which are rebuilt when it changes.
+INDEX_VERSION = 2
+
+# Compression methods of the zip members that are decompressed directly,
+# without reading the central directory of the archive.
+ZIP_DECOMPRESSORS = {
+    zipfile.ZIP_STORED: None,
+    zipfile.ZIP_DEFLATED: lambda: zlib.decompressobj(-zlib.MAX_WBITS),
+    zipfile.ZIP_BZIP2: bz2.BZ2Decompressor,
+}
+
+
+def index_path(source: str, suffix: str = INDEX_SUFFIX) -> str:
+    """Return the path of the sidecar file caching the index of the given archive."""
+    return f"{source}{suffix}"
+
+
+def load_index(source: str, suffix: str = INDEX_SUFFIX) -> Optional[List[Dict]]:
+    """Return the cached index of the given archive, or None if it is missing or stale.
+
+    Parameters
+    --------------------
+    source: str,
+        The path of the archive.
+    suffix: str = INDEX_SUFFIX,
+        The suffix of the sidecar file.
+
+    Returns
+    --------------------
+    The entries of the index of the archive, or None if the sidecar file
+    is missing, unreadable or was written for a different version of the archive.
+    """
+    try:
+        with open(index_path(source, suffix), "r", encoding="utf8") as f:
+            index = json.load(f)
+        stat = os.stat(source)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != INDEX_VERSION or index.get("archive") != [
+        stat.st_size,
+        stat.st_mtime_ns,
+    ]:
+        return None
+    return index["entries"]
+
+
+def save_index(source: str, entries: List[Dict], suffix: str = INDEX_SUFFIX):
+    """Write the index of the given archive to its sidecar file.
+
+    The sidecar file is written atomically, and it is not written at all
+    when the directory of the archive is not writable, as the index is a
+    cache that can always be rebuilt.
+
+    Parameters
+    --------------------
+    source: str,
+        The path of the archive.
+    entries: List[Dict],
+        The entries of the index, such as the ones of the members of the archive.
+    suffix: str = INDEX_SUFFIX,
+        The suffix of the sidecar file.
+    """
+    path = index_path(source, suffix)
+    temporary = temporary_path(path)
+    try:
+        stat = os.stat(source)
+        with open(temporary, "w", encoding="utf8") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "archive": [stat.st_size, stat.st_mtime_ns],
+                    "entries": entries,
+                },
+                f,
+            )
+        commit_path(temporary, path)
+    except OSError:
+        remove_path(temporary)
+
+
+def cached_index(
+    source: str, build: Callable[[str], List[Dict]], suffix: str = INDEX_SUFFIX
+) -> List[Dict]:
+    """Return the index of the given archive, building and caching it if needed.
+
+    Parameters
+    --------------------
+    source: str,
+        The path of the archive.
+    build: Callable[[str], List[Dict]],
+        Function returning the entries of the index of the given archive.
+    suffix: str = INDEX_SUFFIX,
+        The suffix of the sidecar file.
+
+    Returns
+    --------------------
+    The entries of the index of the archive.
+    """
+    entries = load_index(source, suffix)
+    if entries is None:
+        entries = build(source)
+        save_index(source, entries, suffix)
+    return entries
+
+
+def matches(name: str, patterns: List[str]) -> bool:
+    """Return whether the given name matches any of the given glob patterns."""
+    return any(fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def select_members(
+    members: List[Dict],
+    include: Optional[Union[str, List[str]]] = None,
+    exclude: Optional[Union[str, List[str]]] = None,
+    names: Optional[List[str]] = None,
+) -> List[Dict]:
+    """Return the entries of the members matching the given selection.
+
+    Parameters
+    --------------------
+    members: List[Dict],
+        The entries of the members of the archive.
+    include: Optional[Union[str, List[str]]] = None,
+        The glob patterns, of which a member must match at least one.
+    exclude: Optional[Union[str, List[str]]] = None,
+        The glob patterns, of which a member must match none.
+    names: Optional[List[str]] = None,
+        The names of the members to select.
+
+    Raises
+    --------------------
+    ValueError,
+        If some of the given names are not members of the archive.
+
+    Returns
+    --------------------
+    The entries of the selected members, in the order of the archive.
+    """
+    if isinstance(include, str):
+        include = [include]
+    if isinstance(exclude, str):
+        exclude = [exclude]
+    if names is not None:
+        missing = set(names) - {member["name"] for member in members}
+        if missing:
+            raise ValueError(
+                f"The members {sorted(missing)} are not within the archive."
+            )
+        names = set(names)
+    return [
+        member
+        for member in members
+        if (names is None or member["name"] in names)
+        and (include is None or matches(member["name"], include))
+        and (exclude is None or not matches(member["name"], exclude))
+    ]
+
+
+def tar_index(tar: tarfile.TarFile) -> List[Dict]:
+    """Return the entries of the members of the given tar.
+
+    The offset of each member is the position of its header within the
+    uncompressed archive.
+
+    Parameters
+    --------------------
+    tar: tarfile.TarFile,
+        The tar to index, which may be opened in stream mode.
+
+    Returns
+    --------------------
+    The entries of the members of the tar.
+    """
+    return [
+        {"name": member.name, "size": member.size, "offset": member.offset}
+        for member in tar
+    ]
+
+
+def zip_index(zip_ref: zipfile.ZipFile) -> List[Dict]:
+    """Return the entries of the members of the given zip.
+
+    The offset of each member is the position of its local header within
+    the archive, which is stored with the compressed size, compression
+    method and checksum needed to decompress the member directly.
+
+    Parameters
+    --------------------
+    zip_ref: zipfile.ZipFile,
+        The zip to index.
+
+    Returns
+    --------------------
+    The entries of the members of the zip.
+    """
+    return [
+        {
+            "name": member.filename,
+            "size": member.file_size,
+            "offset": member.header_offset,
+            "compressed_size": member.compress_size,
+            "method": member.compress_type,
+            "crc": member.CRC,
+            "encrypted": bool(member.flag_bits & 0x1),
+        }
+        for member in zip_ref.infolist()
+    ]
+
+
+def can_read_zip_member(member: Dict) -> bool:
+    """Return whether the given zip member can be decompressed directly."""
+    return not member["encrypted"] and member["method"] in ZIP_DECOMPRESSORS
+
+
+def read_zip_member(
+    handle: BinaryIO, member: Dict, block_size: int = 1024 * 1024
+) -> Iterator[bytes]:
+    """Yield the decompressed blocks of the given zip member, seeking to it directly.
+
+    Parameters
+    --------------------
+    handle: BinaryIO,
+        The zip opened in binary mode.
+    member: Dict,
+        The entry of the member in the index of the zip, which must be
+        supported by `can_read_zip_member`.
+    block_size: int = 1024 * 1024,
+        The number of compressed bytes read at a time.
+
+    Raises
+    --------------------
+    zipfile.BadZipFile,
+        If the member is corrupted.
+    """
+    handle.seek(member["offset"])
+    header = handle.read(zipfile.sizeFileHeader)
+    if len(header) != zipfile.sizeFileHeader:
+        raise zipfile.BadZipFile(f"Truncated header of member {member['name']}.")
+    fields = struct.unpack(zipfile.structFileHeader, header)
+    if fields[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad magic number of member {member['name']}.")
+    # The name and the extra field, whose lengths are the last fields of
+    # the local header, precede the data of the member.
+    handle.seek(fields[-2] + fields[-1], os.SEEK_CUR)
+    factory = ZIP_DECOMPRESSORS[member["method"]]
+    decompressor = None if factory is None else factory()
+    crc = 0
+    remaining = member["compressed_size"]
+    while remaining:
+        data = handle.read(min(block_size, remaining))
+        if not data:
+            raise zipfile.BadZipFile(f"Truncated data of member {member['name']}.")
+        remaining -= len(data)
+        if decompressor is not None:
+            data = decompressor.decompress(data)
+        crc = zlib.crc32(data, crc)
+        yield data
+    if crc != member["crc"]:
+        raise zipfile.BadZipFile(f"Bad CRC-32 of member {member['name']}.")
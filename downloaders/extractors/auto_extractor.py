@@ -1,19 +1,25 @@
+import inspect
+import io
 from typing import Dict, Union, List, Optional
-from tqdm.auto import tqdm
 from .base_extractor import BaseExtractor
-from .gzip_extractor import GzipExtractor
-from .targz_extractor import TargzExtractor
-from .xz_extractor import XzExtractor
-from .zip_extraction import ZipExtractor
-from .bz2_extractor import BZ2Extractor
-from .tar_extractor import TarExtractor
+from .registry import registered_extractors
 
 
 class AutoExtractor(BaseExtractor):
-    """Class to automatically extract files."""
+    """Class to automatically extract files.
+
+    The extractors are taken from the registry when the object is created,
+    see `register_extractor`. When the extraction runs in other processes
+    started with spawn, the custom extractors must be registered on import
+    of the module defining them, so that they are available in every process.
+    """
 
     def __init__(
-        self, cache: bool = True, delete_original_after_extraction: bool = False
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = False,
+        processes: int = 1,
+        fsync: bool = False,
     ):
         """Create new file extractor.
 
@@ -23,26 +29,31 @@ class AutoExtractor(BaseExtractor):
             Whether to skip extraction when file is already available.
         delete_original_after_extraction: bool = False,
             Whether to delete the original file after it has been extracted.
+        processes: int = 1,
+            Number of processes used by the extractors of the formats
+            that can be extracted in parallel, such as zip and the
+            bzip2 and xz files made of multiple blocks.
+            If the given number is -1, we use all the available processes.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
         """
         super().__init__(
             None,
             cache=cache,
             delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
         )
-        self._extractors = [
-            extractor(
+        self._extractors = []
+        for extractor in registered_extractors():
+            parameters = dict(
                 cache=cache,
                 delete_original_after_extraction=delete_original_after_extraction,
+                fsync=fsync,
             )
-            for extractor in (
-                GzipExtractor,
-                XzExtractor,
-                BZ2Extractor,
-                TargzExtractor,
-                TarExtractor,
-                ZipExtractor,
-            )
-        ]
+            if "processes" in inspect.signature(extractor).parameters:
+                parameters["processes"] = processes
+            self._extractors.append(extractor(**parameters))
 
     def get_supported_extractor(self, source: str) -> BaseExtractor:
         """Return supported extractor if it exists.
@@ -89,10 +100,56 @@ class AutoExtractor(BaseExtractor):
         """
         return self.get_supported_extractor(source) is not None
 
+    def archive_index(self, source: str) -> List[Dict]:
+        """Return the index of the members of the given archive.
+
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+
+        Raises
+        ------------------
+        ValueError,
+            If the format is not an archive of multiple members.
+
+        Returns
+        ------------------
+        List with a dictionary for each member, in the order of the archive,
+        with its name, its size and its offset within the archive.
+        """
+        return self.get_supported_extractor(source).archive_index(source)
+
+    def open_extracted(self, source: str) -> io.BufferedReader:
+        """Return a seekable file object reading the extracted content of the given file.
+
+        The gzip, xz and bzip2 files are read without extracting them to disk,
+        decompressing only from the checkpoint preceding each read, see
+        `BaseExtractor.open_extracted`.
+
+        Parameters
+        ------------------
+        source: str,
+            The source file.
+
+        Raises
+        ------------------
+        ValueError,
+            If the format does not support random access.
+
+        Returns
+        ------------------
+        Buffered binary file object, to be closed once done.
+        """
+        return self.get_supported_extractor(source).open_extracted(source)
+
     def extract(
         self,
         source: Union[str, List[str]],
         destination: Optional[Union[str, List[str]]] = None,
+        include: Optional[Union[str, List[str]]] = None,
+        exclude: Optional[Union[str, List[str]]] = None,
+        members: Optional[List[str]] = None,
     ) -> List[Dict]:
         """Extract the given source file to the given destination.
 
@@ -107,11 +164,22 @@ class AutoExtractor(BaseExtractor):
             will be inferred by the provided source paths.
             If a list is provided, we expect it to have the same length
             as the source list.
+        include: Optional[Union[str, List[str]]] = None,
+            The glob patterns of the members of the archives to extract,
+            of which a member must match at least one.
+        exclude: Optional[Union[str, List[str]]] = None,
+            The glob patterns of the members of the archives not to extract.
+        members: Optional[List[str]] = None,
+            The names of the members of the archives to extract.
+            When any selection is given, only the selected members are
+            extracted and the original archives are kept.
 
         Returns
         -------------------
         Dictionary with metadata.
         """
+        from tqdm.auto import tqdm
+
         if isinstance(source, str):
             source = [source]
         if destination is None:
@@ -124,7 +192,9 @@ class AutoExtractor(BaseExtractor):
         )
 
         return [
-            self.get_supported_extractor(src).extract(src, dst)
+            self.get_supported_extractor(src).extract(
+                src, dst, include=include, exclude=exclude, members=members
+            )
             for src, dst in tqdm(
                 zip(source, destination),
                 desc="Extracting files",
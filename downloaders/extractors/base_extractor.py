@@ -1,6 +1,11 @@
-from typing import Union, List
-import shutil
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Union, List
+import io
 import os
+from ..utils import commit_path, remove_path, temporary_path
+from .archive_index import cached_index, index_path, select_members
+from .random_access import CHECKPOINTS_SUFFIX, CheckpointReader
+from .utils import is_within_directory
+from .streaming import StreamingDecompression, StreamingExtraction
 
 
 class BaseExtractor:
@@ -11,6 +16,7 @@ class BaseExtractor:
         extension: Union[str, List[str]],
         cache: bool = True,
         delete_original_after_extraction: bool = True,
+        fsync: bool = False,
     ):
         """Create new BaseExtractor object.
 
@@ -22,12 +28,16 @@ class BaseExtractor:
             Whether to skip extraction when file is already available.
         delete_original_after_extraction: bool = True,
             Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
         """
         if isinstance(extension, str):
             extension = [extension]
         self._extensions = extension
         self._cache = cache
         self._delete_original_after_extraction = delete_original_after_extraction
+        self._fsync = fsync
 
     def can_extract(self, source: str) -> bool:
         """Return Whether this extractor can extract or not the given file.
@@ -66,6 +76,34 @@ class BaseExtractor:
         # add the additional extension "extracted".
         return f"{source}.extracted"
 
+    def decompressor_factory(self) -> Optional[Callable]:
+        """Return the factory of the incremental decompressors of this format.
+
+        Returns
+        ----------------------
+        Function returning a new decompressor object, or None if the format
+        cannot be extracted while it is being downloaded.
+        """
+        return None
+
+    def streaming_extraction(self, destination: str) -> Optional[StreamingExtraction]:
+        """Return the extraction of the archive fed with the blocks being downloaded.
+
+        Parameters
+        ----------------------
+        destination: str,
+            The path where to extract the archive.
+
+        Returns
+        ----------------------
+        The streaming extraction, or None if the format cannot be extracted
+        while it is being downloaded.
+        """
+        factory = self.decompressor_factory()
+        if factory is None:
+            return None
+        return StreamingDecompression(factory, destination, fsync=self._fsync)
+
     def _extract(self, source: str, destination: str):
         """Extract the given source to the given destination.
 
@@ -84,7 +122,220 @@ class BaseExtractor:
         """Return boolean representing if given path is cached."""
         return self._cache and os.path.exists(destination)
 
-    def extract(self, source: str, destination: str = None):
+    def _index(self, source: str) -> List[Dict]:
+        """Return the entries of the members of the given archive.
+
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+
+        Raises
+        ------------------
+        ValueError,
+            If the format is not an archive of multiple members.
+        """
+        raise ValueError(
+            f"The extractor {self.__class__.__name__} does not support "
+            "the listing and selection of the members of the archives."
+        )
+
+    def _extract_members(self, source: str, destination: str, members: List[Dict]):
+        """Extract the given members of the source to the given destination.
+
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+        destination: str,
+            The target directory.
+        members: List[Dict],
+            The entries of the archive index of the members to extract.
+
+        Raises
+        ------------------
+        ValueError,
+            If the format is not an archive of multiple members.
+        """
+        raise ValueError(
+            f"The extractor {self.__class__.__name__} does not support "
+            "the listing and selection of the members of the archives."
+        )
+
+    def archive_index(self, source: str) -> List[Dict]:
+        """Return the index of the members of the given archive.
+
+        The index is cached in a sidecar file next to the archive, see
+        `INDEX_SUFFIX`, which is rebuilt when the archive changes.
+
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+
+        Raises
+        ------------------
+        ValueError,
+            If the format is not an archive of multiple members.
+
+        Returns
+        ------------------
+        List with a dictionary for each member, in the order of the archive,
+        with its name, its size and its offset within the archive.
+        """
+        return cached_index(source, self._index)
+
+    def _checkpoints(self, source: str) -> List[Dict]:
+        """Return the checkpoints from which the given file can be decompressed.
+
+        Parameters
+        ------------------
+        source: str,
+            The source file.
+
+        Raises
+        ------------------
+        ValueError,
+            If the format does not support random access.
+        """
+        raise ValueError(
+            f"The extractor {self.__class__.__name__} does not support "
+            "the random access to the extracted content."
+        )
+
+    def _read_checkpoint(self, handle: BinaryIO, checkpoint: Dict) -> Iterator[bytes]:
+        """Yield the decompressed blocks of the file from the given checkpoint.
+
+        Parameters
+        ------------------
+        handle: BinaryIO,
+            The source file opened in binary mode.
+        checkpoint: Dict,
+            The checkpoint from which to decompress the file.
+
+        Raises
+        ------------------
+        ValueError,
+            If the format does not support random access.
+        """
+        raise ValueError(
+            f"The extractor {self.__class__.__name__} does not support "
+            "the random access to the extracted content."
+        )
+
+    def open_extracted(self, source: str) -> io.BufferedReader:
+        """Return a seekable file object reading the extracted content of the given file.
+
+        The content is not extracted to disk: each read decompresses the file
+        from the last checkpoint preceding it, so that the random reads cost
+        the decompression of a block instead of the whole file. The
+        checkpoints are cached in a sidecar file next to the file, see
+        `CHECKPOINTS_SUFFIX`, which is rebuilt when the file changes.
+
+        Parameters
+        ------------------
+        source: str,
+            The source file.
+
+        Raises
+        ------------------
+        ValueError,
+            If the format does not support random access.
+
+        Returns
+        ------------------
+        Buffered binary file object, to be closed once done.
+        """
+        checkpoints = cached_index(source, self._checkpoints, CHECKPOINTS_SUFFIX)
+        return io.BufferedReader(
+            CheckpointReader(source, checkpoints, self._read_checkpoint)
+        )
+
+    def extract_members(
+        self,
+        source: str,
+        destination: Optional[str] = None,
+        include: Optional[Union[str, List[str]]] = None,
+        exclude: Optional[Union[str, List[str]]] = None,
+        members: Optional[List[str]] = None,
+    ) -> Dict:
+        """Extract the selected members of the given archive to the given destination.
+
+        The members already extracted are skipped when the cache is enabled,
+        while the original archive is never deleted, as further members
+        may be extracted from it later on. Note that, as the destination
+        directory then exists, a later full extraction to the same
+        destination is considered cached when the cache is enabled.
+
+        Parameters
+        -------------------
+        source: str,
+            The source archive to extract.
+        destination: Optional[str] = None,
+            The directory where to extract the members.
+            If it is not provided, it is inferred from the source path.
+        include: Optional[Union[str, List[str]]] = None,
+            The glob patterns, of which a member must match at least one.
+        exclude: Optional[Union[str, List[str]]] = None,
+            The glob patterns, of which a member must match none.
+        members: Optional[List[str]] = None,
+            The names of the members to extract.
+
+        Raises
+        -------------------
+        ValueError,
+            If the format is not an archive of multiple members,
+            or if some of the given members are not within the archive.
+
+        Returns
+        -------------------
+        Dictionary with metadata, including the names of the extracted members.
+        """
+        if destination is None:
+            destination = self.destination_path(source)
+        selected = [
+            member
+            for member in select_members(
+                self.archive_index(source), include, exclude, members
+            )
+            if not self.is_cached(os.path.join(destination, member["name"]))
+        ]
+        for member in selected:
+            member_path = os.path.join(destination, member["name"])
+            if not is_within_directory(destination, member_path):
+                raise Exception("Attempted Path Traversal in Archive")
+        # The members are extracted to a temporary directory, from which each
+        # of them is renamed into the destination once complete.
+        temporary = temporary_path(destination)
+        try:
+            self._extract_members(source, temporary, selected)
+            for member in selected:
+                path = os.path.join(temporary, member["name"])
+                target = os.path.join(destination, member["name"])
+                if os.path.isdir(path) and not os.path.islink(path):
+                    os.makedirs(target, exist_ok=True)
+                elif os.path.lexists(path):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    commit_path(path, target, fsync=self._fsync)
+        finally:
+            remove_path(temporary)
+
+        return {
+            "file_size": sum(member["size"] for member in selected),
+            "destination": destination,
+            "cached": not selected,
+            "success": True,
+            "members": [member["name"] for member in selected],
+        }
+
+    def extract(
+        self,
+        source: str,
+        destination: str = None,
+        include: Optional[Union[str, List[str]]] = None,
+        exclude: Optional[Union[str, List[str]]] = None,
+        members: Optional[List[str]] = None,
+    ):
         """Extract the given source file to the given destination.
 
         Parameters
@@ -93,7 +344,18 @@ class BaseExtractor:
             The source file to extract.
         destination: str = None,
             The destination file to target.
+        include: Optional[Union[str, List[str]]] = None,
+            The glob patterns of the members of the archive to extract,
+            of which a member must match at least one.
+        exclude: Optional[Union[str, List[str]]] = None,
+            The glob patterns of the members of the archive not to extract.
+        members: Optional[List[str]] = None,
+            The names of the members of the archive to extract.
+            When any selection is given, only the selected members are
+            extracted, see `extract_members`.
         """
+        if include is not None or exclude is not None or members is not None:
+            return self.extract_members(source, destination, include, exclude, members)
         cached = False
         success = False
         # If the destinations is not given, we obtain it from the source.
@@ -106,19 +368,21 @@ class BaseExtractor:
             # If the directory is not the current one.
             if directory:
                 os.makedirs(directory, exist_ok=True)
-            # Try to extract the file, if it fails we delete it.
+            # The file is extracted to a temporary path, which is renamed
+            # to the destination once complete, so that a concurrent reader
+            # or a crashed process never observes a partial extraction.
+            temporary = temporary_path(destination)
             try:
-                self._extract(source, destination)
+                self._extract(source, temporary)
+                commit_path(temporary, destination, fsync=self._fsync)
                 if self._delete_original_after_extraction:
                     os.remove(source)
+                    remove_path(index_path(source))
+                    remove_path(index_path(source, CHECKPOINTS_SUFFIX))
             except (Exception, KeyboardInterrupt) as extraction_exception:
-                # If the extracted file has been created
-                if os.path.exists(destination):
-                    # if the file is a directory, we remove it recursively.
-                    if os.path.isdir(destination):
-                        shutil.rmtree(destination)
-                    else:
-                        os.remove(destination)
+                # If the partially extracted file or directory has been
+                # created, we remove it.
+                remove_path(temporary)
                 raise extraction_exception
             success = True
         else:
@@ -1,17 +1,25 @@
 import tarfile
 import bz2
 import shutil
+from multiprocessing import cpu_count, current_process
+from typing import BinaryIO, Callable, Dict, Iterator, List
 from .base_extractor import BaseExtractor
-from .utils import is_bzip2
+from .parallel_decompression import parallel_bz2_decompress
+from .random_access import bz2_checkpoints, read_bz2_checkpoint
+from .utils import is_bzip2, is_tarbz2
 
 
 class BZ2Extractor(BaseExtractor):
-    """Extractor for Gzip files."""
+    """Extractor for Bzip2 files."""
 
     def __init__(
-        self, cache: bool = True, delete_original_after_extraction: bool = True
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        processes: int = 1,
+        fsync: bool = False,
     ):
-        """Create new GzipExtractor object.
+        """Create new BZ2Extractor object.
 
         Parameters
         -------------------
@@ -19,12 +27,20 @@ class BZ2Extractor(BaseExtractor):
             Whether to skip extraction when file is already available.
         delete_original_after_extraction: bool = True,
             Whether to delete the original file after it has been extracted.
+        processes: int = 1,
+            Number of processes across which the blocks are decompressed.
+            If the given number is -1, we use all the available processes.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
         """
         super().__init__(
             extension=".bz2",
             cache=cache,
             delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
         )
+        self._processes = processes if processes > 0 else cpu_count()
 
     def can_extract(self, source: str) -> bool:
         """Return Whether this extractor can extract or not the given file.
@@ -38,7 +54,11 @@ class BZ2Extractor(BaseExtractor):
         --------------------
         Boolean value representing if the file can be extracted.
         """
-        return is_bzip2(source)
+        return is_bzip2(source) and not is_tarbz2(source)
+
+    def decompressor_factory(self) -> Callable:
+        """Return the factory of the incremental decompressors of this format."""
+        return bz2.BZ2Decompressor
 
     def _extract(self, source: str, destination: str):
         """Extract the given source to the given destination.
@@ -50,6 +70,36 @@ class BZ2Extractor(BaseExtractor):
         destination: str,
             The target destination.
         """
+        # Daemonic processes, such as the ones of the downloader pool,
+        # are not allowed to start a pool of their own.
+        if (
+            self._processes > 1
+            and not current_process().daemon
+            and parallel_bz2_decompress(source, destination, self._processes)
+        ):
+            return
         with bz2.open(source, "rb") as f_in:
             with open(destination, "wb") as f_out:
                 shutil.copyfileobj(f_in, f_out)
+
+    def _checkpoints(self, source: str) -> List[Dict]:
+        """Return the checkpoints at the start of its blocks.
+
+        Parameters
+        ------------------
+        source: str,
+            The source file.
+        """
+        return bz2_checkpoints(source)
+
+    def _read_checkpoint(self, handle: BinaryIO, checkpoint: Dict) -> Iterator[bytes]:
+        """Yield the decompressed blocks of the file from the given checkpoint.
+
+        Parameters
+        ------------------
+        handle: BinaryIO,
+            The source file opened in binary mode.
+        checkpoint: Dict,
+            The checkpoint from which to decompress the file.
+        """
+        return read_bz2_checkpoint(handle, checkpoint)
@@ -0,0 +1,284 @@
+"""Submodule providing operators for extracting tar files wrapped in a compressed stream."""
+import bz2
+import lzma
+import tarfile
+from typing import Callable, Dict, List, Optional, Union
+from .archive_index import tar_index
+from .base_extractor import BaseExtractor
+from .compression import is_available, lz4_decompressor, zstd_decompressor
+from .format_detector import detect_format
+from .streaming import (
+    BlocksReader,
+    StreamDecompressor,
+    StreamingExtraction,
+    StreamingTarExtraction,
+    extract_tar_stream,
+    read_blocks,
+)
+from .utils import extract_tar_members
+
+
+class CompressedTarExtractor(BaseExtractor):
+    """Base class for extracting tar files wrapped in a compressed stream in a single step."""
+
+    # Module required to decompress the stream, if it is an optional dependency.
+    REQUIRED_MODULE: Optional[str] = None
+
+    def __init__(
+        self,
+        extension: Union[str, List[str]],
+        file_format: str,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        fsync: bool = False,
+    ):
+        """Create new CompressedTarExtractor object.
+
+        Parameters
+        -------------------
+        extension: Union[str, List[str]],
+            The extensions of the compressed tar files.
+        file_format: str,
+            The name of the format, as returned by `detect_format`.
+        cache: bool = True,
+            Whether to skip extraction when file is already available.
+        delete_original_after_extraction: bool = True,
+            Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
+        """
+        super().__init__(
+            extension=extension,
+            cache=cache,
+            delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
+        )
+        self._file_format = file_format
+
+    def can_extract(self, source: str) -> bool:
+        """Return Whether this extractor can extract or not the given file.
+
+        Parameters
+        --------------------
+        source: str,
+            The source path to test if it can be extracted.
+
+        Returns
+        --------------------
+        Boolean value representing if the file can be extracted, which is
+        False when the optional dependency of the format is not installed,
+        so that the file is kept as it is.
+        """
+        return detect_format(source) == self._file_format and (
+            self.REQUIRED_MODULE is None or is_available(self.REQUIRED_MODULE)
+        )
+
+    def decompressor_factory(self) -> Callable:
+        """Return the factory of the incremental decompressors of the stream wrapping the tar."""
+        raise NotImplementedError(
+            "The method decompressor_factory must be implemented in child classes."
+        )
+
+    def streaming_extraction(self, destination: str) -> StreamingExtraction:
+        """Return the extraction of the archive fed with the blocks being downloaded.
+
+        Parameters
+        ----------------------
+        destination: str,
+            The directory where to extract the archive.
+
+        Returns
+        ----------------------
+        The streaming extraction, which extracts each member as it arrives.
+        """
+        return StreamingTarExtraction(
+            destination, factory=self.decompressor_factory(), fsync=self._fsync
+        )
+
+    def _extract(self, source: str, destination: str):
+        """Extract the given source to the given destination.
+
+        Parameters
+        ------------------
+        source: str,
+            The source file.
+        destination: str,
+            The target destination.
+        """
+        extract_tar_stream(read_blocks(source), destination, self.decompressor_factory())
+
+    def _open_tar(self, source: str) -> tarfile.TarFile:
+        """Return the tar within the given source, opened in stream mode."""
+        decompressor = StreamDecompressor(self.decompressor_factory())
+        blocks = (decompressor.decompress(data) for data in read_blocks(source))
+        return tarfile.open(fileobj=BlocksReader(blocks), mode="r|")
+
+    def _index(self, source: str) -> List[Dict]:
+        """Return the entries of the members of the given archive.
+
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+        """
+        with self._open_tar(source) as tar:
+            return tar_index(tar)
+
+    def _extract_members(self, source: str, destination: str, members: List[Dict]):
+        """Extract the given members of the source to the given destination.
+
+        The compressed archive cannot be sought, so it is decompressed
+        up to the last of the given members.
+
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+        destination: str,
+            The target directory.
+        members: List[Dict],
+            The entries of the archive index of the members to extract.
+        """
+        with self._open_tar(source) as tar:
+            extract_tar_members(tar, destination, members)
+
+
+class TarxzExtractor(CompressedTarExtractor):
+    """Extractor for tar files compressed with xz."""
+
+    def __init__(
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        fsync: bool = False,
+    ):
+        """Create new TarxzExtractor object.
+
+        Parameters
+        -------------------
+        cache: bool = True,
+            Whether to skip extraction when file is already available.
+        delete_original_after_extraction: bool = True,
+            Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
+        """
+        super().__init__(
+            extension=[".tar.xz", ".txz"],
+            file_format="tarxz",
+            cache=cache,
+            delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
+        )
+
+    def decompressor_factory(self) -> Callable:
+        """Return the factory of the incremental decompressors of this format."""
+        return lzma.LZMADecompressor
+
+
+class Tarbz2Extractor(CompressedTarExtractor):
+    """Extractor for tar files compressed with bzip2."""
+
+    def __init__(
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        fsync: bool = False,
+    ):
+        """Create new Tarbz2Extractor object.
+
+        Parameters
+        -------------------
+        cache: bool = True,
+            Whether to skip extraction when file is already available.
+        delete_original_after_extraction: bool = True,
+            Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
+        """
+        super().__init__(
+            extension=[".tar.bz2", ".tbz2"],
+            file_format="tarbz2",
+            cache=cache,
+            delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
+        )
+
+    def decompressor_factory(self) -> Callable:
+        """Return the factory of the incremental decompressors of this format."""
+        return bz2.BZ2Decompressor
+
+
+class TarzstExtractor(CompressedTarExtractor):
+    """Extractor for tar files compressed with Zstandard, requiring zstandard."""
+
+    REQUIRED_MODULE = "zstandard"
+
+    def __init__(
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        fsync: bool = False,
+    ):
+        """Create new TarzstExtractor object.
+
+        Parameters
+        -------------------
+        cache: bool = True,
+            Whether to skip extraction when file is already available.
+        delete_original_after_extraction: bool = True,
+            Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
+        """
+        super().__init__(
+            extension=[".tar.zst", ".tzst"],
+            file_format="tarzst",
+            cache=cache,
+            delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
+        )
+
+    def decompressor_factory(self) -> Callable:
+        """Return the factory of the incremental decompressors of this format."""
+        return zstd_decompressor
+
+
+class Tarlz4Extractor(CompressedTarExtractor):
+    """Extractor for tar files compressed with LZ4, requiring lz4."""
+
+    REQUIRED_MODULE = "lz4"
+
+    def __init__(
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        fsync: bool = False,
+    ):
+        """Create new Tarlz4Extractor object.
+
+        Parameters
+        -------------------
+        cache: bool = True,
+            Whether to skip extraction when file is already available.
+        delete_original_after_extraction: bool = True,
+            Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
+        """
+        super().__init__(
+            extension=".tar.lz4",
+            file_format="tarlz4",
+            cache=cache,
+            delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
+        )
+
+    def decompressor_factory(self) -> Callable:
+        """Return the factory of the incremental decompressors of this format."""
+        return lz4_decompressor
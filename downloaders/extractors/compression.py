@@ -0,0 +1,85 @@
+"""Submodule providing the decompressors of the formats requiring optional dependencies."""
+import importlib.util
+import io
+from typing import Any
+
+
+def is_available(module: str) -> bool:
+    """Return whether the given module can be imported, without importing it."""
+    return importlib.util.find_spec(module) is not None
+
+
+def zstd_decompressor() -> Any:
+    """Return a new incremental decompressor of a Zstandard frame.
+
+    Raises
+    -------------------
+    ImportError,
+        If zstandard is not installed.
+    """
+    try:
+        import zstandard
+    except ImportError as import_exception:
+        raise ImportError(
+            "Extracting Zstandard files requires zstandard, which can be "
+            "installed by running `pip install downloaders[zstd]`."
+        ) from import_exception
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+def lz4_decompressor() -> Any:
+    """Return a new incremental decompressor of a LZ4 frame.
+
+    Raises
+    -------------------
+    ImportError,
+        If lz4 is not installed.
+    """
+    try:
+        import lz4.frame
+    except ImportError as import_exception:
+        raise ImportError(
+            "Extracting LZ4 files requires lz4, which can be "
+            "installed by running `pip install downloaders[lz4]`."
+        ) from import_exception
+    return lz4.frame.LZ4FrameDecompressor()
+
+
+def zstd_head(header: bytes, size: int) -> bytes:
+    """Return up to the given number of bytes decompressed from the given Zstandard header.
+
+    Only the requested bytes are decompressed, so that a highly compressed
+    header does not expand in memory. No bytes are returned when zstandard
+    is not installed or the header cannot be decompressed.
+    """
+    if not is_available("zstandard"):
+        return b""
+    import zstandard
+
+    head = b""
+    try:
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(header)) as reader:
+            while len(head) < size:
+                block = reader.read(size - len(head))
+                if not block:
+                    break
+                head += block
+    except zstandard.ZstdError:
+        pass
+    return head
+
+
+def lz4_head(header: bytes, size: int) -> bytes:
+    """Return up to the given number of bytes decompressed from the given LZ4 header.
+
+    No bytes are returned when lz4 is not installed or the header cannot
+    be decompressed.
+    """
+    if not is_available("lz4"):
+        return b""
+    import lz4.frame
+
+    try:
+        return lz4.frame.LZ4FrameDecompressor().decompress(header, size)
+    except RuntimeError:
+        return b""
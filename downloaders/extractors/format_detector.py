@@ -0,0 +1,182 @@
+"""Submodule providing the memoized detection of the archive formats."""
+import bz2
+import lzma
+import os
+import zipfile
+import zlib
+from functools import lru_cache
+from typing import Optional
+
+from .compression import lz4_head, zstd_head
+
+# Number of bytes read from the head of each file.
+HEADER_SIZE = 4096
+
+# Extensions of the supported formats, with the compound ones first.
+EXTENSIONS = (
+    (".tar.gz", "targz"),
+    (".tgz", "targz"),
+    (".tar.xz", "tarxz"),
+    (".txz", "tarxz"),
+    (".tar.bz2", "tarbz2"),
+    (".tbz2", "tarbz2"),
+    (".tar.zst", "tarzst"),
+    (".tzst", "tarzst"),
+    (".tar.lz4", "tarlz4"),
+    (".tar", "tar"),
+    (".gz", "gzip"),
+    (".xz", "xz"),
+    (".bz2", "bz2"),
+    (".zip", "zip"),
+    (".zst", "zstd"),
+    (".lz4", "lz4"),
+)
+
+MAGIC_NUMBERS = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"BZh", "bz2"),
+    (b"PK\x03\x04", "zip"),
+    (b"PK\x05\x06", "zip"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+    (b"\x04\x22\x4d\x18", "lz4"),
+)
+
+# Functions decompressing up to the given number of bytes of the formats
+# whose first bytes can be decoded from the header alone, so as to
+# recognize the compressed tar archives. Bzip2 is missing as it only
+# emits data once a whole block is read.
+HEADER_DECOMPRESSORS = {
+    "gzip": (lambda header, size: zlib.decompressobj(wbits=31).decompress(header, size), "targz"),
+    "xz": (lambda header, size: lzma.LZMADecompressor().decompress(header, size), "tarxz"),
+    "zstd": (zstd_head, "tarzst"),
+    "lz4": (lz4_head, "tarlz4"),
+}
+
+# Compressions of the compressed tar archives, whose extension refines the
+# format detected from the header when the tar header cannot be decoded,
+# as for bzip2 or when the optional dependencies are missing.
+TAR_COMPRESSIONS = {
+    "targz": "gzip",
+    "tarxz": "xz",
+    "tarbz2": "bz2",
+    "tarzst": "zstd",
+    "tarlz4": "lz4",
+}
+
+
+def is_tar_header(block: bytes) -> bool:
+    """Return whether the given block starts with a tar header.
+
+    Parameters
+    --------------------
+    block: bytes,
+        The first bytes of the, possibly decompressed, file.
+
+    Returns
+    --------------------
+    Boolean value representing if the block starts with a POSIX tar
+    header, or with a pre-POSIX one with a valid checksum.
+    """
+    if len(block) < 512:
+        return False
+    if block[257:262] == b"ustar":
+        return True
+    try:
+        checksum = int(block[148:156].rstrip(b"\x00 ").decode("ascii"), 8)
+    except ValueError:
+        return False
+    return checksum == sum(block[:148]) + 8 * 32 + sum(block[156:512])
+
+
+def sniff_header(header: bytes) -> Optional[str]:
+    """Return the format of the file starting with the given header.
+
+    Parameters
+    --------------------
+    header: bytes,
+        The first bytes of the file.
+
+    Returns
+    --------------------
+    The name of the format, or None if it is not recognized.
+    """
+    for magic, file_format in MAGIC_NUMBERS:
+        if header.startswith(magic):
+            if file_format in HEADER_DECOMPRESSORS:
+                head, tar_format = HEADER_DECOMPRESSORS[file_format]
+                try:
+                    if is_tar_header(head(header, 512)):
+                        return tar_format
+                except (zlib.error, lzma.LZMAError, EOFError):
+                    pass
+            return file_format
+    if is_tar_header(header):
+        return "tar"
+    return None
+
+
+@lru_cache(maxsize=4096)
+def sniff_file(path: str, size: int, mtime: int) -> Optional[str]:
+    """Return the format of the given file, memoized by its size and mtime.
+
+    Parameters
+    --------------------
+    path: str,
+        The absolute path of the file.
+    size: int,
+        The size of the file, part of the memoization key.
+    mtime: int,
+        The modification time of the file in nanoseconds, part of the memoization key.
+
+    Returns
+    --------------------
+    The name of the format, or None if it is not recognized.
+    """
+    with open(path, "rb") as f:
+        file_format = sniff_header(f.read(HEADER_SIZE))
+    # The zip archives are read from their end, so that the ones preceded
+    # by other data, such as the self-extracting ones, are recognized.
+    if file_format is None and zipfile.is_zipfile(path):
+        return "zip"
+    return file_format
+
+
+def detect_format(source: str) -> Optional[str]:
+    """Return the format of the given file.
+
+    Parameters
+    --------------------
+    source: str,
+        The path of the file, which may not have been downloaded yet.
+
+    Returns
+    --------------------
+    The name of the format, such as "gzip", "targz", "xz", "tarxz", "bz2",
+    "tarbz2", "zip", "tar", "zstd", "tarzst", "lz4" or "tarlz4", or None
+    if it is not recognized.
+
+    Implementative details
+    --------------------
+    The files on disk are classified from a single header read, whose
+    result is memoized by path, size and modification time, so that
+    repeated queries cost a stat call. The extension only recognizes the
+    files which are yet to be downloaded or whose header is not recognized,
+    such as the corrupted ones, and the compressed tar archives whose tar
+    header cannot be decoded from the compressed header.
+    """
+    extension_format = None
+    for extension, file_format in EXTENSIONS:
+        if source.endswith(extension):
+            extension_format = file_format
+            break
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return extension_format
+    if not os.path.isfile(source):
+        return None
+    file_format = sniff_file(os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+    if file_format is None or TAR_COMPRESSIONS.get(extension_format) == file_format:
+        return extension_format
+    return file_format
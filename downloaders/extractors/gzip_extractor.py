@@ -1,7 +1,10 @@
 import tarfile
 import gzip
 import shutil
+import zlib
+from typing import BinaryIO, Callable, Dict, Iterator, List
 from .base_extractor import BaseExtractor
+from .random_access import gzip_checkpoints, read_gzip_checkpoint
 from .utils import is_gzip, is_targz
 
 
@@ -9,7 +12,10 @@ class GzipExtractor(BaseExtractor):
     """Extractor for Gzip files."""
 
     def __init__(
-        self, cache: bool = True, delete_original_after_extraction: bool = True
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        fsync: bool = False,
     ):
         """Create new GzipExtractor object.
 
@@ -19,11 +25,15 @@ class GzipExtractor(BaseExtractor):
             Whether to skip extraction when file is already available.
         delete_original_after_extraction: bool = True,
             Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
         """
         super().__init__(
             extension=".gz",
             cache=cache,
             delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
         )
 
     def can_extract(self, source: str) -> bool:
@@ -40,6 +50,11 @@ class GzipExtractor(BaseExtractor):
         """
         return is_gzip(source) and not is_targz(source)
 
+    def decompressor_factory(self) -> Callable:
+        """Return the factory of the incremental decompressors of this format."""
+        # With 31 window bits, zlib expects the gzip header and trailer.
+        return lambda: zlib.decompressobj(wbits=31)
+
     def _extract(self, source: str, destination: str):
         """Extract the given source to the given destination.
 
@@ -53,3 +68,25 @@ class GzipExtractor(BaseExtractor):
         with gzip.open(source, "rb") as f_in:
             with open(destination, "wb") as f_out:
                 shutil.copyfileobj(f_in, f_out)
+
+    def _checkpoints(self, source: str) -> List[Dict]:
+        """Return the checkpoints at the start of its members.
+
+        Parameters
+        ------------------
+        source: str,
+            The source file.
+        """
+        return gzip_checkpoints(source)
+
+    def _read_checkpoint(self, handle: BinaryIO, checkpoint: Dict) -> Iterator[bytes]:
+        """Yield the decompressed blocks of the file from the given checkpoint.
+
+        Parameters
+        ------------------
+        handle: BinaryIO,
+            The source file opened in binary mode.
+        checkpoint: Dict,
+            The checkpoint from which to decompress the file.
+        """
+        return read_gzip_checkpoint(handle, checkpoint)
@@ -0,0 +1,66 @@
+"""Submodule providing operator for extracting LZ4 files."""
+from typing import Callable
+from .base_extractor import BaseExtractor
+from .compression import is_available, lz4_decompressor
+from .format_detector import detect_format
+from .streaming import decompress_file
+
+
+class LZ4Extractor(BaseExtractor):
+    """Extractor for LZ4 files, requiring lz4."""
+
+    def __init__(
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        fsync: bool = False,
+    ):
+        """Create new LZ4Extractor object.
+
+        Parameters
+        -------------------
+        cache: bool = True,
+            Whether to skip extraction when file is already available.
+        delete_original_after_extraction: bool = True,
+            Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
+        """
+        super().__init__(
+            extension=".lz4",
+            cache=cache,
+            delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
+        )
+
+    def can_extract(self, source: str) -> bool:
+        """Return Whether this extractor can extract or not the given file.
+
+        Parameters
+        --------------------
+        source: str,
+            The source path to test if it can be extracted.
+
+        Returns
+        --------------------
+        Boolean value representing if the file can be extracted, which is
+        False when lz4 is not installed, so that the file is kept as it is.
+        """
+        return detect_format(source) == "lz4" and is_available("lz4")
+
+    def decompressor_factory(self) -> Callable:
+        """Return the factory of the incremental decompressors of this format."""
+        return lz4_decompressor
+
+    def _extract(self, source: str, destination: str):
+        """Extract the given source to the given destination.
+
+        Parameters
+        ------------------
+        source: str,
+            The source file.
+        destination: str,
+            The target destination.
+        """
+        decompress_file(lz4_decompressor, source, destination)
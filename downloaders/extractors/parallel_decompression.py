@@ -0,0 +1,197 @@
+"""Submodule providing the parallel decompression of the bzip2 and xz files.
+
+The blocks of both formats are compressed independently, so that they are
+decompressed by a pool of processes and written to the destination in
+their order. The files made of a single block are left to the serial path.
+"""
+import lzma
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from .random_access import (
+    bz2_boundaries,
+    decompress_bz2_block,
+    find_bz2_block,
+    read_xz_checkpoint,
+    xz_checkpoints,
+)
+
+# Minimum number of decompressed bytes of the consecutive xz blocks
+# decompressed by each task, so that the tasks are not dominated by the
+# transfer of their results between the processes.
+PARALLEL_SPAN = 16 * 1024 * 1024
+
+# Maximum number of bits between two consecutive bzip2 blocks, which are
+# separated by the end of a stream, its checksum, its padding and the
+# header of the next stream.
+BZ2_MAXIMUM_GAP = 128
+
+
+def ordered_results(
+    executor: Executor, function: Callable, arguments: Iterable[Tuple], window: int
+) -> Iterator[Tuple[Tuple, object]]:
+    """Yield the results of the function in the order of the given arguments.
+
+    Parameters
+    --------------------
+    executor: Executor,
+        The executor running the function.
+    function: Callable,
+        The function to run.
+    arguments: Iterable[Tuple],
+        The arguments of each call of the function.
+    window: int,
+        The maximum number of pending calls, which bounds the number of
+        results held in memory.
+
+    Returns
+    --------------------
+    Iterator of the arguments of each call and its result.
+    """
+    pending = deque()
+    for call in arguments:
+        pending.append((call, executor.submit(function, *call)))
+        if len(pending) >= window:
+            call, future = pending.popleft()
+            yield call, future.result()
+    while pending:
+        call, future = pending.popleft()
+        yield call, future.result()
+
+
+def decompress_xz_span(source: str, checkpoint: Dict) -> bytes:
+    """Return the decompressed blocks of the xz file from the given checkpoint."""
+    with open(source, "rb") as handle:
+        return b"".join(read_xz_checkpoint(handle, checkpoint))
+
+
+def decompress_bz2_span(source: str, start: int, end: int) -> Optional[bytes]:
+    """Return the decompressed block of the bzip2 file between the given bit offsets.
+
+    Returns
+    --------------------
+    The content of the block, which is empty if the end is a magic number
+    appearing by chance within the block, or None if the start is.
+    """
+    with open(source, "rb") as handle:
+        try:
+            return decompress_bz2_block(handle, start, end)
+        except OSError:
+            return None
+
+
+def parallel_xz_decompress(source: str, destination: str, processes: int) -> bool:
+    """Decompress the blocks of the given xz file across the given processes.
+
+    Parameters
+    --------------------
+    source: str,
+        The path of the xz file.
+    destination: str,
+        The path where to write the decompressed file.
+    processes: int,
+        The number of processes decompressing the blocks.
+
+    Raises
+    --------------------
+    EOFError,
+        If a block is shorter than its size in the index of the file.
+
+    Returns
+    --------------------
+    Whether the file was decompressed, which is False when it is made of a
+    single block or its index cannot be read, as it may be truncated, so
+    that it is left to the serial decompression.
+    """
+    try:
+        checkpoints = xz_checkpoints(source, PARALLEL_SPAN)
+    except (lzma.LZMAError, IndexError):
+        return False
+    if len(checkpoints) < 2:
+        return False
+    with ProcessPoolExecutor(processes) as executor, open(destination, "wb") as f:
+        for (_, checkpoint), content in ordered_results(
+            executor,
+            decompress_xz_span,
+            ((source, checkpoint) for checkpoint in checkpoints),
+            2 * processes,
+        ):
+            if len(content) != checkpoint["size"]:
+                raise EOFError(
+                    "Compressed file ended before its indexed size was reached."
+                )
+            f.write(content)
+    return True
+
+
+def parallel_bz2_decompress(source: str, destination: str, processes: int) -> bool:
+    """Decompress the blocks of the given bzip2 file across the given processes.
+
+    The blocks are decompressed between each pair of consecutive candidate
+    boundaries, and the rare candidates that are magic numbers appearing
+    by chance within the compressed data are then resolved serially.
+
+    Parameters
+    --------------------
+    source: str,
+        The path of the bzip2 file.
+    destination: str,
+        The path where to write the decompressed file.
+    processes: int,
+        The number of processes decompressing the blocks.
+
+    Raises
+    --------------------
+    EOFError,
+        If the file ended before the end of its last stream.
+    OSError,
+        If a block is corrupted.
+
+    Returns
+    --------------------
+    Whether the file was decompressed, which is False when it is made of a
+    single block, so that it is left to the serial decompression.
+    """
+    starts, boundaries = bz2_boundaries(source)
+    if len(starts) < 2:
+        return False
+    if not boundaries or boundaries[-1] in starts:
+        raise EOFError(
+            "Compressed file ended before the end-of-stream marker was reached."
+        )
+    positions = {boundary: index for index, boundary in enumerate(boundaries)}
+    # Offset in bits of the end of the last decompressed block.
+    decompressed = 0
+    with ProcessPoolExecutor(processes) as executor, open(
+        destination, "wb"
+    ) as f, open(source, "rb") as handle:
+        for (_, start, _), content in ordered_results(
+            executor,
+            decompress_bz2_span,
+            (
+                (source, boundaries[index], boundaries[index + 1])
+                for index in range(len(boundaries) - 1)
+                if boundaries[index] in starts
+            ),
+            2 * processes,
+        ):
+            # The starts within the decompressed blocks, and the ones from
+            # which no block is decompressed, appear by chance.
+            if start < decompressed or content is None:
+                continue
+            if start - decompressed > BZ2_MAXIMUM_GAP:
+                raise OSError("Invalid data stream")
+            index = positions[start]
+            if content:
+                following = index + 1
+            else:
+                following, content = find_bz2_block(
+                    handle, boundaries, index, index + 2
+                )
+                if content is None:
+                    continue
+            decompressed = boundaries[following]
+            f.write(content)
+    if boundaries[-1] - decompressed > BZ2_MAXIMUM_GAP:
+        raise OSError("Invalid data stream")
+    return True
@@ -0,0 +1,541 @@
+"""Submodule providing random access to the content of compressed files.
+
+The compressed files are read through an index of checkpoints, each being
+a position of the compressed file from which a new decompressor can start,
+so that reading at any position only decompresses from the checkpoint
+preceding it instead of from the start of the file. The checkpoints are:
+
+* the members of the gzip files, such as the ones written by bgzip;
+* the blocks of the xz files, such as the ones written by `xz -T0`;
+* the blocks of the bzip2 files, which start at any bit of the file.
+
+The Python bindings of zlib cannot resume a deflate stream from within,
+so the random reads of a gzip file made of a single member decompress it
+from the start.
+"""
+import bz2
+import io
+import lzma
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from .streaming import StreamDecompressor, read_blocks
+
+# Suffix of the sidecar files caching the checkpoints of the compressed files.
+CHECKPOINTS_SUFFIX = ".checkpoints.json"
+
+# Minimum number of decompressed bytes between two consecutive checkpoints,
+# so that the index of files made of many small members remains small.
+CHECKPOINT_SPACING = 1024 * 1024
+
+XZ_HEADER_MAGIC = b"\xfd7zXZ\x00"
+XZ_FOOTER_MAGIC = b"YZ"
+XZ_HEADER_SIZE = 12
+BZ2_BLOCK_MAGIC = 0x314159265359
+BZ2_END_OF_STREAM_MAGIC = 0x177245385090
+BZ2_MAGIC_BITS = 48
+# Header of the bzip2 streams wrapping each block, with the largest block size.
+BZ2_STREAM_HEADER = b"BZh9"
+
+
+def bounded(blocks: Iterator[bytes], size: int) -> Iterator[bytes]:
+    """Yield the given blocks up to the given total number of bytes."""
+    for block in blocks:
+        if size <= 0:
+            return
+        yield block[:size]
+        size -= len(block)
+
+
+def gzip_checkpoints(path: str, spacing: int = CHECKPOINT_SPACING) -> List[Dict]:
+    """Return the checkpoints at the start of the members of the given gzip file.
+
+    Parameters
+    --------------------
+    path: str,
+        The path of the gzip file.
+    spacing: int = CHECKPOINT_SPACING,
+        The minimum number of decompressed bytes between two checkpoints.
+
+    Raises
+    --------------------
+    EOFError,
+        If the file ended before the end of its last member.
+
+    Returns
+    --------------------
+    List with the compressed and decompressed offsets and sizes of the
+    spans of the file starting at each checkpoint.
+    """
+    checkpoints = []
+    decompressor = zlib.decompressobj(wbits=31)
+    fed = False
+    consumed = produced = 0
+    offset = start = 0
+    for data in read_blocks(path):
+        while data:
+            fed = True
+            produced += len(decompressor.decompress(data))
+            if not decompressor.eof:
+                consumed += len(data)
+                break
+            consumed += len(data) - len(decompressor.unused_data)
+            data = decompressor.unused_data
+            decompressor = zlib.decompressobj(wbits=31)
+            fed = False
+            if produced - start >= spacing:
+                checkpoints.append(
+                    dict(
+                        offset=offset, end=consumed, start=start, size=produced - start
+                    )
+                )
+                offset, start = consumed, produced
+    if fed:
+        raise EOFError(
+            "Compressed file ended before the end-of-stream marker was reached."
+        )
+    if produced > start or not checkpoints:
+        checkpoints.append(
+            dict(offset=offset, end=consumed, start=start, size=produced - start)
+        )
+    return checkpoints
+
+
+def read_gzip_checkpoint(handle: BinaryIO, checkpoint: Dict) -> Iterator[bytes]:
+    """Yield the decompressed blocks of the gzip file from the given checkpoint."""
+    handle.seek(checkpoint["offset"])
+    decompressor = StreamDecompressor(lambda: zlib.decompressobj(wbits=31))
+    remaining = checkpoint["end"] - checkpoint["offset"]
+
+    def blocks():
+        nonlocal remaining
+        while remaining:
+            data = handle.read(min(remaining, 1024 * 1024))
+            if not data:
+                return
+            remaining -= len(data)
+            yield decompressor.decompress(data)
+
+    return bounded(blocks(), checkpoint["size"])
+
+
+def read_multibyte_integer(buffer: bytes, position: int) -> Tuple[int, int]:
+    """Return the xz variable length integer at the given position and its end."""
+    value = 0
+    for shift in range(0, 63, 7):
+        byte = buffer[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+    raise lzma.LZMAError("Invalid xz index.")
+
+
+def xz_checkpoints(path: str, spacing: int = CHECKPOINT_SPACING) -> List[Dict]:
+    """Return the checkpoints at the start of the blocks of the given xz file.
+
+    The blocks are read from the indices at the end of the streams of the
+    file, so that the file is not decompressed.
+
+    Parameters
+    --------------------
+    path: str,
+        The path of the xz file.
+    spacing: int = CHECKPOINT_SPACING,
+        The minimum number of decompressed bytes between two checkpoints.
+
+    Raises
+    --------------------
+    lzma.LZMAError,
+        If the indices of the file are corrupted.
+
+    Returns
+    --------------------
+    List with the compressed and decompressed offsets and sizes of the
+    spans of the file starting at each checkpoint.
+    """
+    streams = []
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        # The streams are read from the last one, as the index of each
+        # stream is found from the footer at its end.
+        while end > 0:
+            f.seek(end - 4)
+            if f.read(4) == b"\x00" * 4:
+                # The streams may be followed by padding.
+                end -= 4
+                continue
+            f.seek(end - XZ_HEADER_SIZE)
+            footer = f.read(XZ_HEADER_SIZE)
+            if footer[-2:] != XZ_FOOTER_MAGIC:
+                raise lzma.LZMAError("Invalid xz stream footer.")
+            index_size = (struct.unpack("<I", footer[4:8])[0] + 1) * 4
+            f.seek(end - XZ_HEADER_SIZE - index_size)
+            index = f.read(index_size)
+            if index[0] != 0:
+                raise lzma.LZMAError("Invalid xz index.")
+            records, position = read_multibyte_integer(index, 1)
+            blocks = []
+            for _ in range(records):
+                unpadded_size, position = read_multibyte_integer(index, position)
+                size, position = read_multibyte_integer(index, position)
+                blocks.append(((unpadded_size + 3) // 4 * 4, size))
+            header = end - XZ_HEADER_SIZE - index_size - sum(b[0] for b in blocks)
+            header -= XZ_HEADER_SIZE
+            if header < 0:
+                raise lzma.LZMAError("Invalid xz stream header.")
+            f.seek(header)
+            if f.read(len(XZ_HEADER_MAGIC)) != XZ_HEADER_MAGIC:
+                raise lzma.LZMAError("Invalid xz stream header.")
+            streams.append((header, blocks))
+            end = header
+    checkpoints = []
+    start = 0
+    for header, blocks in reversed(streams):
+        offset = header + XZ_HEADER_SIZE
+        for compressed_size, size in blocks:
+            # Consecutive blocks of the same stream are decompressed together,
+            # so that they are merged into the span of the previous checkpoint.
+            previous = checkpoints[-1] if checkpoints else None
+            if (
+                previous is not None
+                and previous["header"] == header
+                and previous["size"] < spacing
+            ):
+                previous["end"] += compressed_size
+                previous["size"] += size
+            else:
+                checkpoints.append(
+                    dict(
+                        header=header,
+                        offset=offset,
+                        end=offset + compressed_size,
+                        start=start,
+                        size=size,
+                    )
+                )
+            offset += compressed_size
+            start += size
+    return checkpoints
+
+
+def read_xz_checkpoint(handle: BinaryIO, checkpoint: Dict) -> Iterator[bytes]:
+    """Yield the decompressed blocks of the xz file from the given checkpoint."""
+    handle.seek(checkpoint["header"])
+    decompressor = lzma.LZMADecompressor()
+    # The blocks are decompressed as the continuation of the header of their stream.
+    decompressor.decompress(handle.read(XZ_HEADER_SIZE))
+    handle.seek(checkpoint["offset"])
+    remaining = checkpoint["end"] - checkpoint["offset"]
+
+    def blocks():
+        nonlocal remaining
+        while remaining:
+            data = handle.read(min(remaining, 1024 * 1024))
+            if not data:
+                return
+            remaining -= len(data)
+            yield decompressor.decompress(data)
+
+    return bounded(blocks(), checkpoint["size"])
+
+
+def find_bit_pattern(data: bytes, pattern: int, bits: int) -> List[int]:
+    """Return the sorted bit offsets of the given pattern within the given data.
+
+    Parameters
+    --------------------
+    data: bytes,
+        The data to search.
+    pattern: int,
+        The pattern to find, as an integer of the given number of bits.
+    bits: int,
+        The number of bits of the pattern, which must be a multiple of 8
+        of at least 16 bits.
+
+    Returns
+    --------------------
+    The offsets, in bits from the start of the data, of the occurrences
+    of the pattern starting at any bit.
+    """
+    size = bits // 8 + 1
+    offsets = []
+    for shift in range(8):
+        window = (pattern << (8 - shift)).to_bytes(size, "big")
+        # The first and last bytes of the window are partially made of the
+        # surrounding bits, so the occurrences are found from the inner ones.
+        inner = window[1:-1]
+        position = data.find(inner, 1)
+        while position != -1:
+            candidate = int.from_bytes(data[position - 1 : position - 1 + size], "big")
+            if (
+                len(data) >= position - 1 + size
+                and candidate >> (8 - shift) & ((1 << bits) - 1) == pattern
+            ):
+                offsets.append((position - 1) * 8 + shift)
+            position = data.find(inner, position + 1)
+    return sorted(offsets)
+
+
+def read_bit_span(handle: BinaryIO, start: int, end: int) -> bytes:
+    """Return the bits of the file between the given bit offsets, aligned to a byte."""
+    handle.seek(start // 8)
+    data = handle.read((end + 7) // 8 - start // 8)
+    value = int.from_bytes(data, "big") << (start % 8)
+    return (value & ((1 << (len(data) * 8)) - 1)).to_bytes(len(data), "big")
+
+
+def decompress_bz2_block(handle: BinaryIO, start: int, end: int) -> bytes:
+    """Return the decompressed block of the bzip2 file between the given bit offsets.
+
+    The block is decompressed as the only block of a new stream, and it is
+    followed by the magic number after it, as the decompressor only emits
+    the end of a block once it reads the header of the following one.
+    """
+    decompressor = bz2.BZ2Decompressor()
+    return decompressor.decompress(
+        BZ2_STREAM_HEADER + read_bit_span(handle, start, end + BZ2_MAGIC_BITS)
+    )
+
+
+def bz2_boundaries(path: str) -> Tuple[Set[int], List[int]]:
+    """Return the candidate boundaries of the blocks of the given bzip2 file.
+
+    The blocks are found from their magic numbers, which may also appear
+    by chance within the compressed data, so that the boundaries are only
+    candidates until the blocks between them are decompressed.
+
+    Parameters
+    --------------------
+    path: str,
+        The path of the bzip2 file.
+
+    Returns
+    --------------------
+    Tuple with the bit offsets of the magic numbers of the blocks, and the
+    sorted bit offsets of the magic numbers of both the blocks and the ends
+    of the streams.
+    """
+    overlap = BZ2_MAGIC_BITS // 8 + 1
+    starts, ends = set(), set()
+    position = 0
+    previous = b""
+    for data in read_blocks(path, 16 * 1024 * 1024):
+        data = previous + data
+        offset = (position - len(previous)) * 8
+        for magic, found in (
+            (BZ2_BLOCK_MAGIC, starts),
+            (BZ2_END_OF_STREAM_MAGIC, ends),
+        ):
+            found.update(
+                offset + bit for bit in find_bit_pattern(data, magic, BZ2_MAGIC_BITS)
+            )
+        position += len(data) - len(previous)
+        previous = data[-overlap:]
+    return starts, sorted(starts | ends)
+
+
+def bz2_checkpoints(path: str) -> List[Dict]:
+    """Return the checkpoints at the start of the blocks of the given bzip2 file.
+
+    Each block is validated by decompressing it once, as the magic numbers
+    may also appear by chance within the compressed data.
+
+    Parameters
+    --------------------
+    path: str,
+        The path of the bzip2 file.
+
+    Returns
+    --------------------
+    List with the compressed and decompressed offsets and sizes of the
+    spans of the file starting at each checkpoint, with the compressed
+    offsets in bits.
+    """
+    starts, boundaries = bz2_boundaries(path)
+    checkpoints = []
+    uncompressed = 0
+    index = 0
+    with open(path, "rb") as f:
+        while index < len(boundaries):
+            start = boundaries[index]
+            if start not in starts:
+                index += 1
+                continue
+            following, block = find_bz2_block(f, boundaries, index)
+            if block is None:
+                index += 1
+                continue
+            checkpoints.append(
+                dict(
+                    offset=start,
+                    end=boundaries[following],
+                    start=uncompressed,
+                    size=len(block),
+                )
+            )
+            uncompressed += len(block)
+            index = following
+    return checkpoints
+
+
+def find_bz2_block(
+    handle: BinaryIO, boundaries: List[int], index: int, following: Optional[int] = None
+) -> Tuple[int, Optional[bytes]]:
+    """Return the end and the content of the block starting at the given boundary.
+
+    The end of the block is the first following boundary from which the
+    block is decompressed, as the boundaries in between are magic numbers
+    appearing by chance within the block.
+
+    Parameters
+    --------------------
+    handle: BinaryIO,
+        The bzip2 file opened in binary mode.
+    boundaries: List[int],
+        The sorted candidate boundaries of the blocks.
+    index: int,
+        The index of the boundary where the block starts.
+    following: Optional[int] = None,
+        The index of the first boundary to try as the end of the block.
+        By default, the boundary following the start.
+
+    Returns
+    --------------------
+    Tuple with the index of the boundary ending the block, and its content,
+    which is None if the start is a magic number appearing by chance.
+    """
+    following = index + 1 if following is None else following
+    while following < len(boundaries):
+        try:
+            block = decompress_bz2_block(
+                handle, boundaries[index], boundaries[following]
+            )
+        except OSError:
+            return following, None
+        if block:
+            return following, block
+        following += 1
+    return following, None
+
+
+def read_bz2_checkpoint(handle: BinaryIO, checkpoint: Dict) -> Iterator[bytes]:
+    """Yield the decompressed block of the bzip2 file from the given checkpoint."""
+    yield decompress_bz2_block(handle, checkpoint["offset"], checkpoint["end"])
+
+
+class CheckpointReader(io.RawIOBase):
+    """Seekable reader of the decompressed content of a file with checkpoints."""
+
+    def __init__(
+        self,
+        source: str,
+        checkpoints: List[Dict],
+        read_checkpoint: Callable[[BinaryIO, Dict], Iterator[bytes]],
+    ):
+        """Create new CheckpointReader object.
+
+        Parameters
+        -------------------
+        source: str,
+            The path of the compressed file.
+        checkpoints: List[Dict],
+            The checkpoints of the file, sorted by their decompressed offset.
+        read_checkpoint: Callable[[BinaryIO, Dict], Iterator[bytes]],
+            Function yielding the decompressed blocks of the span of the
+            file starting at the given checkpoint.
+        """
+        super().__init__()
+        self._handle = open(source, "rb")
+        self._checkpoints = checkpoints
+        self._starts = [checkpoint["start"] for checkpoint in checkpoints]
+        self._size = sum(checkpoint["size"] for checkpoint in checkpoints)
+        self._read_checkpoint = read_checkpoint
+        self._position = 0
+        self._checkpoint = None
+        self._blocks = iter(())
+        self._buffer = b""
+        # Decompressed offset of the start of the buffer.
+        self._buffer_start = 0
+
+    def readable(self) -> bool:
+        """Return whether the reader is readable, which it is."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return whether the reader is seekable, which it is."""
+        return True
+
+    def tell(self) -> int:
+        """Return the current position within the decompressed content."""
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Move to the given position within the decompressed content.
+
+        Parameters
+        -------------------
+        offset: int,
+            The offset to move to.
+        whence: int = os.SEEK_SET,
+            Whether the offset is relative to the start, the current
+            position or the end of the decompressed content.
+
+        Returns
+        -------------------
+        The new position.
+        """
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._size
+        elif whence != os.SEEK_SET:
+            raise ValueError(f"Invalid whence {whence}.")
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}.")
+        self._position = offset
+        return self._position
+
+    def _restart(self, index: int):
+        """Start decompressing from the checkpoint with the given index."""
+        self._checkpoint = index
+        self._blocks = self._read_checkpoint(self._handle, self._checkpoints[index])
+        self._buffer = b""
+        self._buffer_start = self._checkpoints[index]["start"]
+
+    def readinto(self, buffer) -> int:
+        """Read the decompressed bytes at the current position into the given buffer.
+
+        Parameters
+        -------------------
+        buffer: bytearray,
+            The buffer to fill.
+
+        Returns
+        -------------------
+        The number of bytes read, which is zero at the end of the content.
+        """
+        if self._position >= self._size:
+            return 0
+        index = bisect_right(self._starts, self._position) - 1
+        # The decompression restarts from the checkpoint preceding the
+        # position, unless it can continue from the current position.
+        if index != self._checkpoint or self._position < self._buffer_start:
+            self._restart(index)
+        while self._position >= self._buffer_start + len(self._buffer):
+            self._buffer_start += len(self._buffer)
+            self._buffer = next(self._blocks, None)
+            if self._buffer is None:
+                raise EOFError("Compressed file ended before its indexed size.")
+        start = self._position - self._buffer_start
+        size = min(len(buffer), len(self._buffer) - start)
+        buffer[:size] = self._buffer[start : start + size]
+        self._position += size
+        return size
+
+    def close(self):
+        """Close the compressed file."""
+        self._handle.close()
+        super().close()
@@ -0,0 +1,137 @@
+"""Submodule providing the registry of the extractors consulted by the AutoExtractor.
+
+The extractors are consulted in order, and the first one able to extract
+a file is used: first the ones registered with `register_extractor`, then
+the ones exposed by the installed packages under the entry points group
+`downloaders.extractors`, and finally the built-in ones.
+"""
+import warnings
+from typing import List, Optional, Type
+from .base_extractor import BaseExtractor
+from .bz2_extractor import BZ2Extractor
+from .compressed_tar_extractor import (
+    Tarbz2Extractor,
+    Tarlz4Extractor,
+    TarxzExtractor,
+    TarzstExtractor,
+)
+from .gzip_extractor import GzipExtractor
+from .lz4_extractor import LZ4Extractor
+from .tar_extractor import TarExtractor
+from .targz_extractor import TargzExtractor
+from .xz_extractor import XzExtractor
+from .zip_extraction import ZipExtractor
+from .zstd_extractor import ZstdExtractor
+
+ENTRY_POINTS_GROUP = "downloaders.extractors"
+
+# The compressed tar extractors precede the ones of the single compressed
+# files, so that the tar files are extracted in a single step.
+BUILTIN_EXTRACTORS = (
+    TargzExtractor,
+    TarxzExtractor,
+    Tarbz2Extractor,
+    TarzstExtractor,
+    Tarlz4Extractor,
+    TarExtractor,
+    GzipExtractor,
+    XzExtractor,
+    BZ2Extractor,
+    ZstdExtractor,
+    LZ4Extractor,
+    ZipExtractor,
+)
+
+_registered_extractors: List[Type[BaseExtractor]] = []
+_entry_point_extractors: Optional[List[Type[BaseExtractor]]] = None
+
+
+def register_extractor(extractor: Type[BaseExtractor]) -> Type[BaseExtractor]:
+    """Register the given extractor, so that it is consulted by the AutoExtractor.
+
+    The registered extractors are consulted before the built-in ones, most
+    recently registered first, so that they can also override the extraction
+    of the supported formats. The function returns the extractor, so that it
+    can be used as a class decorator.
+
+    Parameters
+    --------------------
+    extractor: Type[BaseExtractor],
+        The class of the extractor, which must accept the keyword arguments
+        `cache`, `delete_original_after_extraction` and `fsync`, and
+        `processes` if it extracts in parallel.
+
+    Raises
+    --------------------
+    ValueError,
+        If the given extractor is not a subclass of BaseExtractor.
+
+    Returns
+    --------------------
+    The given extractor.
+    """
+    if not isinstance(extractor, type) or not issubclass(extractor, BaseExtractor):
+        raise ValueError(
+            f"The extractor must be a subclass of BaseExtractor, but got {extractor!r}."
+        )
+    if extractor not in _registered_extractors:
+        _registered_extractors.insert(0, extractor)
+    return extractor
+
+
+def unregister_extractor(extractor: Type[BaseExtractor]):
+    """Remove the given extractor from the registered ones, if it was registered."""
+    if extractor in _registered_extractors:
+        _registered_extractors.remove(extractor)
+
+
+def entry_point_extractors() -> List[Type[BaseExtractor]]:
+    """Return the extractors exposed by the installed packages.
+
+    The entry points are loaded once, and the ones that cannot be loaded
+    are skipped with a warning, so that a broken plugin does not prevent
+    the extraction of the other formats.
+    """
+    global _entry_point_extractors
+    if _entry_point_extractors is None:
+        try:
+            from importlib import metadata
+        except ImportError:
+            # Python 3.7 has no importlib.metadata, so the backport is used
+            # when installed, and no entry points are discovered otherwise.
+            try:
+                import importlib_metadata as metadata
+            except ImportError:
+                _entry_point_extractors = []
+                return _entry_point_extractors
+
+        entry_points = metadata.entry_points()
+        if hasattr(entry_points, "select"):
+            entry_points = entry_points.select(group=ENTRY_POINTS_GROUP)
+        else:
+            entry_points = entry_points.get(ENTRY_POINTS_GROUP, [])
+        _entry_point_extractors = []
+        for entry_point in entry_points:
+            try:
+                extractor = entry_point.load()
+            except Exception as exception:  # pylint: disable=broad-except
+                warnings.warn(
+                    f"The extractor {entry_point.name} could not be loaded: {exception}"
+                )
+                continue
+            if isinstance(extractor, type) and issubclass(extractor, BaseExtractor):
+                _entry_point_extractors.append(extractor)
+            else:
+                warnings.warn(
+                    f"The extractor {entry_point.name} is not a subclass of BaseExtractor."
+                )
+    return _entry_point_extractors
+
+
+def registered_extractors() -> List[Type[BaseExtractor]]:
+    """Return the extractors in the order in which they are consulted."""
+    return [
+        *_registered_extractors,
+        *entry_point_extractors(),
+        *BUILTIN_EXTRACTORS,
+    ]
@@ -0,0 +1,285 @@
+"""Submodule providing the extraction of archives while they are downloaded."""
+import os
+import tarfile
+from typing import Callable, Dict, Iterator, Optional
+
+from ..utils import commit_path, remove_path, temporary_path
+from .utils import extract_tar_members
+
+
+class StreamDecompressor:
+    """Incremental decompressor supporting streams of concatenated members."""
+
+    def __init__(self, factory: Callable):
+        """Create new StreamDecompressor object.
+
+        Parameters
+        -------------------
+        factory: Callable,
+            Function returning a new decompressor object, such as
+            `zlib.decompressobj`, `lzma.LZMADecompressor` or `bz2.BZ2Decompressor`.
+        """
+        self._factory = factory
+        self._decompressor = factory()
+        self._fed = False
+
+    def decompress(self, data: bytes) -> bytes:
+        """Return the decompressed bytes of the given compressed block.
+
+        Parameters
+        -------------------
+        data: bytes,
+            The next block of the compressed stream.
+
+        Returns
+        -------------------
+        The bytes decompressed so far from the block.
+        """
+        chunks = []
+        while data:
+            self._fed = True
+            chunks.append(self._decompressor.decompress(data))
+            if not self._decompressor.eof:
+                break
+            # Gzip, xz and bzip2 streams may be the concatenation of multiple
+            # members, so a new decompressor continues from the unused data.
+            data = self._decompressor.unused_data
+            self._decompressor = self._factory()
+            self._fed = False
+        return b"".join(chunks)
+
+    def is_complete(self) -> bool:
+        """Return whether the stream decompressed so far ends with a complete member."""
+        return self._decompressor.eof or not self._fed
+
+
+class BlocksReader:
+    """Minimal readable file object over an iterator of blocks."""
+
+    def __init__(self, blocks: Iterator[bytes]):
+        """Create new BlocksReader object.
+
+        Parameters
+        -------------------
+        blocks: Iterator[bytes],
+            The iterator of the blocks to read.
+        """
+        self._blocks = blocks
+        self._buffer = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to the given number of bytes, or all of them if negative."""
+        while size < 0 or len(self._buffer) < size:
+            block = next(self._blocks, None)
+            if block is None:
+                break
+            self._buffer += block
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class StreamingExtraction:
+    """Base class for the extractions fed with the blocks being downloaded."""
+
+    def __init__(self, destination: str, fsync: bool = False):
+        """Create new StreamingExtraction object.
+
+        Parameters
+        -------------------
+        destination: str,
+            The path where to extract the archive. The archive is extracted
+            to a temporary path, which is renamed to the destination once
+            the extraction is complete.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
+        """
+        self._destination = destination
+        self._temporary = temporary_path(destination)
+        self._fsync = fsync
+        directory = os.path.dirname(destination)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def consume(self, blocks: Iterator[bytes]):
+        """Extract the archive from the given blocks, consuming all of them.
+
+        Parameters
+        -------------------
+        blocks: Iterator[bytes],
+            The iterator of the blocks of the archive being downloaded.
+        """
+        raise NotImplementedError(
+            "The method consume must be implemented in child classes."
+        )
+
+    def close(self) -> Dict:
+        """Complete the extraction, returning its metadata.
+
+        Returns
+        -------------------
+        Dictionary with the same metadata returned by `BaseExtractor.extract`.
+        """
+        commit_path(self._temporary, self._destination, fsync=self._fsync)
+        return {
+            "file_size": os.path.getsize(self._destination),
+            "destination": self._destination,
+            "cached": False,
+            "success": True,
+        }
+
+    def abort(self):
+        """Remove the partially extracted file or directory."""
+        remove_path(self._temporary)
+
+
+class StreamingDecompression(StreamingExtraction):
+    """Extraction of a single-file archive fed with the blocks being downloaded."""
+
+    def __init__(self, factory: Callable, destination: str, fsync: bool = False):
+        """Create new StreamingDecompression object.
+
+        Parameters
+        -------------------
+        factory: Callable,
+            Function returning a new decompressor object.
+        destination: str,
+            The path where to write the decompressed file.
+        fsync: bool = False,
+            Whether to flush the decompressed file to disk before it is
+            moved to its destination.
+        """
+        super().__init__(destination, fsync=fsync)
+        self._decompressor = StreamDecompressor(factory)
+        self._file = open(self._temporary, "wb")
+
+    def consume(self, blocks: Iterator[bytes]):
+        """Decompress the given blocks and write them to the destination."""
+        for data in blocks:
+            self._file.write(self._decompressor.decompress(data))
+
+    def close(self) -> Dict:
+        """Complete the extraction, returning its metadata.
+
+        Raises
+        -------------------
+        EOFError,
+            If the compressed stream ended before the end of its last member.
+
+        Returns
+        -------------------
+        Dictionary with the same metadata returned by `BaseExtractor.extract`.
+        """
+        self._file.close()
+        if not self._decompressor.is_complete():
+            raise EOFError(
+                "Compressed file ended before the end-of-stream marker was reached."
+            )
+        return super().close()
+
+    def abort(self):
+        """Close and remove the partially extracted file."""
+        self._file.close()
+        super().abort()
+
+
+def read_blocks(path: str, block_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Yield the blocks of the given file."""
+    with open(path, "rb") as f:
+        yield from iter(lambda: f.read(block_size), b"")
+
+
+def decompress_file(factory: Callable, source: str, destination: str):
+    """Decompress the given file, possibly made of concatenated members.
+
+    Parameters
+    -------------------
+    factory: Callable,
+        Function returning a new decompressor object.
+    source: str,
+        The path of the compressed file.
+    destination: str,
+        The path where to write the decompressed file.
+
+    Raises
+    -------------------
+    EOFError,
+        If the compressed file ended before the end of its last member.
+    """
+    decompressor = StreamDecompressor(factory)
+    with open(destination, "wb") as f:
+        for data in read_blocks(source):
+            f.write(decompressor.decompress(data))
+    if not decompressor.is_complete():
+        raise EOFError(
+            "Compressed file ended before the end-of-stream marker was reached."
+        )
+
+
+def extract_tar_stream(
+    blocks: Iterator[bytes], destination: str, factory: Optional[Callable] = None
+):
+    """Extract the tar archive made of the given blocks, consuming all of them.
+
+    Parameters
+    -------------------
+    blocks: Iterator[bytes],
+        The iterator of the blocks of the archive.
+    destination: str,
+        The directory where to extract the archive.
+    factory: Optional[Callable] = None,
+        Function returning a new decompressor of the stream wrapping the
+        archive. By default, the compression is detected by tarfile, which
+        supports gzip, bzip2 and xz.
+
+    Raises
+    -------------------
+    EOFError,
+        If the compressed stream ended before the end of its last member.
+    """
+    decompressor = None
+    if factory is not None:
+        decompressor = StreamDecompressor(factory)
+        blocks = (decompressor.decompress(data) for data in blocks)
+    with tarfile.open(
+        fileobj=BlocksReader(blocks), mode="r|*" if factory is None else "r|"
+    ) as tar:
+        extract_tar_members(tar, destination)
+    # The blocks following the end-of-archive marker, such as the
+    # padding of the last record, are consumed as well.
+    for _ in blocks:
+        pass
+    if decompressor is not None and not decompressor.is_complete():
+        raise EOFError(
+            "Compressed file ended before the end-of-stream marker was reached."
+        )
+
+
+class StreamingTarExtraction(StreamingExtraction):
+    """Extraction of a possibly compressed tar archive fed with the blocks being downloaded."""
+
+    def __init__(
+        self, destination: str, factory: Optional[Callable] = None, fsync: bool = False
+    ):
+        """Create new StreamingTarExtraction object.
+
+        Parameters
+        -------------------
+        destination: str,
+            The directory where to extract the archive.
+        factory: Optional[Callable] = None,
+            Function returning a new decompressor of the stream wrapping
+            the archive. By default, the compression is detected by tarfile.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
+        """
+        super().__init__(destination, fsync=fsync)
+        self._factory = factory
+
+    def consume(self, blocks: Iterator[bytes]):
+        """Extract each member of the archive as soon as it is downloaded."""
+        extract_tar_stream(blocks, self._temporary, self._factory)
@@ -1,14 +1,20 @@
 """Submodule providing operator for extracting Tar files."""
 import tarfile
+from typing import Dict, List
+from .archive_index import tar_index
 from .base_extractor import BaseExtractor
-from .utils import is_tar
+from .streaming import StreamingExtraction, StreamingTarExtraction
+from .utils import extract_tar_member, extract_tar_members, is_tar
 
 
 class TarExtractor(BaseExtractor):
     """Extractor for Tar files."""
 
     def __init__(
-        self, cache: bool = True, delete_original_after_extraction: bool = True
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        fsync: bool = False,
     ):
         """Create new TargzExtractor object.
 
@@ -18,6 +24,9 @@ class TarExtractor(BaseExtractor):
             Whether to skip extraction when file is already available.
         delete_original_after_extraction: bool = True,
             Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
         """
         super().__init__(
             extension=[
@@ -25,6 +34,7 @@ class TarExtractor(BaseExtractor):
             ],
             cache=cache,
             delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
         )
 
     def can_extract(self, source: str) -> bool:
@@ -41,6 +51,20 @@ class TarExtractor(BaseExtractor):
         """
         return is_tar(source)
 
+    def streaming_extraction(self, destination: str) -> StreamingExtraction:
+        """Return the extraction of the archive fed with the blocks being downloaded.
+
+        Parameters
+        ----------------------
+        destination: str,
+            The directory where to extract the archive.
+
+        Returns
+        ----------------------
+        The streaming extraction, which extracts each member as it arrives.
+        """
+        return StreamingTarExtraction(destination, fsync=self._fsync)
+
     def _extract(self, source: str, destination: str):
         """Extract the given source to the given destination.
 
@@ -52,22 +76,36 @@ class TarExtractor(BaseExtractor):
             The target destination.
         """
         with tarfile.open(source, "r") as tar:
-            import os
-
-            def is_within_directory(directory, target):
-                abs_directory = os.path.abspath(directory)
-                abs_target = os.path.abspath(target)
+            extract_tar_members(tar, destination)
 
-                prefix = os.path.commonprefix([abs_directory, abs_target])
+    def _index(self, source: str) -> List[Dict]:
+        """Return the entries of the members of the given archive.
 
-                return prefix == abs_directory
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+        """
+        with tarfile.open(source, "r:") as tar:
+            return tar_index(tar)
 
-            def safe_extract(tar, path=".", members=None, *, numeric_owner=False):
-                for member in tar.getmembers():
-                    member_path = os.path.join(path, member.name)
-                    if not is_within_directory(path, member_path):
-                        raise Exception("Attempted Path Traversal in Tar File")
+    def _extract_members(self, source: str, destination: str, members: List[Dict]):
+        """Extract the given members of the source to the given destination.
 
-                tar.extractall(path, members, numeric_owner=numeric_owner)
+        The header of each member is read at its offset in the archive
+        index, so that the archive is not scanned to find the members.
 
-            safe_extract(tar, destination)
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+        destination: str,
+            The target directory.
+        members: List[Dict],
+            The entries of the archive index of the members to extract.
+        """
+        with tarfile.open(source, "r:") as tar:
+            for member in members:
+                tar.offset = member["offset"]
+                tar.fileobj.seek(member["offset"])
+                extract_tar_member(tar, tarfile.TarInfo.fromtarfile(tar), destination)
@@ -1,13 +1,19 @@
 import tarfile
+from typing import Dict, List
+from .archive_index import tar_index
 from .base_extractor import BaseExtractor
-from .utils import is_targz
+from .streaming import StreamingExtraction, StreamingTarExtraction
+from .utils import extract_tar_members, is_targz
 
 
 class TargzExtractor(BaseExtractor):
     """Extractor for Targz files."""
 
     def __init__(
-        self, cache: bool = True, delete_original_after_extraction: bool = True
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        fsync: bool = False,
     ):
         """Create new TargzExtractor object.
 
@@ -17,11 +23,15 @@ class TargzExtractor(BaseExtractor):
             Whether to skip extraction when file is already available.
         delete_original_after_extraction: bool = True,
             Whether to delete the original file after it has been extracted.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
         """
         super().__init__(
             extension=[".tar.gz", ".tgz"],
             cache=cache,
             delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
         )
 
     def can_extract(self, source: str) -> bool:
@@ -38,6 +48,20 @@ class TargzExtractor(BaseExtractor):
         """
         return is_targz(source)
 
+    def streaming_extraction(self, destination: str) -> StreamingExtraction:
+        """Return the extraction of the archive fed with the blocks being downloaded.
+
+        Parameters
+        ----------------------
+        destination: str,
+            The directory where to extract the archive.
+
+        Returns
+        ----------------------
+        The streaming extraction, which extracts each member as it arrives.
+        """
+        return StreamingTarExtraction(destination, fsync=self._fsync)
+
     def _extract(self, source: str, destination: str):
         """Extract the given source to the given destination.
 
@@ -49,22 +73,33 @@ class TargzExtractor(BaseExtractor):
             The target destination.
         """
         with tarfile.open(source, "r:gz") as tar:
-            import os
-
-            def is_within_directory(directory, target):
-                abs_directory = os.path.abspath(directory)
-                abs_target = os.path.abspath(target)
+            extract_tar_members(tar, destination)
 
-                prefix = os.path.commonprefix([abs_directory, abs_target])
+    def _index(self, source: str) -> List[Dict]:
+        """Return the entries of the members of the given archive.
 
-                return prefix == abs_directory
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+        """
+        with tarfile.open(source, "r|gz") as tar:
+            return tar_index(tar)
 
-            def safe_extract(tar, path=".", members=None, *, numeric_owner=False):
-                for member in tar.getmembers():
-                    member_path = os.path.join(path, member.name)
-                    if not is_within_directory(path, member_path):
-                        raise Exception("Attempted Path Traversal in Tar File")
+    def _extract_members(self, source: str, destination: str, members: List[Dict]):
+        """Extract the given members of the source to the given destination.
 
-                tar.extractall(path, members, numeric_owner=numeric_owner)
+        The compressed archive cannot be sought, so it is decompressed
+        up to the last of the given members.
 
-            safe_extract(tar, destination)
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+        destination: str,
+            The target directory.
+        members: List[Dict],
+            The entries of the archive index of the members to extract.
+        """
+        with tarfile.open(source, "r|gz") as tar:
+            extract_tar_members(tar, destination, members)
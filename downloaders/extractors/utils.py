@@ -1,7 +1,8 @@
 """Utility functions for extractors."""
 import os
 import tarfile
-import lzma
+from typing import Dict, List, Optional
+from .format_detector import detect_format
 
 
 def is_bzip2(source: str) -> bool:
@@ -16,9 +17,7 @@ def is_bzip2(source: str) -> bool:
     --------------------
     Boolean value representing if the is a bzip2.
     """
-    if source.endswith(".bz2"):
-        return True
-    return False
+    return detect_format(source) in ("bz2", "tarbz2")
 
 
 def is_gzip(source: str) -> bool:
@@ -33,12 +32,7 @@ def is_gzip(source: str) -> bool:
     --------------------
     Boolean value representing if the is a gzip.
     """
-    if source.endswith(".gz"):
-        return True
-    if not os.path.exists(source):
-        return False
-    with open(source, "rb") as f:
-        return f.read(2) == b"\x1f\x8b"
+    return detect_format(source) in ("gzip", "targz")
 
 
 def is_xz(source: str) -> bool:
@@ -53,16 +47,7 @@ def is_xz(source: str) -> bool:
     --------------------
     Boolean value representing if the is a xz.
     """
-    if source.endswith(".xz"):
-        return True
-    if not os.path.exists(source):
-        return False
-    with lzma.open(source, "r") as f:
-        try:
-            f.read(1)
-            return True
-        except (lzma.LZMAError, EOFError):
-            return False
+    return detect_format(source) in ("xz", "tarxz")
 
 
 def is_targz(source: str) -> bool:
@@ -77,11 +62,37 @@ def is_targz(source: str) -> bool:
     --------------------
     Boolean value representing if the file is a targz.
     """
-    if source.endswith(".tar.gz"):
-        return True
-    if not os.path.exists(source):
-        return False
-    return tarfile.is_tarfile(source) and is_gzip(source)
+    return detect_format(source) == "targz"
+
+
+def is_tarxz(source: str) -> bool:
+    """Return Whether the given file is a tarxz.
+
+    Parameters
+    --------------------
+    source: str,
+        The source path to test if it can be extracted.
+
+    Returns
+    --------------------
+    Boolean value representing if the file is a tarxz.
+    """
+    return detect_format(source) == "tarxz"
+
+
+def is_tarbz2(source: str) -> bool:
+    """Return Whether the given file is a tarbz2.
+
+    Parameters
+    --------------------
+    source: str,
+        The source path to test if it can be extracted.
+
+    Returns
+    --------------------
+    Boolean value representing if the file is a tarbz2.
+    """
+    return detect_format(source) == "tarbz2"
 
 
 def is_tar(source: str) -> bool:
@@ -96,8 +107,100 @@ def is_tar(source: str) -> bool:
     --------------------
     Boolean value representing if the file is a tar.
     """
-    if source.endswith(".tar"):
-        return True
-    if not os.path.exists(source):
-        return False
-    return tarfile.is_tarfile(source) and not is_gzip(source)
+    return detect_format(source) == "tar"
+
+
+def is_zip(source: str) -> bool:
+    """Return Whether the given file is a zip.
+
+    Parameters
+    --------------------
+    source: str,
+        The source path to test if it can be extracted.
+
+    Returns
+    --------------------
+    Boolean value representing if the file is a zip.
+    """
+    return detect_format(source) == "zip"
+
+
+def is_within_directory(directory: str, target: str) -> bool:
+    """Return whether the given target path is within the given directory.
+
+    Parameters
+    --------------------
+    directory: str,
+        The directory the target should be within.
+    target: str,
+        The path to test.
+
+    Returns
+    --------------------
+    Boolean value representing if the target is within the directory.
+    """
+    abs_directory = os.path.abspath(directory)
+    abs_target = os.path.abspath(target)
+
+    # The common path is compared by components, as a plain string prefix
+    # would accept siblings such as "directory.txt".
+    return os.path.commonpath([abs_directory, abs_target]) == abs_directory
+
+
+def extract_tar_member(tar: tarfile.TarFile, member: tarfile.TarInfo, destination: str):
+    """Extract the given member of the tar within the given destination.
+
+    Parameters
+    --------------------
+    tar: tarfile.TarFile,
+        The tar containing the member.
+    member: tarfile.TarInfo,
+        The member to extract.
+    destination: str,
+        The directory where to extract the member.
+
+    Raises
+    --------------------
+    Exception,
+        If the member would be extracted outside of the destination.
+    """
+    member_path = os.path.join(destination, member.name)
+    if not is_within_directory(destination, member_path):
+        raise Exception("Attempted Path Traversal in Tar File")
+    tar.extract(member, destination)
+
+
+def extract_tar_members(
+    tar: tarfile.TarFile, destination: str, members: Optional[List[Dict]] = None
+):
+    """Extract the members of the given tar in a single pass.
+
+    Parameters
+    --------------------
+    tar: tarfile.TarFile,
+        The tar to extract, which may be opened in stream mode.
+    destination: str,
+        The directory where to extract the members.
+    members: Optional[List[Dict]] = None,
+        The entries of the archive index of the members to extract.
+        By default, all the members are extracted. Otherwise, the
+        archive is read only up to the last of the given members.
+
+    Raises
+    --------------------
+    Exception,
+        If a member would be extracted outside of the destination.
+    """
+    if members is None:
+        for member in tar:
+            extract_tar_member(tar, member, destination)
+        return
+    if not members:
+        return
+    names = {member["name"] for member in members}
+    last_offset = max(member["offset"] for member in members)
+    for member in tar:
+        if member.name in names:
+            extract_tar_member(tar, member, destination)
+        if member.offset >= last_offset:
+            break
@@ -1,16 +1,24 @@
 import lzma
 import shutil
+from multiprocessing import cpu_count, current_process
+from typing import BinaryIO, Callable, Dict, Iterator, List
 from .base_extractor import BaseExtractor
-from .utils import is_xz
+from .parallel_decompression import parallel_xz_decompress
+from .random_access import xz_checkpoints, read_xz_checkpoint
+from .utils import is_xz, is_tarxz
 
 
 class XzExtractor(BaseExtractor):
-    """Extractor for Gzip files."""
+    """Extractor for Xz files."""
 
     def __init__(
-        self, cache: bool = True, delete_original_after_extraction: bool = True
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        processes: int = 1,
+        fsync: bool = False,
     ):
-        """Create new GzipExtractor object.
+        """Create new XzExtractor object.
 
         Parameters
         -------------------
@@ -18,12 +26,20 @@ class XzExtractor(BaseExtractor):
             Whether to skip extraction when file is already available.
         delete_original_after_extraction: bool = True,
             Whether to delete the original file after it has been extracted.
+        processes: int = 1,
+            Number of processes across which the blocks are decompressed.
+            If the given number is -1, we use all the available processes.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
         """
         super().__init__(
             extension=".xz",
             cache=cache,
             delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
         )
+        self._processes = processes if processes > 0 else cpu_count()
 
     def can_extract(self, source: str) -> bool:
         """Return Whether this extractor can extract or not the given file.
@@ -37,7 +53,11 @@ class XzExtractor(BaseExtractor):
         --------------------
         Boolean value representing if the file can be extracted.
         """
-        return is_xz(source)
+        return is_xz(source) and not is_tarxz(source)
+
+    def decompressor_factory(self) -> Callable:
+        """Return the factory of the incremental decompressors of this format."""
+        return lzma.LZMADecompressor
 
     def _extract(self, source: str, destination: str):
         """Extract the given source to the given destination.
@@ -49,6 +69,36 @@ class XzExtractor(BaseExtractor):
         destination: str,
             The target destination.
         """
+        # Daemonic processes, such as the ones of the downloader pool,
+        # are not allowed to start a pool of their own.
+        if (
+            self._processes > 1
+            and not current_process().daemon
+            and parallel_xz_decompress(source, destination, self._processes)
+        ):
+            return
         with lzma.open(source, "rb") as f_in:
             with open(destination, "wb") as f_out:
                 shutil.copyfileobj(f_in, f_out)
+
+    def _checkpoints(self, source: str) -> List[Dict]:
+        """Return the checkpoints at the start of its blocks.
+
+        Parameters
+        ------------------
+        source: str,
+            The source file.
+        """
+        return xz_checkpoints(source)
+
+    def _read_checkpoint(self, handle: BinaryIO, checkpoint: Dict) -> Iterator[bytes]:
+        """Yield the decompressed blocks of the file from the given checkpoint.
+
+        Parameters
+        ------------------
+        handle: BinaryIO,
+            The source file opened in binary mode.
+        checkpoint: Dict,
+            The checkpoint from which to decompress the file.
+        """
+        return read_xz_checkpoint(handle, checkpoint)
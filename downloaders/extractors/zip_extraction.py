@@ -1,12 +1,39 @@
+import os
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count, current_process
+from typing import Dict, List
+from .archive_index import can_read_zip_member, read_zip_member, zip_index
 from .base_extractor import BaseExtractor
+from .utils import is_within_directory, is_zip
+
+
+def extract_zip_members(source: str, destination: str, names: List[str]):
+    """Extract the given members of the zip with a dedicated handle.
+
+    Parameters
+    ------------------
+    source: str,
+        The source zip file.
+    destination: str,
+        The target destination.
+    names: List[str],
+        The names of the members to extract.
+    """
+    with zipfile.ZipFile(source, "r") as zip_ref:
+        for name in names:
+            zip_ref.extract(name, destination)
 
 
 class ZipExtractor(BaseExtractor):
     """Extractor for Gzip files."""
 
     def __init__(
-        self, cache: bool = True, delete_original_after_extraction: bool = True
+        self,
+        cache: bool = True,
+        delete_original_after_extraction: bool = True,
+        processes: int = 1,
+        fsync: bool = False,
     ):
         """Create new ZipExtractor object.
 
@@ -16,12 +43,20 @@ class ZipExtractor(BaseExtractor):
             Whether to skip extraction when file is already available.
         delete_original_after_extraction: bool = True,
             Whether to delete the original file after it has been extracted.
+        processes: int = 1,
+            Number of processes across which the members are extracted.
+            If the given number is -1, we use all the available processes.
+        fsync: bool = False,
+            Whether to flush the extracted files to disk before they are
+            moved to their destination.
         """
         super().__init__(
             extension=".zip",
             cache=cache,
             delete_original_after_extraction=delete_original_after_extraction,
+            fsync=fsync,
         )
+        self._processes = processes if processes > 0 else cpu_count()
 
     def can_extract(self, source: str) -> bool:
         """Return Whether this extractor can extract or not the given file.
@@ -35,7 +70,7 @@ class ZipExtractor(BaseExtractor):
         --------------------
         Boolean value representing if the file can be extracted.
         """
-        return zipfile.is_zipfile(source)
+        return is_zip(source)
 
     def _extract(self, source: str, destination: str):
         """Extract the given source to the given destination.
@@ -48,4 +83,79 @@ class ZipExtractor(BaseExtractor):
             The target destination.
         """
         with zipfile.ZipFile(source, "r") as zip_ref:
-            zip_ref.extractall(destination)
+            members = zip_ref.infolist()
+        for member in members:
+            member_path = os.path.join(destination, member.filename)
+            if not is_within_directory(destination, member_path):
+                raise Exception("Attempted Path Traversal in Zip File")
+        processes = min(self._processes, len(members) // 2)
+        # Daemonic processes, such as the ones of the downloader pool,
+        # are not allowed to start a pool of their own.
+        if processes <= 1 or current_process().daemon:
+            extract_zip_members(
+                source, destination, [member.filename for member in members]
+            )
+            return
+        # The parent directories are created upfront, as concurrent
+        # extractions of members sharing them would race on their creation.
+        for member in members:
+            os.makedirs(
+                os.path.dirname(os.path.join(destination, member.filename)),
+                exist_ok=True,
+            )
+        # The members are dealt to the processes from the largest one,
+        # so that each process extracts a similar number of bytes.
+        members = sorted(members, key=lambda member: member.compress_size, reverse=True)
+        partitions = [
+            [member.filename for member in members[i::processes]]
+            for i in range(processes)
+        ]
+        with ProcessPoolExecutor(processes) as executor:
+            for future in [
+                executor.submit(extract_zip_members, source, destination, names)
+                for names in partitions
+            ]:
+                future.result()
+
+    def _index(self, source: str) -> List[Dict]:
+        """Return the entries of the members of the given archive.
+
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+        """
+        with zipfile.ZipFile(source, "r") as zip_ref:
+            return zip_index(zip_ref)
+
+    def _extract_members(self, source: str, destination: str, members: List[Dict]):
+        """Extract the given members of the source to the given destination.
+
+        The members are decompressed directly from their offset in the
+        archive index, so that the central directory of the archive is not
+        read, unless they are encrypted or use an unsupported compression.
+
+        Parameters
+        ------------------
+        source: str,
+            The source archive.
+        destination: str,
+            The target directory.
+        members: List[Dict],
+            The entries of the archive index of the members to extract.
+        """
+        fallback = []
+        with open(source, "rb") as handle:
+            for member in members:
+                path = os.path.join(destination, member["name"])
+                if member["name"].endswith("/"):
+                    os.makedirs(path, exist_ok=True)
+                elif not can_read_zip_member(member):
+                    fallback.append(member["name"])
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "wb") as f:
+                        for data in read_zip_member(handle, member):
+                            f.write(data)
+        if fallback:
+            extract_zip_members(source, destination, fallback)
@@ -1,3 +1,9 @@
+import hashlib
+import os
+import shutil
+import threading
+
+
 def is_iterable(candidate) -> bool:
     """Return boolean value representing if object is iterable."""
     try:
@@ -5,3 +11,129 @@ def is_iterable(candidate) -> bool:
         return True
     except TypeError:
         return False
+
+
+def preallocate(file_descriptor: int, size: int):
+    """Reserve the given number of bytes on disk for the given open file.
+
+    Parameters
+    --------------------
+    file_descriptor: int,
+        The descriptor of the file opened for writing.
+    size: int,
+        The expected final size of the file.
+    """
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(file_descriptor, 0, size)
+            return
+        except OSError:
+            # Some file systems, such as tmpfs on older kernels, do not
+            # support fallocate, so we fall back to a sparse file.
+            pass
+    os.ftruncate(file_descriptor, size)
+
+
+def file_digest(path: str, algorithm: str = "sha256", block_size: int = 1024 * 1024) -> str:
+    """Return the hex digest of the file at the given path.
+
+    Parameters
+    --------------------
+    path: str,
+        The path of the file to hash.
+    algorithm: str = "sha256",
+        The name of the hashlib algorithm to use.
+    block_size: int = 1024 * 1024,
+        The dimension of the blocks read from the file.
+
+    Returns
+    --------------------
+    The hex digest of the file.
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def temporary_path(path: str) -> str:
+    """Return the path where the given file or directory is written until it is complete.
+
+    Parameters
+    --------------------
+    path: str,
+        The final path of the file or directory.
+
+    Implementative details
+    --------------------
+    The temporary path is within the same directory, so that it can be
+    atomically renamed to the final one, and it is unique to the process
+    and the thread, so that concurrent writers of the same path do not clash.
+    """
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def remove_path(path: str):
+    """Remove the given file or directory, if it exists."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def fsync_directory(path: str):
+    """Flush to disk the entries of the given directory, such as a renamed file."""
+    try:
+        file_descriptor = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on some platforms, such as Windows.
+        return
+    try:
+        os.fsync(file_descriptor)
+    finally:
+        os.close(file_descriptor)
+
+
+def fsync_path(path: str):
+    """Flush to disk the given file, or the files and directories within the given directory."""
+    if not os.path.isdir(path):
+        with open(path, "rb+") as f:
+            os.fsync(f.fileno())
+        return
+    for root, _, names in os.walk(path, topdown=False):
+        for name in names:
+            if not os.path.islink(os.path.join(root, name)):
+                fsync_path(os.path.join(root, name))
+        fsync_directory(root)
+
+
+def commit_path(temporary: str, path: str, fsync: bool = False):
+    """Atomically move the given complete file or directory to its final path.
+
+    Parameters
+    --------------------
+    temporary: str,
+        The temporary path where the file or directory was written.
+    path: str,
+        The final path, which is replaced if it exists.
+    fsync: bool = False,
+        Whether to flush the file or directory to disk before it is moved,
+        so that the final path never points to data lost by a crash of
+        the machine.
+    """
+    if fsync:
+        fsync_path(temporary)
+    if os.path.isdir(path) and not os.path.islink(path):
+        # A directory cannot replace a non-empty one, so the previous one
+        # is moved out of the way before it is removed.
+        previous = temporary_path(f"{path}.previous")
+        os.replace(path, previous)
+        os.replace(temporary, path)
+        remove_path(previous)
+    else:
+        os.replace(temporary, path)
+    if fsync:
+        fsync_directory(os.path.dirname(os.path.abspath(path)))
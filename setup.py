@@ -33,8 +33,28 @@ test_deps = [
     "validate_version_code",
 ]
 
+async_deps = [
+    "aiohttp",
+]
+
+parquet_deps = [
+    "pyarrow",
+]
+
+zstd_deps = [
+    "zstandard",
+]
+
+lz4_deps = [
+    "lz4",
+]
+
 extras = {
     "test": test_deps,
+    "async": async_deps,
+    "parquet": parquet_deps,
+    "zstd": zstd_deps,
+    "lz4": lz4_deps,
 }
 
 setup(
@@ -53,9 +73,15 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
     ],
-    packages=find_packages(exclude=["contrib", "docs", "tests*"]),
+    packages=find_packages(exclude=["contrib", "docs", "tests*", "benchmarks*"]),
     tests_require=test_deps,
     # Add here the package dependencies
-    install_requires=["tqdm", "requests", "pandas"],
+    install_requires=[
+        "tqdm",
+        "requests",
+        "urllib3>=1.26",
+        "pandas",
+        "importlib_metadata; python_version < '3.8'",
+    ],
     extras_require=extras,
 )
@@ -0,0 +1,211 @@
+"""Local HTTP server used by the tests and benchmarks in place of remote mirrors."""
+import os
+import re
+import threading
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    """Handler serving the files of the server root over keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are sent with separate writes, which with Nagle's
+    # algorithm would stall each keep-alive response on the delayed ACK.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        """Silence the default request logging."""
+
+    def setup(self):
+        """Count the connections opened towards the server."""
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def send_response(self, code: int, message: Optional[str] = None):
+        """Send the response status line, counting the sent status codes."""
+        with self.server.lock:
+            self.server.statuses[code] += 1
+        super().send_response(code, message)
+
+    def _resolve(self) -> Optional[str]:
+        """Return the path of the requested file, if it exists."""
+        path = os.path.join(self.server.root, self.path.split("?")[0].lstrip("/"))
+        if os.path.isfile(path):
+            return path
+        return None
+
+    def _send_missing(self):
+        """Send a 404 response with an empty body."""
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _validators(self, path: str) -> Tuple[str, str]:
+        """Return the ETag and Last-Modified validators of the given file."""
+        stat = os.stat(path)
+        return (
+            f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+            formatdate(stat.st_mtime, usegmt=True),
+        )
+
+    def _requested_range(self, path: str, size: int) -> Optional[Tuple[int, int]]:
+        """Return the inclusive byte range to send, if a valid one was requested."""
+        if not self.server.ranges:
+            return None
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match is None:
+            return None
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range not in self._validators(path):
+            return None
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+        return start, min(end, size - 1)
+
+    def _not_modified(self, path: str) -> bool:
+        """Return whether the conditional headers match the given file."""
+        etag, last_modified = self._validators(path)
+        if "If-None-Match" in self.headers:
+            return self.headers["If-None-Match"] == etag
+        return self.headers.get("If-Modified-Since") == last_modified
+
+    def _send_headers(self, path: str, status: int, length: int):
+        """Send the status line and the headers of the given file."""
+        etag, last_modified = self._validators(path)
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+
+    def do_HEAD(self):
+        """Send the headers of the requested file."""
+        path = self._resolve()
+        if path is None:
+            self._send_missing()
+            return
+        self._send_headers(path, 200, os.path.getsize(path))
+        self.end_headers()
+
+    def do_GET(self):
+        """Send the requested file, or the requested range of it."""
+        path = self._resolve()
+        if path is None:
+            self._send_missing()
+            return
+        if self.server.conditionals and self._not_modified(path):
+            self.send_response(304)
+            self.send_header("ETag", self._validators(path)[0])
+            self.end_headers()
+            return
+        size = os.path.getsize(path)
+        requested_range = self._requested_range(path, size)
+        if requested_range is not None and requested_range[0] >= size:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start, end = (0, size - 1) if requested_range is None else requested_range
+        with open(path, "rb") as f:
+            f.seek(start)
+            body = f.read(end - start + 1)
+        if requested_range is None:
+            self._send_headers(path, 200, len(body))
+        else:
+            self._send_headers(path, 206, len(body))
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        with self.server.lock:
+            truncate_at = self.server.truncate_at
+            if truncate_at is not None and self.server.truncate_times is not None:
+                self.server.truncate_times -= 1
+                if self.server.truncate_times <= 0:
+                    self.server.truncate_at = None
+        if truncate_at is not None:
+            # Simulate a dropped connection after the given number of bytes.
+            self.wfile.write(body[:truncate_at])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class LocalHTTPServer:
+    """Context manager running a threaded HTTP server on a free local port."""
+
+    def __init__(
+        self,
+        root: str,
+        handler=LocalHandler,
+        ranges: bool = True,
+        conditionals: bool = True,
+    ):
+        """Create new LocalHTTPServer serving the files within the given root.
+
+        Parameters
+        -------------------
+        root: str,
+            Directory whose files are served.
+        handler = LocalHandler,
+            The request handler class to use.
+        ranges: bool = True,
+            Whether the server supports range requests.
+        conditionals: bool = True,
+            Whether the server answers conditional requests with a 304.
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._server.root = root
+        self._server.ranges = ranges
+        self._server.conditionals = conditionals
+        self._server.truncate_at = None
+        self._server.truncate_times = None
+        self._server.lock = threading.Lock()
+        self._server.connections = 0
+        self._server.statuses = Counter()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def connections(self) -> int:
+        """Return the number of connections accepted so far."""
+        return self._server.connections
+
+    @property
+    def truncate_at(self) -> Optional[int]:
+        """Return the number of bytes after which the responses are dropped."""
+        return self._server.truncate_at
+
+    @truncate_at.setter
+    def truncate_at(self, truncate_at: Optional[int]):
+        """Set the number of bytes after which the responses are dropped."""
+        self._server.truncate_at = truncate_at
+
+    def truncate(self, truncate_at: int, times: int):
+        """Drop the given number of following responses after the given number of bytes."""
+        with self._server.lock:
+            self._server.truncate_at = truncate_at
+            self._server.truncate_times = times
+
+    @property
+    def requests(self) -> Dict[str, int]:
+        """Return the number of responses sent by status code."""
+        return dict(self._server.statuses)
+
+    def url(self, path: str) -> str:
+        """Return the url of the given file path relative to the root."""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/{path}"
+
+    def __enter__(self) -> "LocalHTTPServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
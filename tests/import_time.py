@@ -0,0 +1,40 @@
+"""Helper measuring the modules imported by a statement, used by the tests and benchmarks."""
+import subprocess
+import sys
+from typing import Dict
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    """Return the cumulative import time in microseconds of each module imported by the statement.
+
+    Parameters
+    -------------------
+    statement: str,
+        The Python statement to execute in a new interpreter.
+
+    Returns
+    -------------------
+    Dictionary from the name of each module to its cumulative import time,
+    excluding the modules already imported when the interpreter starts.
+    """
+
+    def measure(code: str) -> Dict[str, int]:
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stderr
+        times = {}
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+        return times
+
+    baseline = measure("pass")
+    return {
+        name: time for name, time in measure(statement).items() if name not in baseline
+    }
@@ -0,0 +1,127 @@
+"""Test module to test the write of the downloads through a reusable buffer."""
+import gzip
+import hashlib
+import io
+import os
+import pytest
+import requests
+from downloaders import BaseDownloader
+from downloaders.downloaders import adaptive_write
+from tests.http_server import LocalHandler, LocalHTTPServer
+
+CONTENT = os.urandom(3_000_000)
+
+
+class FakeResponse:
+    """Response whose raw body is read from memory."""
+
+    def __init__(self, content: bytes, headers=None):
+        """Create a new FakeResponse with the given body and headers."""
+        self.raw = io.BytesIO(content)
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+
+
+class GzipEncodingHandler(LocalHandler):
+    """Handler sending the files with a gzip content encoding."""
+
+    def do_GET(self):
+        """Send the file compressed with gzip."""
+        with open(self._resolve(), "rb") as f:
+            body = gzip.compress(f.read())
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_write_response(monkeypatch):
+    """Test that the blocks grow up to the maximum size and the updates are throttled."""
+    monkeypatch.setattr(adaptive_write, "TARGET_READ_TIME", float("inf"))
+    handle = io.BytesIO()
+    blocks = []
+    updates = []
+    written = adaptive_write.write_response(
+        FakeResponse(CONTENT),
+        handle,
+        block_size=1024,
+        max_block_size=65536,
+        consumers=[lambda block: blocks.append(len(block))],
+        callback=updates.append,
+    )
+    assert written == len(CONTENT)
+    assert handle.getvalue() == CONTENT
+    assert blocks[:7] == [1024, 2048, 4096, 8192, 16384, 32768, 65536]
+    assert max(blocks) == 65536
+    assert sum(updates) == len(CONTENT)
+    assert len(updates) < len(blocks)
+
+
+def test_supports_readinto():
+    """Test that the content-encoded responses are left to iter_content."""
+    assert adaptive_write.supports_readinto(FakeResponse(b""))
+    assert not adaptive_write.supports_readinto(
+        FakeResponse(b"", {"Content-Encoding": "gzip"})
+    )
+
+
+@pytest.mark.parametrize("resumable", [False, True])
+def test_download(tmp_path, resumable: bool):
+    """Test that the downloads written through the buffer match the served files."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "file.bin").write_bytes(CONTENT)
+    with LocalHTTPServer(str(served)) as server:
+        report = BaseDownloader(
+            process_number=1,
+            block_size=1024,
+            max_block_size=1024 * 1024,
+            target_directory=str(tmp_path / "downloads"),
+            resumable=resumable,
+            checksum_algorithm="sha256",
+            verbose=False,
+        ).download(
+            server.url("file.bin"),
+            checksums=f"sha256:{hashlib.sha256(CONTENT).hexdigest()}",
+        )
+    assert report.success.all()
+    assert (tmp_path / "downloads" / "file.bin").read_bytes() == CONTENT
+    assert os.listdir(tmp_path / "downloads") == ["file.bin"]
+
+
+def test_content_encoding(tmp_path):
+    """Test that the content-encoded downloads are decoded."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "file.bin").write_bytes(CONTENT)
+    with LocalHTTPServer(str(served), handler=GzipEncodingHandler) as server:
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            verbose=False,
+        ).download(server.url("file.bin"))
+    assert report.success.all()
+    assert (tmp_path / "downloads" / "file.bin").read_bytes() == CONTENT
+
+
+def test_truncated_download(tmp_path):
+    """Test that a preallocated download is not left behind when truncated."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "file.bin").write_bytes(CONTENT)
+    with LocalHTTPServer(str(served)) as server:
+        server.truncate_at = 1_000_000
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            crash_early=False,
+            verbose=False,
+        ).download(server.url("file.bin"))
+    assert not report.success.any()
+    assert os.listdir(tmp_path / "downloads") == []
+
+
+def test_invalid_max_block_size():
+    """Test that a maximum block size smaller than the block size is rejected."""
+    with pytest.raises(ValueError):
+        BaseDownloader(block_size=1024, max_block_size=512)
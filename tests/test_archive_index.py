@@ -0,0 +1,133 @@
+"""Test module to test the archive index and the selective extraction of the members."""
+import gzip
+import io
+import lzma
+import os
+import tarfile
+import zipfile
+import pytest
+from downloaders.extractors import AutoExtractor
+from downloaders.extractors import zip_extraction
+from downloaders.extractors.archive_index import index_path
+
+NAMES = [f"data/{i}.csv" for i in range(10)] + ["readme.txt"]
+
+
+def content(name: str) -> bytes:
+    """Return the content of the member with the given name."""
+    return name.encode() * 1000
+
+
+def make_tar() -> bytes:
+    """Return a tar archive with the members."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name in NAMES:
+            info = tarfile.TarInfo(name)
+            info.size = len(content(name))
+            tar.addfile(info, io.BytesIO(content(name)))
+    return buffer.getvalue()
+
+
+@pytest.fixture(
+    params=["archive.tar", "archive.tar.gz", "archive.tar.xz", "archive.zip"]
+)
+def archive(request, tmp_path) -> str:
+    """Return the path of an archive with the members."""
+    path = str(tmp_path / request.param)
+    if request.param == "archive.zip":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.writestr("data/", b"")
+            for name in NAMES:
+                zip_ref.writestr(name, content(name))
+            zip_ref.writestr("stored.bin", b"stored", compress_type=zipfile.ZIP_STORED)
+            zip_ref.writestr("lzma.bin", b"lzma", compress_type=zipfile.ZIP_LZMA)
+    else:
+        with open(path, "wb") as f:
+            f.write(
+                {
+                    "archive.tar": bytes,
+                    "archive.tar.gz": gzip.compress,
+                    "archive.tar.xz": lzma.compress,
+                }[request.param](make_tar())
+            )
+    return path
+
+
+def test_archive_index(archive: str):
+    """Test that the index lists the members and is cached in a sidecar file."""
+    extractor = AutoExtractor()
+    index = extractor.archive_index(archive)
+    files = [member for member in index if member["name"] in NAMES]
+    assert [member["name"] for member in files] == NAMES
+    assert [member["size"] for member in files] == [len(content(name)) for name in NAMES]
+    assert sorted(member["offset"] for member in index) == [
+        member["offset"] for member in index
+    ]
+    assert os.path.exists(index_path(archive))
+    assert extractor.archive_index(archive) == index
+
+
+def test_selective_extraction(archive: str):
+    """Test that only the selected members are extracted, and only once."""
+    extractor = AutoExtractor()
+    report = extractor.extract(
+        archive, include="data/*.csv", exclude=["data/[0-7].csv"], members=None
+    )[0]
+    destination = report["destination"]
+    assert report["members"] == ["data/8.csv", "data/9.csv"]
+    assert sorted(os.listdir(os.path.join(destination, "data"))) == ["8.csv", "9.csv"]
+    for name in report["members"]:
+        with open(os.path.join(destination, name), "rb") as f:
+            assert f.read() == content(name)
+    assert os.path.exists(archive)
+    report = extractor.extract(archive, members=["data/9.csv", "readme.txt"])[0]
+    assert report["members"] == ["readme.txt"]
+    assert not report["cached"]
+    report = extractor.extract(archive, members=["readme.txt"])[0]
+    assert report["cached"]
+    assert not [name for name in os.listdir(os.path.dirname(archive)) if ".tmp" in name]
+    with pytest.raises(ValueError):
+        extractor.extract(archive, members=["missing.txt"])
+
+
+@pytest.mark.parametrize("archive", ["archive.zip"], indirect=True)
+def test_zip_without_central_directory(archive: str, monkeypatch):
+    """Test that the indexed zip members are read without opening the zip."""
+    extractor = AutoExtractor()
+    extractor.archive_index(archive)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The central directory should not be read.")
+
+    monkeypatch.setattr(zip_extraction.zipfile, "ZipFile", fail)
+    report = extractor.extract(archive, members=["data/3.csv", "stored.bin"])[0]
+    with open(os.path.join(report["destination"], "stored.bin"), "rb") as f:
+        assert f.read() == b"stored"
+    # The members with an unsupported compression fall back to zipfile.
+    with pytest.raises(AssertionError):
+        extractor.extract(archive, members=["lzma.bin"])
+    monkeypatch.undo()
+    report = extractor.extract(archive, members=["lzma.bin"])[0]
+    with open(os.path.join(report["destination"], "lzma.bin"), "rb") as f:
+        assert f.read() == b"lzma"
+
+
+def test_stale_index(tmp_path):
+    """Test that the index is rebuilt when the archive changes."""
+    path = tmp_path / "archive.tar"
+    path.write_bytes(make_tar())
+    extractor = AutoExtractor()
+    assert len(extractor.archive_index(str(path))) == len(NAMES)
+    with tarfile.open(str(path), "a") as tar:
+        info = tarfile.TarInfo("appended.txt")
+        tar.addfile(info, io.BytesIO(b""))
+    assert len(extractor.archive_index(str(path))) == len(NAMES) + 1
+
+
+def test_single_file_selection(tmp_path):
+    """Test that the selection of members of a single compressed file is rejected."""
+    path = tmp_path / "file.csv.gz"
+    path.write_bytes(gzip.compress(b"a,b\n"))
+    with pytest.raises(ValueError):
+        AutoExtractor().extract(str(path), include="*")
@@ -0,0 +1,64 @@
+"""Test module to test the asyncio download engine."""
+import asyncio
+import os
+import pytest
+from downloaders import BaseDownloader
+from tests.http_server import LocalHTTPServer
+
+pytest.importorskip("aiohttp")
+
+
+def test_asyncio_engine(tmp_path):
+    """Test that the asyncio engine reports the same columns of the process engine."""
+    served = tmp_path / "served"
+    served.mkdir()
+    for i in range(50):
+        (served / f"file_{i}.txt").write_bytes(os.urandom(4096))
+    with LocalHTTPServer(str(served)) as server:
+        urls = [server.url(f"file_{i}.txt") for i in range(50)]
+        process_report = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "process"),
+            verbose=False,
+        ).download(urls)
+        downloader = BaseDownloader(
+            engine="asyncio",
+            concurrency=16,
+            target_directory=str(tmp_path / "asyncio"),
+            verbose=False,
+        )
+        report = downloader.download(urls)
+        assert list(report.columns) == list(process_report.columns)
+        assert report.success.all()
+        assert not report.cached.any()
+        assert list(report.url) == urls
+        for i in range(50):
+            assert (tmp_path / "asyncio" / f"file_{i}.txt").read_bytes() == (
+                served / f"file_{i}.txt"
+            ).read_bytes()
+        report = asyncio.run(downloader.download_async(urls))
+        assert report.cached.all()
+
+        failing = BaseDownloader(
+            engine="asyncio",
+            target_directory=str(tmp_path / "failing"),
+            crash_early=False,
+            verbose=False,
+        ).download([urls[0], server.url("missing.txt")])
+        assert list(failing.success) == [True, False]
+        assert list(failing.status_code) == [200, 404]
+        assert not os.path.exists(tmp_path / "failing" / "missing.txt")
+        with pytest.raises(ValueError):
+            BaseDownloader(
+                engine="asyncio", target_directory=str(tmp_path / "failing")
+            ).download(server.url("missing.txt"))
+
+
+def test_asyncio_engine_arguments():
+    """Test the validation of the engine arguments."""
+    with pytest.raises(ValueError):
+        BaseDownloader(engine="kebab")
+    with pytest.raises(ValueError):
+        BaseDownloader(concurrency=0)
+    with pytest.raises(ValueError):
+        BaseDownloader(engine="asyncio", stream_extraction=True)
@@ -0,0 +1,173 @@
+"""Test module to test that the downloads and extractions are written atomically."""
+import gzip
+import os
+import threading
+from time import sleep
+import pytest
+from downloaders import BaseDownloader
+from downloaders.extractors import AutoExtractor
+from downloaders.utils import commit_path, temporary_path
+from tests.http_server import LocalHandler, LocalHTTPServer
+
+
+class StallingHandler(LocalHandler):
+    """Handler sending half of each file, then stalling before sending the rest."""
+
+    def do_GET(self):
+        """Send the file in two halves separated by a pause."""
+        with open(self._resolve(), "rb") as f:
+            body = f.read()
+        self._send_headers(self._resolve(), 200, len(body))
+        self.end_headers()
+        self.wfile.write(body[: len(body) // 2])
+        self.wfile.flush()
+        sleep(0.5)
+        self.wfile.write(body[len(body) // 2 :])
+
+
+@pytest.mark.parametrize(
+    "engine,stream_extraction",
+    [("process", False), ("process", True), ("asyncio", False)],
+)
+def test_download_never_partial(tmp_path, engine: str, stream_extraction: bool):
+    """Test that the destinations only appear once they are complete."""
+    served = tmp_path / "served"
+    served.mkdir()
+    content = os.urandom(100_000)
+    (served / "file.bin.gz").write_bytes(gzip.compress(content))
+    downloads = tmp_path / "downloads"
+    observed = []
+    stop = threading.Event()
+
+    def observe():
+        while not stop.is_set():
+            for name in ("file.bin.gz", "file.bin"):
+                path = downloads / name
+                if path.exists():
+                    observed.append((name, path.read_bytes()))
+
+    with LocalHTTPServer(str(served), handler=StallingHandler) as server:
+        observer = threading.Thread(target=observe)
+        observer.start()
+        try:
+            report = BaseDownloader(
+                process_number=1,
+                engine=engine,
+                target_directory=str(downloads),
+                stream_extraction=stream_extraction,
+                fsync=True,
+                verbose=False,
+            ).download(server.url("file.bin.gz"))
+        finally:
+            stop.set()
+            observer.join()
+    assert report.success.all()
+    assert report.extraction_success.all()
+    assert sorted(os.listdir(downloads)) == ["file.bin", "file.bin.gz"]
+    for name, observed_content in observed:
+        assert observed_content == (
+            content if name == "file.bin" else (served / "file.bin.gz").read_bytes()
+        )
+
+
+def test_failed_download_cleanup(tmp_path):
+    """Test that a failed download leaves neither the destination nor its temporary file."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "file.bin").write_bytes(os.urandom(100_000))
+    downloads = tmp_path / "downloads"
+    with LocalHTTPServer(str(served)) as server:
+        server.truncate_at = 1000
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(downloads),
+            crash_early=False,
+            verbose=False,
+        ).download(server.url("file.bin"))
+    assert not report.success.any()
+    assert os.listdir(downloads) == []
+
+
+def test_failed_download_keeps_destination(tmp_path):
+    """Test that a failed download does not remove the previously downloaded file."""
+    served = tmp_path / "served"
+    served.mkdir()
+    content = os.urandom(100_000)
+    (served / "file.bin").write_bytes(content)
+    downloads = tmp_path / "downloads"
+    with LocalHTTPServer(str(served)) as server:
+        assert BaseDownloader(
+            process_number=1, target_directory=str(downloads), verbose=False
+        ).download(server.url("file.bin")).success.all()
+        server.truncate_at = 1000
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(downloads),
+            cache=False,
+            crash_early=False,
+            verbose=False,
+        ).download(server.url("file.bin"))
+        assert not report.success.any()
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(downloads),
+            cache=False,
+            crash_early=False,
+            verbose=False,
+        ).download(server.url("file.bin"), checksums=f"sha256:{'0' * 64}")
+        assert not report.success.any()
+    assert os.listdir(downloads) == ["file.bin"]
+    assert (downloads / "file.bin").read_bytes() == content
+
+
+@pytest.mark.parametrize("engine", ["process", "thread", "asyncio"])
+def test_failed_extraction_download(tmp_path, engine: str):
+    """Test that a download whose extraction fails is reported as failed and removed."""
+    served = tmp_path / "served"
+    served.mkdir()
+    # A gzip header with an unknown compression method.
+    (served / "broken.csv.gz").write_bytes(b"\x1f\x8b\x09" + os.urandom(1000))
+    downloads = tmp_path / "downloads"
+    with LocalHTTPServer(str(served)) as server:
+        for _ in range(2):
+            report = BaseDownloader(
+                process_number=1,
+                engine=engine,
+                extract_workers=1,
+                target_directory=str(downloads),
+                crash_early=False,
+                verbose=False,
+            ).download(server.url("broken.csv.gz"))
+            assert not report.success.any()
+            assert not report.cached.any()
+            assert os.listdir(downloads) == []
+
+
+def test_failed_extraction_cleanup(tmp_path):
+    """Test that a failed extraction leaves neither the destination nor its temporary file."""
+    source = tmp_path / "file.csv.gz"
+    source.write_bytes(gzip.compress(os.urandom(100_000))[:-1000])
+    with pytest.raises(EOFError):
+        AutoExtractor(fsync=True).extract(str(source))
+    assert os.listdir(tmp_path) == ["file.csv.gz"]
+
+
+def test_commit_path(tmp_path):
+    """Test that the files and directories replace the existing ones."""
+    path = str(tmp_path / "file.txt")
+    for content in ("first", "second"):
+        temporary = temporary_path(path)
+        with open(temporary, "w", encoding="utf8") as f:
+            f.write(content)
+        commit_path(temporary, path, fsync=True)
+        with open(path, "r", encoding="utf8") as f:
+            assert f.read() == content
+    directory = str(tmp_path / "directory")
+    for name in ("first.txt", "second.txt"):
+        temporary = temporary_path(directory)
+        os.makedirs(os.path.join(temporary, "nested"))
+        with open(os.path.join(temporary, "nested", name), "w", encoding="utf8") as f:
+            f.write(name)
+        commit_path(temporary, directory, fsync=True)
+        assert os.listdir(os.path.join(directory, "nested")) == [name]
+    assert sorted(os.listdir(tmp_path)) == ["directory", "file.txt"]
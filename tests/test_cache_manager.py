@@ -0,0 +1,101 @@
+"""Test module to test the size-bounded eviction of the cached artifacts."""
+import gzip
+import os
+import pytest
+from downloaders import BaseDownloader
+from downloaders.cache import CacheManager
+from tests.http_server import LocalHTTPServer
+
+
+def build_downloader(tmp_path, policy: str) -> BaseDownloader:
+    """Return a downloader with a cache budget of about two files."""
+    return BaseDownloader(
+        process_number=1,
+        target_directory=str(tmp_path / "downloads"),
+        cache_size=100_000,
+        cache_policy=policy,
+        verbose=False,
+    )
+
+
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+def test_cache_eviction(tmp_path, policy: str):
+    """Test that the entries exceeding the budget are evicted by the policy."""
+    served = tmp_path / "served"
+    served.mkdir()
+    for name in "abc":
+        (served / f"{name}.bin").write_bytes(os.urandom(40_000))
+    downloads = tmp_path / "downloads"
+    with LocalHTTPServer(str(served)) as server:
+        downloader = build_downloader(tmp_path, policy)
+        downloader.download(server.url("a.bin"))
+        downloader.download(server.url("a.bin"))
+        downloader.download(server.url("b.bin"))
+        downloader.download(server.url("c.bin"))
+        # With LRU the least recently used file is evicted, while with LFU
+        # the file accessed twice survives the one accessed once.
+        evicted = "a.bin" if policy == "lru" else "b.bin"
+        assert not os.path.exists(downloads / evicted)
+        assert sorted(os.listdir(downloads)) == sorted(
+            {".downloaders_cache", "a.bin", "b.bin", "c.bin"} - {evicted}
+        )
+        assert downloader.cache_manager.statistics() == {
+            "hits": 1,
+            "misses": 3,
+            "evictions": 1,
+            "size": 80_000,
+        }
+
+
+def test_cache_eviction_in_use(tmp_path):
+    """Test that entries in use are not evicted, and archives go with their extraction."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "a.bin").write_bytes(os.urandom(40_000))
+    (served / "b.bin").write_bytes(os.urandom(40_000))
+    (served / "c.csv.gz").write_bytes(gzip.compress(os.urandom(40_000)))
+    downloads = tmp_path / "downloads"
+    with LocalHTTPServer(str(served)) as server:
+        downloader = build_downloader(tmp_path, "lru")
+        downloader.download(server.url("c.csv.gz"))
+        assert os.path.exists(downloads / "c.csv")
+        with downloader.cache_manager.in_use(str(downloads / "c.csv.gz")):
+            downloader.download(server.url("a.bin"))
+        # The budget is exceeded, but the archive is in use and the new
+        # download is protected while it is being tracked.
+        assert sorted(os.listdir(downloads)) == [
+            ".downloaders_cache",
+            "a.bin",
+            "c.csv",
+            "c.csv.gz",
+        ]
+        downloader.download(server.url("b.bin"))
+        # The compressed file and its extraction are evicted together.
+        assert sorted(os.listdir(downloads)) == [".downloaders_cache", "a.bin", "b.bin"]
+
+
+def test_cache_eviction_thread_engine(tmp_path):
+    """Test that the archives queued for extraction by the thread engine are not evicted."""
+    served = tmp_path / "served"
+    served.mkdir()
+    for name in "abcd":
+        (served / f"{name}.csv.gz").write_bytes(gzip.compress(os.urandom(40_000)))
+    with LocalHTTPServer(str(served)) as server:
+        report = BaseDownloader(
+            engine="thread",
+            download_workers=4,
+            extract_workers=1,
+            target_directory=str(tmp_path / "downloads"),
+            cache_size=1,
+            verbose=False,
+        ).download([server.url(f"{name}.csv.gz") for name in "abcd"])
+    assert report.success.all()
+    assert report.extraction_success.all()
+
+
+def test_cache_manager_arguments(tmp_path):
+    """Test the validation of the cache manager arguments."""
+    with pytest.raises(ValueError):
+        CacheManager(str(tmp_path), max_size=10, policy="fifo")
+    with pytest.raises(ValueError):
+        CacheManager(str(tmp_path), max_size=-1)
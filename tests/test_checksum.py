@@ -0,0 +1,106 @@
+"""Test module to test the inline verification of the checksums."""
+import hashlib
+import os
+import pytest
+from downloaders import BaseDownloader
+from downloaders.downloaders.checksum import load_manifest, parse_checksum
+from tests.http_server import LocalHTTPServer
+
+
+def build_downloader(tmp_path, **kwargs) -> BaseDownloader:
+    """Return a downloader writing within the temporary directory."""
+    return BaseDownloader(
+        process_number=1,
+        target_directory=str(tmp_path / "downloads"),
+        crash_early=False,
+        verbose=False,
+        **kwargs,
+    )
+
+
+def test_parse_checksum():
+    """Test that the algorithms are parsed from the prefix or guessed from the length."""
+    digest = hashlib.sha256(b"data").hexdigest()
+    assert parse_checksum(digest) == ("sha256", digest)
+    assert parse_checksum(f"SHA256:{digest.upper()}") == ("sha256", digest)
+    assert parse_checksum("abc", algorithm="md5") == ("md5", "abc")
+    with pytest.raises(ValueError):
+        parse_checksum("abc")
+    with pytest.raises(ValueError):
+        parse_checksum("unknown:abc")
+
+
+@pytest.mark.parametrize("algorithm", ["sha256", "md5", "blake2b"])
+@pytest.mark.parametrize("engine", ["process", "thread"])
+def test_matching_checksum(tmp_path, algorithm: str, engine: str):
+    """Test that downloads matching their checksum succeed and report the digest."""
+    served = tmp_path / "served"
+    served.mkdir()
+    content = os.urandom(200_000)
+    (served / "file.bin").write_bytes(content)
+    checksum = f"{algorithm}:{hashlib.new(algorithm, content).hexdigest()}"
+    with LocalHTTPServer(str(served)) as server:
+        downloader = build_downloader(tmp_path, engine=engine)
+        report = downloader.download(server.url("file.bin"), checksums=checksum)
+        assert report.success.all()
+        assert report.checksum[0] == checksum
+        # The cached file is verified as well.
+        report = downloader.download(server.url("file.bin"), checksums=checksum)
+        assert report.success.all()
+        assert report.cached.all()
+        assert report.checksum[0] == checksum
+
+
+def test_mismatching_checksum(tmp_path):
+    """Test that downloads not matching their checksum fail and are removed."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "file.bin").write_bytes(os.urandom(200_000))
+    with LocalHTTPServer(str(served)) as server:
+        downloader = build_downloader(tmp_path, resumable=True)
+        report = downloader.download(
+            server.url("file.bin"), checksums="sha256:" + "0" * 64
+        )
+        assert not report.success.any()
+        assert "checksum" in str(report.exception[0])
+        assert not os.listdir(tmp_path / "downloads")
+
+
+def test_checksum_manifest(tmp_path):
+    """Test that the expected checksums are read from manifest files."""
+    served = tmp_path / "served"
+    served.mkdir()
+    first, second = os.urandom(1000), os.urandom(1000)
+    (served / "first.bin").write_bytes(first)
+    (served / "second.bin").write_bytes(second)
+    manifest = tmp_path / "SHA256SUMS"
+    manifest.write_text(
+        f"{hashlib.sha256(first).hexdigest()}  first.bin\n"
+        f"MD5 (second.bin) = {hashlib.md5(b'other').hexdigest()}\n"
+    )
+    assert load_manifest(str(manifest)) == {
+        "first.bin": hashlib.sha256(first).hexdigest(),
+        "second.bin": f"md5:{hashlib.md5(b'other').hexdigest()}",
+    }
+    with LocalHTTPServer(str(served)) as server:
+        downloader = build_downloader(tmp_path)
+        report = downloader.download(
+            [server.url("first.bin"), server.url("second.bin")],
+            checksum_manifest=str(manifest),
+        )
+        assert report.success.tolist() == [True, False]
+
+
+def test_checksum_algorithm(tmp_path):
+    """Test that the digests are reported when only the algorithm is given."""
+    served = tmp_path / "served"
+    served.mkdir()
+    content = os.urandom(1000)
+    (served / "file.bin").write_bytes(content)
+    with LocalHTTPServer(str(served)) as server:
+        report = build_downloader(tmp_path).download(server.url("file.bin"))
+        assert report.checksum[0] is None
+        report = build_downloader(
+            tmp_path / "other", checksum_algorithm="sha1"
+        ).download(server.url("file.bin"))
+        assert report.checksum[0] == f"sha1:{hashlib.sha1(content).hexdigest()}"
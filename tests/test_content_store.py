@@ -0,0 +1,108 @@
+"""Test module to test the content-addressed store of the downloaded files."""
+import errno
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from downloaders import BaseDownloader
+from downloaders.cache import content_store
+from tests.http_server import LocalHTTPServer
+
+
+@pytest.mark.parametrize("conditionals", [True, False])
+def test_content_store(tmp_path, conditionals: bool):
+    """Test that stored files are revalidated and materialized across directories."""
+    served = tmp_path / "served"
+    served.mkdir()
+    content = os.urandom(100_000)
+    (served / "reference.bin").write_bytes(content)
+    cache_directory = str(tmp_path / "store")
+    with LocalHTTPServer(str(served), conditionals=conditionals) as server:
+        url = server.url("reference.bin")
+        reports = [
+            BaseDownloader(
+                process_number=1,
+                target_directory=str(tmp_path / directory),
+                cache_directory=cache_directory,
+                verbose=False,
+            ).download(url)
+            for directory in ("first", "second")
+        ]
+        assert not reports[0].cached[0]
+        assert reports[1].cached[0]
+        assert reports[1].status_code[0] == (304 if conditionals else 200)
+        assert server.requests.get(304, 0) == (1 if conditionals else 0)
+        first = tmp_path / "first" / "reference.bin"
+        second = tmp_path / "second" / "reference.bin"
+        assert second.read_bytes() == content
+        assert os.path.samefile(first, second)
+
+        # A truncated file is not a valid cache hit.
+        os.remove(first)
+        first.write_bytes(content[:1000])
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "first"),
+            cache_directory=cache_directory,
+            verbose=False,
+        ).download(url)
+        assert report.cached[0]
+        assert first.read_bytes() == content
+
+        # A changed remote file is downloaded again.
+        changed = os.urandom(50_000)
+        (served / "reference.bin").write_bytes(changed)
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "third"),
+            cache_directory=cache_directory,
+            verbose=False,
+        ).download(url)
+        assert not report.cached[0]
+        assert (tmp_path / "third" / "reference.bin").read_bytes() == changed
+        assert second.read_bytes() == content
+
+
+def test_link_or_copy_threads(tmp_path):
+    """Test that concurrent threads materialize their files without clashing."""
+    sources = []
+    for i in range(8):
+        source = tmp_path / f"{i}.bin"
+        source.write_bytes(os.urandom(10_000))
+        sources.append(source)
+    destination = str(tmp_path / "destination.bin")
+    with ThreadPoolExecutor(8) as executor:
+        for future in [
+            executor.submit(content_store.link_or_copy, str(source), destination)
+            for source in sources * 10
+        ]:
+            future.result()
+    assert any(
+        (tmp_path / "destination.bin").read_bytes() == source.read_bytes()
+        for source in sources
+    )
+    for source in sources:
+        assert source.stat().st_size == 10_000
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [source.name for source in sources] + ["destination.bin"]
+    )
+
+
+@pytest.mark.parametrize("error", [errno.EXDEV, errno.EEXIST])
+def test_link_or_copy_errors(tmp_path, monkeypatch, error: int):
+    """Test that only the files which cannot be hardlinked are copied."""
+    source = tmp_path / "source.bin"
+    source.write_bytes(os.urandom(10_000))
+
+    def failing_link(*args):
+        raise OSError(error, os.strerror(error))
+
+    monkeypatch.setattr(os, "link", failing_link)
+    destination = str(tmp_path / "destination.bin")
+    if error == errno.EEXIST:
+        with pytest.raises(OSError):
+            content_store.link_or_copy(str(source), destination)
+        assert not os.path.exists(destination)
+    else:
+        content_store.link_or_copy(str(source), destination)
+        assert (tmp_path / "destination.bin").read_bytes() == source.read_bytes()
+        assert os.stat(destination).st_ino != source.stat().st_ino
@@ -0,0 +1,175 @@
+"""Test module to test the deduplication of the downloads of the same files."""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import sleep
+import pytest
+from downloaders import BaseDownloader
+from downloaders.downloaders.deduplication import DestinationLock, TaskCoalescer
+from tests.http_server import LocalHandler, LocalHTTPServer
+
+
+class SlowHandler(LocalHandler):
+    """Handler delaying the responses, so that the downloads overlap."""
+
+    def do_GET(self):
+        """Serve the file after a delay."""
+        sleep(0.5)
+        super().do_GET()
+
+
+@pytest.fixture
+def served(tmp_path) -> str:
+    """Return the directory with the files to serve."""
+    directory = tmp_path / "served"
+    directory.mkdir()
+    for name in ("0.bin", "1.bin"):
+        (directory / name).write_bytes(os.urandom(10000))
+    return str(directory)
+
+
+@pytest.mark.parametrize(
+    "engine,process_number",
+    [("process", 1), ("process", 4), ("thread", 4), ("asyncio", 1)],
+)
+def test_batch_deduplication(tmp_path, served: str, engine: str, process_number: int):
+    """Test that the same url or destination within a batch is downloaded once."""
+    with LocalHTTPServer(served, handler=SlowHandler) as server:
+        downloader = BaseDownloader(
+            process_number=process_number,
+            download_workers=4,
+            engine=engine,
+            target_directory=str(tmp_path / "downloads"),
+            verbose=False,
+        )
+        destination = str(tmp_path / "downloads" / "same.bin")
+        # The third url shares the destination of the first one, and keeps its own url.
+        urls = [server.url("0.bin"), server.url("1.bin"), server.url("1.bin"), server.url("1.bin")]
+        paths = [destination, None, destination, None]
+        report = downloader.download(urls, paths)
+        assert report.success.all()
+        assert report.url.tolist() == urls
+        assert report.cached.tolist() == [False, False, True, True]
+        assert server.requests == {200: 2}
+        assert downloader.metrics.snapshot()["downloaded_bytes"] == 20000
+
+
+def download_file(url: str, destination: str) -> bool:
+    """Download the given file within a new downloader, returning whether it was cached."""
+    downloader = BaseDownloader(process_number=1, verbose=False)
+    return bool(downloader.download(url, destination).cached[0])
+
+
+def test_concurrent_processes(tmp_path, served: str):
+    """Test that a process waits for the download of the same file by another one."""
+    destination = str(tmp_path / "downloads" / "0.bin")
+    with LocalHTTPServer(served, handler=SlowHandler) as server:
+        with ProcessPoolExecutor(2) as executor:
+            futures = [
+                executor.submit(download_file, server.url("0.bin"), destination)
+                for _ in range(2)
+            ]
+            assert sorted(future.result() for future in futures) == [False, True]
+        assert server.requests == {200: 1}
+    with open(destination, "rb") as f:
+        assert f.read() == (tmp_path / "served" / "0.bin").read_bytes()
+
+
+def test_destination_lock(tmp_path):
+    """Test that a destination cannot be locked twice."""
+    destination = str(tmp_path / "file.bin")
+    locks = str(tmp_path / "locks")
+    with DestinationLock(destination, locks):
+        assert not DestinationLock(destination, locks).acquire(blocking=False)
+    lock = DestinationLock(destination, locks)
+    assert lock.acquire(blocking=False)
+    lock.release()
+    lock.release()
+    # The lock files are removed once released.
+    assert os.listdir(locks) == []
+
+
+def test_destination_lock_threads(tmp_path):
+    """Test that the lock is held by one thread at a time while its files are removed."""
+    destination = str(tmp_path / "file.bin")
+    locks = str(tmp_path / "locks")
+    holders = []
+    overlaps = []
+
+    def hold():
+        for _ in range(50):
+            with DestinationLock(destination, locks):
+                holders.append(1)
+                overlaps.append(len(holders) > 1)
+                holders.pop()
+
+    with ThreadPoolExecutor(4) as executor:
+        for future in [executor.submit(hold) for _ in range(4)]:
+            future.result()
+    assert not any(overlaps)
+    assert os.listdir(locks) == []
+
+
+def test_destination_lock_permission_error(tmp_path, monkeypatch):
+    """Test that the downloads proceed without the lock when it cannot be written."""
+
+    def denied(*args, **kwargs):
+        raise PermissionError("Permission denied")
+
+    monkeypatch.setattr(os, "makedirs", denied)
+    lock = DestinationLock(str(tmp_path / "file.bin"), str(tmp_path / "locks"))
+    assert lock.acquire(blocking=False)
+    lock.release()
+
+
+def test_coalescer():
+    """Test that only the duplicates of the pending tasks are coalesced."""
+    coalescer = TaskCoalescer()
+    tasks = coalescer.unique(
+        [
+            dict(url="a", destination=None),
+            dict(url="b", destination="b.bin"),
+            dict(url="a", destination=None),
+            dict(url="c", destination="b.bin"),
+            dict(url="a", destination=None),
+        ]
+    )
+    assert next(tasks)["url"] == "a"
+    assert next(tasks)["url"] == "b"
+    report = dict(success=True, cached=False, throughput=1.0)
+    failed = dict(success=False, cached=False, throughput=None)
+    # The first task completes before its duplicate is read, which is submitted again.
+    assert list(coalescer.resolve(0, report)) == [(0, report)]
+    assert [task["url"] for task in tasks] == ["a"]
+    cached = dict(success=True, cached=True, throughput=None)
+    # The duplicates keep their own url.
+    assert list(coalescer.resolve(1, report)) == [
+        (1, report),
+        (3, {**cached, "url": "c"}),
+    ]
+    assert list(coalescer.resolve(2, failed)) == [
+        (2, failed),
+        (4, {**failed, "url": "a"}),
+    ]
+
+
+def test_coalescer_remember_completed():
+    """Test that the duplicates of the completed tasks are not submitted when remembered."""
+    coalescer = TaskCoalescer(remember_completed=True)
+    tasks = coalescer.unique([dict(url="a", destination=None)] * 3)
+    assert next(tasks)["url"] == "a"
+    report = dict(success=True, cached=False, throughput=1.0)
+    assert list(coalescer.resolve(0, report)) == [(0, report)]
+    assert list(tasks) == []
+    cached = dict(success=True, cached=True, throughput=None, url="a")
+    assert list(coalescer.ready()) == [(1, cached), (2, cached)]
+
+
+def test_coalescer_checksums():
+    """Test that the tasks expecting different checksums are not coalesced."""
+    coalescer = TaskCoalescer()
+    tasks = [
+        dict(url="a", destination="a.bin", checksum="sha256:0"),
+        dict(url="a", destination="a.bin", checksum="sha256:1"),
+        dict(url="a", destination="a.bin", checksum="sha256:0"),
+    ]
+    assert list(coalescer.unique(tasks)) == tasks[:2]
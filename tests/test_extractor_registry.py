@@ -0,0 +1,150 @@
+"""Test module to test the extractor registry and the extractors of the optional formats."""
+import importlib
+import io
+import os
+import sys
+import tarfile
+import pytest
+from downloaders import BaseDownloader
+from downloaders.extractors import AutoExtractor, BaseExtractor, register_extractor
+from downloaders.extractors import registry, zstd_extractor
+from downloaders.extractors.format_detector import sniff_file
+from downloaders.extractors.registry import unregister_extractor
+from tests.http_server import LocalHTTPServer
+
+CONTENT = b"a,b\n" * 20_000
+
+
+def make_tar() -> bytes:
+    """Return a tar archive with a file within a nested directory."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        info = tarfile.TarInfo("nested/data.csv")
+        info.size = len(CONTENT)
+        tar.addfile(info, io.BytesIO(CONTENT))
+    return buffer.getvalue()
+
+
+def compressors():
+    """Return the compressors of the formats, skipping the ones not installed."""
+    import bz2
+    import lzma
+
+    zstandard = pytest.importorskip("zstandard")
+    lz4_frame = pytest.importorskip("lz4.frame")
+    return {
+        "zst": zstandard.ZstdCompressor().compress,
+        "lz4": lz4_frame.compress,
+        "xz": lzma.compress,
+        "bz2": bz2.compress,
+    }
+
+
+@pytest.fixture
+def served(tmp_path) -> str:
+    """Return the directory with the archives to serve."""
+    directory = tmp_path / "served"
+    directory.mkdir()
+    tar = make_tar()
+    for extension, compress in compressors().items():
+        (directory / f"{extension}.csv.{extension}").write_bytes(compress(CONTENT))
+        (directory / f"{extension}.tar.{extension}").write_bytes(compress(tar))
+    return str(directory)
+
+
+@pytest.mark.parametrize("stream_extraction", [False, True])
+def test_optional_formats(tmp_path, served: str, stream_extraction: bool):
+    """Test that the files and the tar archives are extracted in a single step."""
+    names = sorted(os.listdir(served))
+    with LocalHTTPServer(served) as server:
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            stream_extraction=stream_extraction,
+            delete_original_after_extraction=True,
+            block_size=1024,
+            verbose=False,
+        ).download([server.url(name) for name in names])
+    assert report.success.all()
+    assert report.extraction_success.all()
+    downloads = tmp_path / "downloads"
+    extensions = sorted(compressors())
+    assert sorted(os.listdir(downloads)) == sorted(
+        extensions + [f"{extension}.csv" for extension in extensions]
+    )
+    for extension in extensions:
+        assert (downloads / f"{extension}.csv").read_bytes() == CONTENT
+        assert (downloads / extension / "nested" / "data.csv").read_bytes() == CONTENT
+
+
+def test_missing_optional_dependency(tmp_path, monkeypatch):
+    """Test that the files of a format whose dependency is missing are kept as they are."""
+    path = tmp_path / "data.csv.zst"
+    path.write_bytes(compressors()["zst"](CONTENT))
+    monkeypatch.setattr(zstd_extractor, "is_available", lambda module: False)
+    assert not AutoExtractor().can_extract(str(path))
+    monkeypatch.undo()
+    assert AutoExtractor().can_extract(str(path))
+
+
+def test_missing_importlib_metadata(monkeypatch):
+    """Test that the entry points are skipped where importlib.metadata is missing."""
+    monkeypatch.delattr(importlib, "metadata", raising=False)
+    monkeypatch.setitem(sys.modules, "importlib.metadata", None)
+    monkeypatch.setitem(sys.modules, "importlib_metadata", None)
+    monkeypatch.setattr(registry, "_entry_point_extractors", None)
+    assert registry.entry_point_extractors() == []
+    assert AutoExtractor().can_extract("example.csv.gz")
+
+
+def test_truncated_tar(tmp_path):
+    """Test that a truncated compressed tar archive leaves no partial extraction."""
+    path = tmp_path / "data.tar.zst"
+    path.write_bytes(compressors()["zst"](make_tar())[:-100])
+    sniff_file.cache_clear()
+    with pytest.raises((EOFError, tarfile.TarError)):
+        AutoExtractor().extract(str(path))
+    assert os.listdir(tmp_path) == ["data.tar.zst"]
+
+
+def test_register_extractor(tmp_path):
+    """Test that the registered extractors take priority over the built-in ones."""
+
+    @register_extractor
+    class UpperExtractor(BaseExtractor):
+        """Extractor turning the text files to upper case."""
+
+        def __init__(
+            self,
+            cache: bool = True,
+            delete_original_after_extraction: bool = True,
+            fsync: bool = False,
+        ):
+            super().__init__(
+                extension=".txt",
+                cache=cache,
+                delete_original_after_extraction=delete_original_after_extraction,
+                fsync=fsync,
+            )
+
+        def can_extract(self, source: str) -> bool:
+            return source.endswith(".txt")
+
+        def _extract(self, source: str, destination: str):
+            with open(source, "r", encoding="utf8") as f:
+                content = f.read()
+            with open(destination, "w", encoding="utf8") as f:
+                f.write(content.upper())
+
+    try:
+        path = tmp_path / "hello.txt"
+        path.write_text("hello", encoding="utf8")
+        extractor = AutoExtractor()
+        assert isinstance(extractor.get_supported_extractor(str(path)), UpperExtractor)
+        extractor.extract(str(path))
+        assert (tmp_path / "hello").read_text(encoding="utf8") == "HELLO"
+    finally:
+        unregister_extractor(UpperExtractor)
+    assert not AutoExtractor().can_extract(str(path))
+    with pytest.raises(ValueError):
+        register_extractor(object)
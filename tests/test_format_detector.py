@@ -0,0 +1,55 @@
+"""Test module to test the memoized detection of the archive formats."""
+import gzip
+import os
+import shutil
+from downloaders.extractors.format_detector import detect_format, sniff_file
+
+FORMATS = {
+    "archive.tar": "tar",
+    "data.zip": "zip",
+    "example.csv": None,
+    "example.csv.gz": "gzip",
+    "example.csv.xz": "xz",
+    "example.tar.bz2": "bz2",
+    "test.tar.gz": "targz",
+}
+
+
+def test_detect_format(tmp_path):
+    """Test that the formats are detected from the magic bytes alone."""
+    for name, file_format in FORMATS.items():
+        path = str(tmp_path / name.replace(".", "_"))
+        shutil.copy(os.path.join("tests/data", name), path)
+        assert detect_format(path) == file_format, name
+    assert detect_format("not_existing.tar.gz") == "targz"
+    assert detect_format("not_existing") is None
+    assert detect_format(str(tmp_path)) is None
+
+
+def test_detect_format_header_precedence(tmp_path):
+    """Test that the header of the files on disk takes precedence over their extension."""
+    bundle = str(tmp_path / "bundle.gz")
+    shutil.copy("tests/data/test.tar.gz", bundle)
+    assert detect_format(bundle) == "targz"
+    archive = str(tmp_path / "example.tar.bz2")
+    shutil.copy("tests/data/example.tar.bz2", archive)
+    assert detect_format(archive) == "tarbz2"
+    # A zip archive preceded by other data, as a self-extracting one.
+    executable = tmp_path / "installer.exe"
+    with open("tests/data/data.zip", "rb") as f:
+        executable.write_bytes(b"MZ" + os.urandom(1000) + f.read())
+    assert detect_format(str(executable)) == "zip"
+
+
+def test_detect_format_memoization(tmp_path):
+    """Test that the detection is memoized until the file changes."""
+    path = str(tmp_path / "archive")
+    with open(path, "wb") as f:
+        f.write(gzip.compress(b"hello"))
+    sniff_file.cache_clear()
+    for _ in range(10):
+        assert detect_format(path) == "gzip"
+    assert sniff_file.cache_info().misses == 1
+    shutil.copy("tests/data/data.zip", path)
+    assert detect_format(path) == "zip"
+    assert sniff_file.cache_info().misses == 2
@@ -0,0 +1,41 @@
+"""Test module to test that the slow imports are deferred until they are needed."""
+from tests.import_time import import_times
+
+# Modules which are slow to import and not needed by every download.
+DEFERRED_MODULES = ("pandas", "tqdm", "tarfile", "asyncio", "aiohttp", "sqlite3", "pyarrow")
+
+
+def test_import_package():
+    """Test that importing the package imports neither its submodules nor the slow modules."""
+    modules = import_times("import downloaders")
+    assert "downloaders" in modules
+    assert not any(name.startswith("downloaders.") for name in modules)
+    assert not set(DEFERRED_MODULES + ("requests",)) & set(modules)
+
+
+def test_import_downloader():
+    """Test that creating a downloader does not import the deferred modules."""
+    modules = import_times(
+        "from downloaders import BaseDownloader; BaseDownloader(target_directory='downloads')"
+    )
+    assert "downloaders.downloaders.base_downloader" in modules
+    assert not set(DEFERRED_MODULES) & set(modules)
+    assert not any(name.startswith("downloaders.extractors") for name in modules)
+
+
+def test_lazy_attributes():
+    """Test that the public objects are still available from the packages."""
+    import downloaders
+    from downloaders.cache import CacheManager
+    from downloaders.extractors import AutoExtractor
+
+    assert downloaders.BaseDownloader.__name__ == "BaseDownloader"
+    assert "BaseDownloader" in dir(downloaders)
+    assert CacheManager.__name__ == "CacheManager"
+    assert AutoExtractor.__name__ == "AutoExtractor"
+    try:
+        downloaders.Missing
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Missing attributes must raise an AttributeError.")
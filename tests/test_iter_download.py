@@ -0,0 +1,97 @@
+"""Test module to test the incremental reports of the downloads."""
+import json
+import os
+from time import sleep
+import pytest
+from downloaders import BaseDownloader
+from tests.http_server import LocalHandler, LocalHTTPServer
+
+
+class SlowHandler(LocalHandler):
+    """Handler delaying the files whose name starts with slow."""
+
+    def do_GET(self):
+        """Serve the file, after a delay if it is a slow one."""
+        if self.path.startswith("/slow"):
+            sleep(0.5)
+        super().do_GET()
+
+
+@pytest.fixture
+def served(tmp_path) -> str:
+    """Return the directory with the files to serve."""
+    directory = tmp_path / "served"
+    directory.mkdir()
+    for name in ("slow.bin", "0.bin", "1.bin", "2.bin"):
+        (directory / name).write_bytes(os.urandom(1000))
+    return str(directory)
+
+
+@pytest.mark.parametrize(
+    "engine,process_number",
+    [("process", 2), ("thread", 2), ("asyncio", 1)],
+)
+def test_completion_order(tmp_path, served: str, engine: str, process_number: int):
+    """Test that the reports are yielded as the downloads complete."""
+    with LocalHTTPServer(served, handler=SlowHandler) as server:
+        downloader = BaseDownloader(
+            process_number=process_number,
+            download_workers=2,
+            engine=engine,
+            target_directory=str(tmp_path / "downloads"),
+            verbose=False,
+        )
+        urls = [server.url(name) for name in ("slow.bin", "0.bin", "1.bin", "2.bin")]
+        reports = list(downloader.iter_download(urls))
+        assert all(report["success"] for report in reports)
+        assert sorted(report["url"] for report in reports) == sorted(urls)
+        assert reports[-1]["url"] == urls[0]
+        # The dataframe keeps the order of the given urls.
+        assert downloader.download(urls).url.tolist() == urls
+
+
+def test_jsonl_report(tmp_path, served: str):
+    """Test that the reports written before a crash are kept."""
+    report_path = str(tmp_path / "reports" / "report.jsonl")
+    with LocalHTTPServer(served) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            verbose=False,
+        )
+        urls = [server.url(name) for name in ("0.bin", "1.bin", "missing.bin", "2.bin")]
+        with pytest.raises(ValueError):
+            downloader.download(urls, report_path=report_path)
+        with open(report_path) as f:
+            reports = [json.loads(line) for line in f]
+        assert [report["url"] for report in reports] == urls[:2]
+        # The reports of the following batches are appended.
+        downloader.download(urls[3], report_path=report_path)
+        with open(report_path) as f:
+            assert len(f.readlines()) == 3
+
+
+def test_parquet_report(tmp_path, served: str):
+    """Test that the reports are written to Parquet."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    report_path = str(tmp_path / "report.parquet")
+    with LocalHTTPServer(served) as server:
+        BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            crash_early=False,
+            verbose=False,
+        ).download(
+            [server.url("0.bin"), server.url("missing.bin")], report_path=report_path
+        )
+    table = pq.read_table(report_path).to_pydict()
+    assert table["success"] == [True, False]
+    assert table["status_code"] == [200, 404]
+
+
+def test_invalid_report_path(tmp_path):
+    """Test that unsupported report paths are rejected."""
+    with pytest.raises(ValueError):
+        BaseDownloader(target_directory=str(tmp_path)).download(
+            "http://localhost/file.bin", report_path=str(tmp_path / "report.csv")
+        )
@@ -0,0 +1,74 @@
+"""Test module to test the reuse of pooled keep-alive connections."""
+import os
+from time import sleep
+import pytest
+from downloaders import BaseDownloader
+from downloaders.downloaders.session import get_session
+from tests.http_server import LocalHandler, LocalHTTPServer
+
+
+class SlowHandler(LocalHandler):
+    """Handler answering after a pause, so that the requests overlap."""
+
+    def do_GET(self):
+        """Send the requested file after a pause."""
+        sleep(0.05)
+        super().do_GET()
+
+
+def test_keep_alive(tmp_path):
+    """Test that the downloads of a worker share a single connection."""
+    served = tmp_path / "served"
+    served.mkdir()
+    for i in range(20):
+        (served / f"file_{i}.txt").write_bytes(os.urandom(128))
+    with LocalHTTPServer(str(served)) as server:
+        urls = [server.url(f"file_{i}.txt") for i in range(20)]
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            verbose=False,
+        )
+        report = downloader.download(urls)
+        assert report.success.all()
+        assert server.connections == 1
+        for i in range(20):
+            assert (tmp_path / "downloads" / f"file_{i}.txt").read_bytes() == (
+                served / f"file_{i}.txt"
+            ).read_bytes()
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "no_keep_alive"),
+            verbose=False,
+            keep_alive=False,
+        )
+        downloader.download(urls)
+        assert server.connections == 21
+
+
+def test_session_configuration():
+    """Test that sessions are cached by configuration."""
+    assert get_session(4, 1) is get_session(4, 1)
+    assert get_session(4, 1) is not get_session(8, 1)
+    with pytest.raises(ValueError):
+        BaseDownloader(pool_size=0)
+    with pytest.raises(ValueError):
+        BaseDownloader(http_retries=-1)
+
+
+def test_pool_sized_by_workers(tmp_path):
+    """Test that the connections of the thread engine workers are all kept alive."""
+    served = tmp_path / "served"
+    served.mkdir()
+    for i in range(128):
+        (served / f"{i}.bin").write_bytes(os.urandom(1024))
+    with LocalHTTPServer(str(served), handler=SlowHandler) as server:
+        report = BaseDownloader(
+            engine="thread",
+            download_workers=16,
+            pool_size=4,
+            target_directory=str(tmp_path / "downloads"),
+            verbose=False,
+        ).download([server.url(f"{i}.bin") for i in range(128)])
+        assert report.success.all()
+        assert server.connections <= 16
@@ -0,0 +1,92 @@
+"""Test module to test the downloads driven by a manifest and their journal."""
+import csv
+import json
+import os
+import pytest
+from downloaders import BaseDownloader
+from downloaders.downloaders.manifest import DownloadJournal, iter_manifest
+from tests.http_server import LocalHTTPServer
+
+
+@pytest.fixture
+def served(tmp_path) -> str:
+    """Return the directory with the files to serve."""
+    directory = tmp_path / "served"
+    directory.mkdir()
+    for i in range(10):
+        (directory / f"{i}.bin").write_bytes(os.urandom(1000))
+    return str(directory)
+
+
+def write_manifest(path: str, rows):
+    """Write the given rows to a CSV manifest."""
+    with open(path, "w", encoding="utf8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["url", "path", "size"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+@pytest.mark.parametrize("engine", ["process", "thread", "asyncio"])
+def test_download_manifest(tmp_path, served: str, engine: str):
+    """Test that the completed tasks are skipped when the download is restarted."""
+    manifest_path = str(tmp_path / "manifest.csv")
+    with LocalHTTPServer(served) as server:
+        rows = [
+            dict(
+                url=server.url(f"{i}.bin"),
+                path=str(tmp_path / "downloads" / f"{i}.bin"),
+                size=1000,
+            )
+            for i in range(10)
+        ]
+        # A missing file and a file with an unexpected size fail.
+        rows.append(dict(url=server.url("missing.bin"), path="", size=""))
+        rows[3]["size"] = 999
+        write_manifest(manifest_path, rows)
+        downloader = BaseDownloader(
+            process_number=2,
+            engine=engine,
+            crash_early=False,
+            target_directory=str(tmp_path / "downloads"),
+            verbose=False,
+        )
+        assert downloader.download_manifest(manifest_path) == {
+            "downloaded": 9,
+            "failed": 2,
+            "skipped": 0,
+        }
+        assert not os.path.exists(rows[3]["path"])
+        # The completed tasks are skipped even if their files were moved.
+        os.remove(rows[0]["path"])
+        rows[3]["size"] = 1000
+        write_manifest(manifest_path, rows)
+        responses = sum(server.requests.values())
+        assert downloader.download_manifest(manifest_path) == {
+            "downloaded": 1,
+            "failed": 1,
+            "skipped": 9,
+        }
+        assert sum(server.requests.values()) == responses + 2
+        assert os.path.exists(rows[3]["path"])
+    journal = DownloadJournal(f"{manifest_path}.journal.sqlite")
+    assert journal.statistics() == {"completed": 10, "failed": 1}
+    assert not journal.is_completed(server.url("missing.bin"), None)
+    journal.close()
+
+
+def test_iter_manifest(tmp_path):
+    """Test that the manifests are parsed and validated."""
+    path = str(tmp_path / "manifest.jsonl")
+    with open(path, "w", encoding="utf8") as f:
+        f.write(json.dumps({"url": "http://host/a", "checksum": "md5:0"}) + "\n\n")
+        f.write(json.dumps({"url": "http://host/b", "path": "b", "size": 3}) + "\n")
+    assert list(iter_manifest(path)) == [
+        dict(url="http://host/a", destination=None, checksum="md5:0", size=None),
+        dict(url="http://host/b", destination="b", checksum=None, size=3),
+    ]
+    with open(path, "a", encoding="utf8") as f:
+        f.write(json.dumps({"url": "http://host/c", "mirror": "x"}) + "\n")
+    with pytest.raises(ValueError):
+        list(iter_manifest(path))
+    with pytest.raises(ValueError):
+        list(iter_manifest(str(tmp_path / "manifest.txt")))
@@ -0,0 +1,85 @@
+"""Test module to test the timings of the reports and the metrics of the downloads."""
+import gzip
+import os
+import pytest
+from downloaders import BaseDownloader
+from downloaders.downloaders.metrics import DownloadMetrics
+from tests.http_server import LocalHTTPServer
+
+
+@pytest.fixture
+def served(tmp_path) -> str:
+    """Return the directory with the files to serve."""
+    directory = tmp_path / "served"
+    directory.mkdir()
+    for i in range(4):
+        (directory / f"{i}.bin").write_bytes(os.urandom(50_000))
+    (directory / "data.txt.gz").write_bytes(gzip.compress(b"data" * 10_000))
+    return str(directory)
+
+
+@pytest.mark.parametrize("engine", ["process", "asyncio"])
+def test_timings(tmp_path, served: str, engine: str):
+    """Test that the reports include the timings of the downloads."""
+    with LocalHTTPServer(served) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            engine=engine,
+            target_directory=str(tmp_path / "downloads"),
+            verbose=False,
+        )
+        report = downloader.download([server.url("0.bin"), server.url("data.txt.gz")])
+        assert report.success.all()
+        assert report.connect_time[0] > 0
+        assert (report.ttfb > 0).all()
+        assert (report.transfer_time >= 0).all()
+        assert (report.elapsed_time >= report.transfer_time).all()
+        assert report.extraction_time[1] > 0
+        if engine == "process":
+            # The second download reuses the keep-alive connection.
+            assert report.connect_time.isna()[1]
+
+
+def test_metrics_hook(tmp_path, served: str):
+    """Test that the reports of the pool workers are observed by the calling process."""
+    reports = []
+    with LocalHTTPServer(served) as server:
+        downloader = BaseDownloader(
+            process_number=2,
+            target_directory=str(tmp_path / "downloads"),
+            crash_early=False,
+            metrics_hook=lambda report: reports.append(report),
+            verbose=False,
+        )
+        urls = [server.url(f"{i}.bin") for i in range(4)] + [server.url("missing.bin")]
+        downloader.download(urls)
+        downloader.download(urls[0])
+    assert sorted(report["url"] for report in reports) == sorted(urls + urls[:1])
+    metrics = downloader.metrics.snapshot()
+    assert metrics["downloads"] == 6
+    assert metrics["failures"] == 1
+    assert metrics["cached"] == 1
+    assert metrics["downloaded_bytes"] == 4 * 50_000
+    assert metrics["ttfb"]["count"] == 5
+    assert metrics["extraction_time"]["count"] == 0
+
+
+def test_prometheus():
+    """Test the Prometheus exposition of the metrics."""
+    metrics = DownloadMetrics()
+    metrics.observe(
+        dict(
+            success=True,
+            cached=False,
+            attempts=3,
+            downloaded_file_size=100,
+            ttfb=0.02,
+            transfer_time=float("nan"),
+        )
+    )
+    text = metrics.to_prometheus()
+    assert "downloaders_retries_total 2" in text
+    assert "downloaders_downloaded_bytes_total 100" in text
+    assert 'downloaders_ttfb_seconds_bucket{le="0.01"} 0' in text
+    assert 'downloaders_ttfb_seconds_bucket{le="0.025"} 1' in text
+    assert "downloaders_transfer_time_seconds_count 0" in text
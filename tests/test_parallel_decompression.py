@@ -0,0 +1,75 @@
+"""Test module to test the parallel decompression of the bzip2 and xz files."""
+import bz2
+import lzma
+import os
+import random
+import pytest
+from downloaders.extractors import AutoExtractor
+from downloaders.extractors import parallel_decompression
+from downloaders.extractors.bz2_extractor import BZ2Extractor
+from downloaders.extractors.xz_extractor import XzExtractor
+
+CONTENT = os.urandom(1_200_000).hex().encode()
+PARTS = [CONTENT[i : i + 600_000] for i in range(0, len(CONTENT), 600_000)]
+
+COMPRESSED = {
+    "blocks.bin.bz2": lambda: bz2.compress(CONTENT, 1),
+    "streams.bin.bz2": lambda: b"".join(bz2.compress(part, 2) for part in PARTS),
+    "streams.bin.xz": lambda: b"".join(lzma.compress(part) for part in PARTS),
+}
+
+
+@pytest.mark.parametrize("name", sorted(COMPRESSED))
+def test_parallel_decompression(tmp_path, name: str):
+    """Test that the parallel decompression matches the decompressed content."""
+    path = tmp_path / name
+    path.write_bytes(COMPRESSED[name]())
+    report = AutoExtractor(processes=2).extract(str(path))[0]
+    with open(report["destination"], "rb") as f:
+        assert f.read() == CONTENT
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [name, os.path.basename(report["destination"])]
+    )
+
+
+def test_serial_fallback(tmp_path):
+    """Test that the files made of a single block are decompressed serially."""
+    path = tmp_path / "single.bin.xz"
+    path.write_bytes(lzma.compress(CONTENT))
+    destination = str(tmp_path / "single.bin")
+    assert not parallel_decompression.parallel_xz_decompress(str(path), destination, 2)
+    XzExtractor(processes=2).extract(str(path))
+    with open(destination, "rb") as f:
+        assert f.read() == CONTENT
+
+
+def test_magic_numbers_by_chance(tmp_path, monkeypatch):
+    """Test that the boundaries appearing by chance within the blocks are skipped."""
+    path = tmp_path / "blocks.bin.bz2"
+    path.write_bytes(COMPRESSED["blocks.bin.bz2"]())
+    boundaries = parallel_decompression.bz2_boundaries
+
+    def with_chance_boundaries(source: str):
+        starts, candidates = boundaries(source)
+        generator = random.Random(42)
+        chance = {
+            generator.randrange(candidates[0], candidates[-1]) for _ in range(10)
+        }
+        return starts | set(list(chance)[:5]), sorted(set(candidates) | chance)
+
+    monkeypatch.setattr(
+        parallel_decompression, "bz2_boundaries", with_chance_boundaries
+    )
+    BZ2Extractor(processes=2).extract(str(path))
+    with open(tmp_path / "blocks.bin", "rb") as f:
+        assert f.read() == CONTENT
+
+
+@pytest.mark.parametrize("name", sorted(COMPRESSED))
+def test_truncated_file(tmp_path, name: str):
+    """Test that the truncated files are not decompressed."""
+    path = tmp_path / name
+    path.write_bytes(COMPRESSED[name]()[:-5000])
+    with pytest.raises((EOFError, OSError)):
+        AutoExtractor(processes=2).extract(str(path))
+    assert os.listdir(tmp_path) == [name]
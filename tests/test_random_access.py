@@ -0,0 +1,72 @@
+"""Test module to test the random access to the content of compressed files."""
+import bz2
+import gzip
+import json
+import lzma
+import os
+import random
+import pytest
+from downloaders.extractors import AutoExtractor
+from downloaders.extractors.random_access import CHECKPOINTS_SUFFIX, find_bit_pattern
+
+CONTENT = os.urandom(1_500_000).hex().encode()
+PARTS = [CONTENT[i : i + 1_000_000] for i in range(0, len(CONTENT), 1_000_000)]
+
+COMPRESSED = {
+    # Each member, stream or block is a checkpoint.
+    "multi.bin.gz": lambda: b"".join(gzip.compress(part) for part in PARTS),
+    "single.bin.gz": lambda: gzip.compress(CONTENT),
+    "multi.bin.xz": lambda: b"".join(lzma.compress(part) for part in PARTS),
+    "single.bin.bz2": lambda: bz2.compress(CONTENT, 1),
+    "multi.bin.bz2": lambda: b"".join(bz2.compress(part, 2) for part in PARTS),
+}
+
+
+@pytest.mark.parametrize("name", sorted(COMPRESSED))
+def test_random_access(tmp_path, name: str):
+    """Test that the random reads match the decompressed content."""
+    path = tmp_path / name
+    path.write_bytes(COMPRESSED[name]())
+    extractor = AutoExtractor()
+    generator = random.Random(42)
+    with extractor.open_extracted(str(path)) as f:
+        assert f.seekable()
+        assert f.seek(0, os.SEEK_END) == len(CONTENT)
+        assert f.read() == b""
+        for _ in range(20):
+            position = generator.randrange(len(CONTENT))
+            size = generator.randrange(1, 100_000)
+            f.seek(position)
+            assert f.read(size) == CONTENT[position : position + size]
+        f.seek(0)
+        assert f.read() == CONTENT
+    with open(f"{path}{CHECKPOINTS_SUFFIX}", "r", encoding="utf8") as f:
+        checkpoints = json.load(f)["entries"]
+    assert len(checkpoints) > 1 or name.startswith("single.bin.gz")
+    assert sorted(os.listdir(tmp_path)) == sorted([name, f"{name}{CHECKPOINTS_SUFFIX}"])
+    # The cached checkpoints are used by the following readers.
+    with extractor.open_extracted(str(path)) as f:
+        f.seek(len(CONTENT) - 10)
+        assert f.read() == CONTENT[-10:]
+
+
+def test_truncated_file(tmp_path):
+    """Test that the checkpoints of a truncated file are not built."""
+    path = tmp_path / "truncated.bin.gz"
+    path.write_bytes(gzip.compress(CONTENT)[:-1000])
+    with pytest.raises(EOFError):
+        AutoExtractor().open_extracted(str(path))
+
+
+def test_unsupported_format():
+    """Test that the random access to the members of an archive is rejected."""
+    with pytest.raises(ValueError):
+        AutoExtractor().open_extracted("tests/data/data.zip")
+
+
+def test_find_bit_pattern():
+    """Test that the patterns are found at any bit offset."""
+    pattern = 0x314159265359
+    for offset in range(0, 100, 7):
+        data = (pattern << (200 - offset - 48)).to_bytes(25, "big")
+        assert find_bit_pattern(data, pattern, 48) == [offset]
@@ -0,0 +1,142 @@
+"""Test module to test the per-host rate and connection limits."""
+import os
+import threading
+from time import perf_counter, sleep
+import pytest
+from downloaders import BaseDownloader
+from downloaders.downloaders.rate_limiter import HostLimiter, parse_retry_after
+from tests.http_server import LocalHandler, LocalHTTPServer
+
+
+class ConcurrencyHandler(LocalHandler):
+    """Handler recording the maximum number of concurrent requests."""
+
+    lock = threading.Lock()
+    active = 0
+    maximum = 0
+
+    def do_GET(self):
+        """Serve the file slowly, tracking the concurrent requests."""
+        cls = ConcurrencyHandler
+        with cls.lock:
+            cls.active += 1
+            cls.maximum = max(cls.maximum, cls.active)
+        try:
+            sleep(0.05)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+class RetryAfterHandler(LocalHandler):
+    """Handler answering the first request with a 429 and a Retry-After header."""
+
+    throttled = False
+
+    def do_GET(self):
+        """Throttle the first request, then serve the files."""
+        if not RetryAfterHandler.throttled:
+            RetryAfterHandler.throttled = True
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+def serve_files(tmp_path, number: int) -> str:
+    """Return the directory with the given number of small files to serve."""
+    served = tmp_path / "served"
+    served.mkdir()
+    for i in range(number):
+        (served / f"{i}.bin").write_bytes(os.urandom(1000))
+    return str(served)
+
+
+def test_parse_retry_after():
+    """Test the parsing of the Retry-After header."""
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+def test_invalid_limits(tmp_path):
+    """Test that invalid limits are rejected."""
+    with pytest.raises(ValueError):
+        HostLimiter(str(tmp_path), rate=0)
+    with pytest.raises(ValueError):
+        HostLimiter(str(tmp_path), connections=0)
+    with pytest.raises(ValueError):
+        HostLimiter(str(tmp_path), hosts={"example.com": {"speed": 1}})
+
+
+@pytest.mark.parametrize("engine", ["process", "thread", "asyncio"])
+def test_rate_limit(tmp_path, engine: str):
+    """Test that the rate limit is shared across all the workers."""
+    served = serve_files(tmp_path, 6)
+    with LocalHTTPServer(served) as server:
+        downloader = BaseDownloader(
+            process_number=3,
+            engine=engine,
+            target_directory=str(tmp_path / "downloads"),
+            rate_limit=10,
+            verbose=False,
+        )
+        start = perf_counter()
+        report = downloader.download([server.url(f"{i}.bin") for i in range(6)])
+        assert report.success.all()
+        # The first request consumes the initial token, the others wait 0.1s each.
+        assert perf_counter() - start >= 0.45
+
+
+def test_host_limits(tmp_path):
+    """Test that the limits of specific hosts override the default ones."""
+    served = serve_files(tmp_path, 4)
+    with LocalHTTPServer(served) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            rate_limit=0.1,
+            host_limits={"127.0.0.1": {"rate": 1000}},
+            verbose=False,
+        )
+        start = perf_counter()
+        report = downloader.download([server.url(f"{i}.bin") for i in range(4)])
+        assert report.success.all()
+        assert perf_counter() - start < 5
+
+
+def test_connections_per_host(tmp_path):
+    """Test that the concurrent connections towards a host are capped."""
+    served = serve_files(tmp_path, 12)
+    with LocalHTTPServer(served, handler=ConcurrencyHandler) as server:
+        downloader = BaseDownloader(
+            engine="thread",
+            download_workers=8,
+            target_directory=str(tmp_path / "downloads"),
+            max_connections_per_host=2,
+            verbose=False,
+        )
+        report = downloader.download([server.url(f"{i}.bin") for i in range(12)])
+        assert report.success.all()
+        assert ConcurrencyHandler.maximum == 2
+
+
+def test_retry_after(tmp_path):
+    """Test that a Retry-After header pauses the requests towards the host."""
+    served = serve_files(tmp_path, 2)
+    with LocalHTTPServer(served, handler=RetryAfterHandler) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            max_connections_per_host=4,
+            crash_early=False,
+            verbose=False,
+        )
+        start = perf_counter()
+        report = downloader.download([server.url("0.bin"), server.url("1.bin")])
+        assert report.status_code.tolist() == [429, 200]
+        assert perf_counter() - start >= 0.9
@@ -0,0 +1,89 @@
+"""Test module to test resumable downloads."""
+import os
+import pytest
+from downloaders import BaseDownloader
+from downloaders.downloaders.resume import part_path, sidecar_path
+from tests.http_server import LocalHTTPServer
+
+
+def interrupted_download(server: LocalHTTPServer, downloader: BaseDownloader, url: str):
+    """Execute a download which is dropped by the server midway."""
+    server.truncate_at = 300_000
+    report = downloader.download(url)
+    server.truncate_at = None
+    assert not report.success.all()
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_resumable(tmp_path, ranges: bool):
+    """Test that interrupted downloads are resumed when the server supports it."""
+    served = tmp_path / "served"
+    served.mkdir()
+    content = os.urandom(1_000_000)
+    (served / "large.bin").write_bytes(content)
+    destination = str(tmp_path / "downloads" / "large.bin")
+    with LocalHTTPServer(str(served), ranges=ranges) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            crash_early=False,
+            resumable=True,
+            verbose=False,
+        )
+        interrupted_download(server, downloader, server.url("large.bin"))
+        assert not os.path.exists(destination)
+        partial_size = os.path.getsize(part_path(destination))
+        assert 0 < partial_size <= 300_000
+        report = downloader.download(server.url("large.bin"))
+        assert report.success.all()
+        assert report.file_size[0] == len(content)
+        if ranges:
+            assert report.status_code[0] == 206
+            assert report.downloaded_file_size[0] == len(content) - partial_size
+        else:
+            assert report.status_code[0] == 200
+            assert report.downloaded_file_size[0] == len(content)
+        with open(destination, "rb") as f:
+            assert f.read() == content
+        assert not os.path.exists(part_path(destination))
+        assert not os.path.exists(sidecar_path(destination))
+
+
+def test_resumable_changed_file(tmp_path):
+    """Test that the partial file is discarded when the remote file changes."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "large.bin").write_bytes(os.urandom(1_000_000))
+    destination = str(tmp_path / "downloads" / "large.bin")
+    with LocalHTTPServer(str(served)) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            crash_early=False,
+            resumable=True,
+            verbose=False,
+        )
+        interrupted_download(server, downloader, server.url("large.bin"))
+        content = os.urandom(1_200_000)
+        (served / "large.bin").write_bytes(content)
+        report = downloader.download(server.url("large.bin"))
+        assert report.status_code[0] == 200
+        with open(destination, "rb") as f:
+            assert f.read() == content
+
+
+def test_resumable_missing_file(tmp_path):
+    """Test that error responses do not leave partial files behind."""
+    with LocalHTTPServer(str(tmp_path)) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            crash_early=False,
+            resumable=True,
+            verbose=False,
+        )
+        report = downloader.download(server.url("missing.bin"))
+        assert report.status_code[0] == 404
+        assert os.listdir(tmp_path / "downloads") == []
+    with pytest.raises(ValueError):
+        BaseDownloader(engine="asyncio", resumable=True)
@@ -0,0 +1,138 @@
+"""Test module to test the retries of the failed downloads."""
+import os
+import threading
+from collections import Counter
+import pytest
+from downloaders import BaseDownloader
+from downloaders.downloaders.retry import RetryPolicy
+from tests.http_server import LocalHandler, LocalHTTPServer
+
+
+class FlakyHandler(LocalHandler):
+    """Handler answering the first requests of each existing file with a 503."""
+
+    lock = threading.Lock()
+    failures = 1
+    requests = Counter()
+
+    def do_GET(self):
+        """Fail the first requests of each file, then serve it."""
+        if self._resolve() is None:
+            self._send_missing()
+            return
+        with FlakyHandler.lock:
+            FlakyHandler.requests[self.path] += 1
+            failing = FlakyHandler.requests[self.path] <= FlakyHandler.failures
+        if failing:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+@pytest.fixture
+def served(tmp_path) -> str:
+    """Return the directory with the files to serve."""
+    FlakyHandler.requests.clear()
+    FlakyHandler.failures = 1
+    directory = tmp_path / "served"
+    directory.mkdir()
+    for i in range(4):
+        (directory / f"{i}.bin").write_bytes(os.urandom(10_000))
+    return str(directory)
+
+
+def test_retry_policy():
+    """Test the retryable failures and the backoff of the retry policy."""
+    policy = RetryPolicy(retries=2, backoff=1, max_backoff=3)
+    assert policy.attempts == 3
+    assert policy.is_retryable(503, ValueError())
+    assert policy.is_retryable(None, ConnectionResetError())
+    assert not policy.is_retryable(404, ValueError())
+    assert all(0 <= policy.delay(10) <= 3 for _ in range(100))
+    with pytest.raises(ValueError):
+        RetryPolicy(retries=-1)
+
+
+@pytest.mark.parametrize(
+    "engine,process_number",
+    [("process", 1), ("process", 2), ("thread", 1), ("asyncio", 1)],
+)
+def test_retries(tmp_path, served: str, engine: str, process_number: int):
+    """Test that the failed downloads are requeued until they succeed."""
+    with LocalHTTPServer(served, handler=FlakyHandler) as server:
+        downloader = BaseDownloader(
+            process_number=process_number,
+            engine=engine,
+            target_directory=str(tmp_path / "downloads"),
+            retries=2,
+            retry_backoff=0.01,
+            verbose=False,
+        )
+        report = downloader.download([server.url(f"{i}.bin") for i in range(4)])
+        assert report.success.all()
+        assert report.attempts.tolist() == [2, 2, 2, 2]
+        assert report.url.tolist() == [server.url(f"{i}.bin") for i in range(4)]
+
+
+def test_exhausted_retries(tmp_path, served: str):
+    """Test that the downloads are reported as failed once the attempts are exhausted."""
+    FlakyHandler.failures = 3
+    with LocalHTTPServer(served, handler=FlakyHandler) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            crash_early=False,
+            retries=1,
+            retry_backoff=0.01,
+            verbose=False,
+        )
+        report = downloader.download([server.url("0.bin"), server.url("missing.bin")])
+        assert report.success.tolist() == [False, False]
+        assert report.attempts.tolist() == [2, 1]
+        assert report.retryable.tolist() == [True, False]
+        with pytest.raises(ValueError):
+            BaseDownloader(
+                process_number=1,
+                target_directory=str(tmp_path / "downloads"),
+                retries=1,
+                retry_backoff=0.01,
+                verbose=False,
+            ).download(server.url("1.bin"))
+
+
+def test_retry_truncated(tmp_path, served: str):
+    """Test that the downloads dropped midway are retried."""
+    FlakyHandler.failures = 0
+    with LocalHTTPServer(served, handler=FlakyHandler) as server:
+        server.truncate(5000, times=1)
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            retries=1,
+            retry_backoff=0.01,
+            verbose=False,
+        ).download(server.url("0.bin"))
+        assert report.success.all()
+        assert report.attempts[0] == 2
+
+
+def test_retry_failed(tmp_path, served: str):
+    """Test that only the failed rows of a report are executed again."""
+    with LocalHTTPServer(served, handler=FlakyHandler) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            crash_early=False,
+            verbose=False,
+        )
+        urls = [server.url(f"{i}.bin") for i in range(2)]
+        downloader.download(urls[0])
+        report = downloader.download(urls)
+        assert report.success.tolist() == [True, False]
+        report = downloader.retry_failed(report)
+        assert report.success.tolist() == [True, True]
+        assert report.attempts.tolist() == [1, 2]
+        assert report.url.tolist() == urls
+        assert FlakyHandler.requests["/0.bin"] == 2
@@ -0,0 +1,63 @@
+"""Test module to test segmented downloads over multiple range requests."""
+import os
+import pytest
+from downloaders import BaseDownloader
+from downloaders.downloaders.segmented import split_segments
+from tests.http_server import LocalHTTPServer
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_segmented(tmp_path, ranges: bool):
+    """Test that large files are downloaded in segments when ranges are supported."""
+    served = tmp_path / "served"
+    served.mkdir()
+    content = os.urandom(5_000_000)
+    (served / "large.bin").write_bytes(content)
+    (served / "small.bin").write_bytes(content[:1000])
+    with LocalHTTPServer(str(served), ranges=ranges) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            segments=4,
+            segment_threshold=1_000_000,
+            verbose=False,
+        )
+        report = downloader.download([server.url("large.bin"), server.url("small.bin")])
+        assert report.success.all()
+        assert list(report.segments) == [4 if ranges else 1, 1]
+        assert (report.throughput > 0).all()
+        assert (tmp_path / "downloads" / "large.bin").read_bytes() == content
+        assert (tmp_path / "downloads" / "small.bin").read_bytes() == content[:1000]
+
+
+def test_segment_retries(tmp_path):
+    """Test that dropped segments are resumed from their last written byte."""
+    served = tmp_path / "served"
+    served.mkdir()
+    content = os.urandom(5_000_000)
+    (served / "large.bin").write_bytes(content)
+    with LocalHTTPServer(str(served)) as server:
+        downloader = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            segments=4,
+            segment_threshold=1_000_000,
+            resumable=True,
+            verbose=False,
+        )
+        # The plain request and two of the segments are dropped.
+        server.truncate(200_000, times=3)
+        report = downloader.download(server.url("large.bin"))
+        assert report.segments[0] == 4
+        assert (tmp_path / "downloads" / "large.bin").read_bytes() == content
+        assert os.listdir(tmp_path / "downloads") == ["large.bin"]
+
+
+def test_split_segments():
+    """Test that the segments cover the whole file without overlaps."""
+    assert split_segments(10, 3) == [(0, 3), (4, 7), (8, 9)]
+    assert split_segments(2, 4) == [(0, 0), (1, 1)]
+    with pytest.raises(ValueError):
+        BaseDownloader(segments=0)
+    with pytest.raises(ValueError):
+        BaseDownloader(engine="asyncio", segments=4)
@@ -0,0 +1,116 @@
+"""Test module to test the extraction of the archives while downloading."""
+import gzip
+import os
+import shutil
+import tarfile
+import pytest
+from downloaders import BaseDownloader
+from tests.http_server import LocalHTTPServer
+
+ARCHIVES = ["example.csv.gz", "example.csv.xz", "example.tar.bz2", "multi.csv.gz"]
+
+
+@pytest.mark.parametrize("delete_original", [True, False])
+def test_stream_extraction(tmp_path, delete_original: bool):
+    """Test that streamed extractions match the extractions of the downloaded files."""
+    served = tmp_path / "served"
+    served.mkdir()
+    for name in ARCHIVES[:-1]:
+        shutil.copy(os.path.join("tests/data", name), served / name)
+    # Gzip files may be the concatenation of multiple members.
+    (served / "multi.csv.gz").write_bytes(
+        gzip.compress(b"a,b\n" * 10_000) + gzip.compress(b"c,d\n" * 10_000)
+    )
+    with LocalHTTPServer(str(served)) as server:
+        urls = [server.url(name) for name in ARCHIVES]
+        reports = [
+            BaseDownloader(
+                process_number=1,
+                target_directory=str(tmp_path / str(stream_extraction)),
+                stream_extraction=stream_extraction,
+                delete_original_after_extraction=delete_original,
+                block_size=1024,
+                verbose=False,
+            ).download(urls)
+            for stream_extraction in (False, True)
+        ]
+    assert reports[1].success.all()
+    assert reports[1].extraction_success.all()
+    assert list(reports[1].extraction_file_size) == list(
+        reports[0].extraction_file_size
+    )
+    assert sorted(os.listdir(tmp_path / "True")) == sorted(
+        os.listdir(tmp_path / "False")
+    )
+    for name in ("example.csv", "example/test_file.rtf", "multi.csv"):
+        assert (tmp_path / "True" / name).read_bytes() == (
+            tmp_path / "False" / name
+        ).read_bytes()
+    assert (tmp_path / "True" / "multi.csv").read_bytes() == (
+        b"a,b\n" * 10_000 + b"c,d\n" * 10_000
+    )
+
+
+def test_stream_extraction_truncated(tmp_path):
+    """Test that truncated archives leave no partially extracted file."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "truncated.csv.gz").write_bytes(gzip.compress(os.urandom(10_000))[:5000])
+    with LocalHTTPServer(str(served)) as server:
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            stream_extraction=True,
+            crash_early=False,
+            verbose=False,
+        ).download(server.url("truncated.csv.gz"))
+    assert not report.success[0]
+    assert os.listdir(tmp_path / "downloads") == []
+
+
+def list_tree(root: str) -> list:
+    """Return the sorted relative paths and contents of the files within the given root."""
+    tree = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                tree.append((os.path.relpath(path, root), f.read()))
+    return sorted(tree)
+
+
+def test_stream_tar_extraction(tmp_path):
+    """Test that tar archives are extracted member by member while downloading."""
+    archives = ["archive.tar", "test.tar.gz"]
+    with LocalHTTPServer("tests/data") as server:
+        urls = [server.url(name) for name in archives]
+        for stream_extraction in (False, True):
+            BaseDownloader(
+                process_number=1,
+                target_directory=str(tmp_path / str(stream_extraction)),
+                stream_extraction=stream_extraction,
+                delete_original_after_extraction=True,
+                block_size=512,
+                verbose=False,
+            ).download(urls)
+    assert list_tree(str(tmp_path / "True")) == list_tree(str(tmp_path / "False"))
+    assert sorted(os.listdir(tmp_path / "True")) == ["archive", "test"]
+
+
+def test_stream_tar_path_traversal(tmp_path):
+    """Test that members escaping the destination abort the extraction."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (tmp_path / "evil.txt").write_bytes(b"evil")
+    with tarfile.open(served / "evil.tar", "w") as tar:
+        tar.add(tmp_path / "evil.txt", arcname="../evil.txt")
+    with LocalHTTPServer(str(served)) as server:
+        report = BaseDownloader(
+            process_number=1,
+            target_directory=str(tmp_path / "downloads"),
+            stream_extraction=True,
+            crash_early=False,
+            verbose=False,
+        ).download(server.url("evil.tar"))
+    assert not report.success[0]
+    assert os.listdir(tmp_path / "downloads") == []
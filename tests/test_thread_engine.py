@@ -0,0 +1,79 @@
+"""Test module to test the pipelined thread engine."""
+import os
+import shutil
+import pytest
+from downloaders import BaseDownloader
+from tests.http_server import LocalHTTPServer
+
+ARCHIVES = [
+    "archive.tar",
+    "example.csv",
+    "example.csv.gz",
+    "example.csv.xz",
+    "example.tar.bz2",
+    "data.zip",
+    "test.tar.gz",
+]
+
+
+def test_thread_engine(tmp_path):
+    """Test that the thread engine downloads and extracts like the process engine."""
+    with LocalHTTPServer("tests/data") as server:
+        urls = [server.url(name) for name in ARCHIVES]
+        reports = []
+        for engine in ("process", "thread"):
+            reports.append(
+                BaseDownloader(
+                    engine=engine,
+                    download_workers=4,
+                    extract_workers=2,
+                    target_directory=str(tmp_path / engine),
+                    verbose=False,
+                ).download(urls)
+            )
+        process_report, thread_report = reports
+        assert sorted(thread_report.columns) == sorted(process_report.columns)
+        assert thread_report.success.all()
+        assert list(thread_report.url) == urls
+        assert (
+            thread_report.extraction_success.fillna(False).tolist()
+            == process_report.extraction_success.fillna(False).tolist()
+        )
+        assert (tmp_path / "thread" / "example.csv").read_bytes() == (
+            tmp_path / "process" / "example.csv"
+        ).read_bytes()
+        assert os.path.isdir(tmp_path / "thread" / "archive")
+
+
+def test_thread_engine_failing_extraction(tmp_path):
+    """Test that failing extractions are reported and cleaned up."""
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / "broken.csv.gz").write_bytes(b"not a gzip file")
+    shutil.copy("tests/data/example.csv.gz", served / "example.csv.gz")
+    with LocalHTTPServer(str(served)) as server:
+        urls = [server.url("example.csv.gz"), server.url("broken.csv.gz")]
+        report = BaseDownloader(
+            engine="thread",
+            extract_workers=1,
+            target_directory=str(tmp_path / "downloads"),
+            crash_early=False,
+            verbose=False,
+        ).download(urls)
+        assert list(report.success) == [True, False]
+        assert not os.path.exists(tmp_path / "downloads" / "broken.csv.gz")
+        with pytest.raises(Exception):
+            BaseDownloader(
+                engine="thread",
+                extract_workers=1,
+                target_directory=str(tmp_path / "crashing"),
+                verbose=False,
+            ).download(urls)
+
+
+def test_thread_engine_arguments():
+    """Test the validation of the thread engine arguments."""
+    with pytest.raises(ValueError):
+        BaseDownloader(download_workers=0)
+    with pytest.raises(ValueError):
+        BaseDownloader(extract_workers=0)
@@ -0,0 +1,39 @@
+"""Test module to test the parallel extraction of zip archives."""
+import os
+import zipfile
+import pytest
+from downloaders.extractors import AutoExtractor
+from downloaders.extractors.zip_extraction import ZipExtractor
+
+
+def test_parallel_zip_extraction(tmp_path):
+    """Test that the parallel extraction matches the serial one."""
+    source = str(tmp_path / "many.zip")
+    with zipfile.ZipFile(source, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        for i in range(200):
+            zip_ref.writestr(f"folder_{i % 7}/nested/member_{i}.txt", f"{i}\n" * i)
+        zip_ref.writestr("empty/", b"")
+    for processes in (1, 4):
+        report = AutoExtractor(processes=processes).extract(
+            source, str(tmp_path / str(processes))
+        )[0]
+        assert report["success"]
+    for directory, _, names in os.walk(tmp_path / "1"):
+        for name in names:
+            serial = os.path.join(directory, name)
+            parallel = serial.replace(str(tmp_path / "1"), str(tmp_path / "4"), 1)
+            with open(serial, "rb") as f1, open(parallel, "rb") as f2:
+                assert f1.read() == f2.read()
+    assert os.path.isdir(tmp_path / "4" / "empty")
+    assert len(os.listdir(tmp_path / "4")) == 8
+
+
+def test_zip_slip(tmp_path):
+    """Test that members escaping the destination abort the extraction."""
+    source = str(tmp_path / "evil.zip")
+    with zipfile.ZipFile(source, "w") as zip_ref:
+        zip_ref.writestr("../evil.txt", b"evil")
+    with pytest.raises(Exception):
+        ZipExtractor(processes=2).extract(source, str(tmp_path / "evil"))
+    assert not os.path.exists(tmp_path / "evil.txt")
+    assert not os.path.exists(tmp_path / "evil")